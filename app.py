@@ -55,7 +55,7 @@ from functools import wraps
 from io import BytesIO
 import zlib
 from pathlib import Path
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 
 # Third-party imports
 from flask import (
@@ -68,10 +68,13 @@ from flask import (
     jsonify, 
     session, 
     send_file, 
-    send_from_directory
+    send_from_directory,
+    g,
+    Response
 )
 from flask_session import Session
 import requests
+import ijson
 import pandas as pd
 from docxtpl import DocxTemplate
 from docx import Document
@@ -85,6 +88,25 @@ import sqlite3
 
 # Local imports
 from src.utils.document_handler import DocumentHandler
+from src.utils import template_cache
+from src.utils import parallel_render
+from src.utils.docx_validator import DocxValidator
+from src.utils.job_queue import JobQueue, QueueFullError
+from src.utils import output_cache
+from src.utils import http_client
+from src.utils import batch_fetch
+from src.utils import http_cache
+from src.utils import upload_progress
+from src.utils import order_sheet
+from src.utils import spooled_output
+from src.utils import batch_export
+from src.data.product_view import build_products, build_excel_products
+from src.data.product_groups import grouped_products
+from src.data.normalize import normalize_manifest
+from src.data.formats import detect_format
+from src.data import csv_columns
+from src.data.csv_columns import resolve_columns, check_columns, apply_defaults
+from src.data.stream_ingest import sniff, stream_manifest
 from src.ui.app import InventorySlipGenerator
 
 # Configure logging (must be before any logger usage)
@@ -108,83 +130,7 @@ from src.utils.document_handler import DocumentHandler
 from src.ui.app import InventorySlipGenerator
 
 
-# Update the compression constants
-MAX_CHUNK_SIZE = 5000  # Increased to allow larger chunks
-MAX_TOTAL_SIZE = 20000  # Increased to allow larger total size
-COMPRESSION_LEVEL = 9  # Maximum compression
-
-def compress_session_data(data):
-    """Compress data with improved compression and size checks"""
-    try:
-        # Convert DataFrame to minimal JSON if needed
-        if isinstance(data, pd.DataFrame):
-            data = data.to_json(orient='records', date_format='iso')
-        elif not isinstance(data, str):
-            data = json.dumps(data, separators=(',', ':'))
-
-        # First level compression
-        compressed = zlib.compress(data.encode('utf-8'), level=COMPRESSION_LEVEL)
-        
-        # If still too large, reduce data
-        if len(compressed) > MAX_TOTAL_SIZE:
-            if isinstance(data, str):
-                try:
-                    # Parse JSON to reduce content
-                    parsed = json.loads(data)
-                    if isinstance(parsed, list):
-                        # Keep only essential fields and limit records
-                        reduced = []
-                        for item in parsed[:25]:  # Limit to 25 records
-                            reduced_item = {k: str(v)[:50] for k, v in item.items()}  # Truncate values
-                            reduced.append(reduced_item)
-                        data = json.dumps(reduced, separators=(',', ':'))
-                    elif isinstance(parsed, dict):
-                        # Reduce dictionary size
-                        data = json.dumps({k: str(v)[:50] for k, v in parsed.items()})
-                except:
-                    # If JSON parsing fails, truncate string
-                    data = data[:1000] + "...[truncated]"
-            
-            # Compress reduced data
-            compressed = zlib.compress(data.encode('utf-8'), level=COMPRESSION_LEVEL)
-
-        return base64.b64encode(compressed).decode('utf-8')
-    except Exception as e:
-        logger.error(f"Compression error: {str(e)}")
-        return None
-
-def get_chunked_data(key):
-    """Retrieve chunked data with improved error handling"""
-    from src.utils.session_storage import get_data
-    session_id = session.get('session_id')
-    filepath_key = key + '_filepath'
-    if filepath_key in session:
-        return get_data(session[filepath_key])
-    try:
-        num_chunks = session.get(f'{key}_chunks')
-        if num_chunks is None:
-            return None
-        if num_chunks > 20:
-            logger.error(f"Too many chunks for {key}: {num_chunks}")
-            return None
-        chunks = []
-        for i in range(num_chunks):
-            chunk = session.get(f'{key}_chunk_{i}')
-            if chunk is None or len(chunk) > MAX_CHUNK_SIZE:
-                logger.error(f"Invalid chunk {i} for {key}")
-                return None
-            chunks.append(chunk)
-        encoded_data = ''.join(chunks)
-        try:
-            compressed = base64.b64decode(encoded_data)
-            decompressed = zlib.decompress(compressed)
-            return decompressed.decode('utf-8')
-        except Exception as e:
-            logger.error(f"Decompression error: {str(e)}")
-            return None
-    except Exception as e:
-        logger.error(f"Error retrieving chunked data: {str(e)}")
-        return None
+from src.utils import session_storage
 
 
 # Configure logging
@@ -259,25 +205,41 @@ except Exception as e:
 APP_VERSION = "2.0.0"
 ALLOWED_EXTENSIONS = {'csv', 'json', 'docx'}
 MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16 MB max upload size
+MAX_CSV_UPLOAD_MB = 1024  # CSV uploads are ingested in chunks, so they may be far larger
 
 # Add new constants for API configuration
 API_CONFIGS = {
     'bamboo': {
         'base_url': 'https://api-trace.getbamboo.com/shared/manifests',
         'version': 'v1',
-        'auth_type': 'bearer'
+        'auth_type': 'bearer',
+        'updated_since_param': 'updated_since'
     },
     'cultivera': {
         'base_url': 'https://api.cultivera.com/api',
         'version': 'v1',
-        'auth_type': 'basic'
+        'auth_type': 'basic',
+        'paging': {'style': 'page', 'page_param': 'page', 'size_param': 'pageSize'},
+        'updated_since_param': 'updatedSince'
     },
     'growflow': {
         'base_url': 'https://api.growflow.com',
         'version': 'v2',
-        'auth_type': 'oauth2'
+        'auth_type': 'oauth2',
+        'paging': {'style': 'cursor', 'cursor_param': 'cursor', 'size_param': 'limit', 'next_cursor': 'meta.next_cursor'},
+        'updated_since_param': 'updatedAfter'
     }
 }
+API_PAGE_SIZE = 100
+API_MAX_PAGES = 500  # Guard against a listing that never stops paging
+
+# Transfer listing endpoint and its date range parameters per API type
+TRANSFER_ENDPOINTS = {
+    'bamboo': ('transfers', 'start_date', 'end_date'),
+    'cultivera': ('manifests', 'fromDate', 'toDate'),
+    'growflow': ('inventory/transfers', 'dateStart', 'dateEnd')
+}
+MAX_BATCH_DAYS = 31  # Longest date range a batch fetch splits into per-day requests
 
 
 # Flask app initialization (must come before route definitions)
@@ -306,6 +268,9 @@ app.config.update(
 
 Session(app)
 
+# Slip generation runs on a bounded background pool (see /jobs/<id>)
+generation_jobs = JobQueue()
+
 # PDF upload DB setup
 PDF_DB_PATH = 'pdf_inventory.db'
 def init_pdf_db():
@@ -442,10 +407,8 @@ def is_session_valid():
         if current_time - last_activity_ts > SESSION_TIMEOUT_SECONDS:
             return False
 
-        df_json = get_chunked_data('df_json')
-        if df_json is None:
-            return False
-        return True
+        # Only check that the dataset exists; never load it here
+        return has_session_data('df_json')
     except Exception as e:
         logger.error(f"Error checking session validity: {str(e)}")
         return False
@@ -475,7 +438,22 @@ def load_config():
         'items_per_page': '4',
         'auto_open': 'true',
         'theme': 'dark',
-        'font_size': '12'
+        'font_size': '12',
+        'output_cache_max_mb': str(output_cache.MAX_CACHE_MB),
+        'output_cache_max_age_hours': str(output_cache.MAX_CACHE_AGE_HOURS),
+        'render_workers': str(parallel_render.DEFAULT_WORKERS),
+        'keep_output_files': 'true',
+        'spool_max_mb': str(spooled_output.SPOOL_MAX_MB),
+        'batch_concurrency': str(batch_export.DEFAULT_CONCURRENCY)
+    }
+    
+    config['HTTP'] = {
+        'pool_connections': str(http_client.POOL_CONNECTIONS),
+        'pool_maxsize': str(http_client.POOL_MAXSIZE),
+        'max_retries': str(http_client.MAX_RETRIES),
+        'backoff_factor': str(http_client.BACKOFF_FACTOR),
+        'max_retry_after': str(http_client.MAX_RETRY_AFTER),
+        'fetch_concurrency': str(batch_fetch.DEFAULT_CONCURRENCY)
     }
     
     # Load existing config if it exists
@@ -492,66 +470,8 @@ def save_config(config):
     with open(CONFIG_FILE, 'w') as f:
         config.write(f)
 
-# Helper to adjust font sizes after rendering
-def adjust_table_font_sizes(doc_path):
-    """
-    Post-process a DOCX file to dynamically adjust font size inside table cells based on thresholds.
-    """
-    thresholds = [
-        (30, 12),   # <=30 chars → 12pt
-        (45, 10),   # <=45 chars → 10pt
-        (60, 8),    # <=60 chars → 8pt
-        (float('inf'), 7)  # >60 chars → 7pt
-    ]
-
-    def get_font_size(text_len):
-        for limit, size in thresholds:
-            if text_len <= limit:
-                return size
-        return 7  # Fallback
-
-    try:
-        doc = Document(doc_path)
-
-        for table in doc.tables:
-            for row in table.rows:
-                for cell in row.cells:
-                    for paragraph in cell.paragraphs:
-                        text = paragraph.text.strip()
-                        if not text:
-                            continue
-
-                        # If line is Product Name (first line), force 10pt
-                        if paragraph == cell.paragraphs[0]:
-                            font_size = 10
-                        else:
-                            font_size = get_font_size(len(text))
-
-                        for run in paragraph.runs:
-                            try:
-                                run.font.size = Pt(font_size)
-                            except Exception as e:
-                                logger.warning(f"Could not set font size for run: {e}")
-                                continue
-
-        # Save to a temporary file first
-        temp_path = doc_path + ".font_adjust.tmp"
-        doc.save(temp_path)
-        
-        # Validate the document after font adjustments
-        if validate_docx(temp_path):
-            import shutil
-            shutil.move(temp_path, doc_path)
-        else:
-            logger.warning("Document validation failed after font adjustment, keeping original")
-            if os.path.exists(temp_path):
-                os.remove(temp_path)
-                
-    except Exception as e:
-        logger.error(f"Error adjusting font sizes: {str(e)}")
-        # If font adjustment fails, the document should still be usable
-        if os.path.exists(temp_path):
-            os.remove(temp_path)
+# Outbound HTTP pool and retry settings come from the [HTTP] config section
+http_client.configure_from_config(load_config())
 
 # Open files after saving
 def open_file(path):
@@ -584,12 +504,45 @@ def run_full_process_inventory_slips(selected_df, config, status_callback=None,
             status_callback("Error: No data selected.")
         return False, "No data selected."
 
-def run_full_process_inventory_slips(selected_df, config, status_callback=None, progress_callback=None):
+def slip_template_path(config):
+    """Template configured in settings, falling back to the bundled InventorySlips.docx"""
+    template_path = config['PATHS'].get('template_path')
+    if not template_path or not os.path.exists(template_path):
+        template_path = os.path.join(os.path.dirname(__file__), "templates/documents/InventorySlips.docx")
+    return template_path
+
+def slip_request_key(selected_df, config):
+    """Output cache key for a template-based slip request"""
+    items_per_page = int(config['SETTINGS'].get('items_per_page', '4'))
+    return output_cache.request_key(selected_df, items_per_page, slip_template_path(config), 'template')
+
+def batch_request_key(selected_df, config):
+    """Output cache key for a batch ZIP request"""
+    items_per_page = int(config['SETTINGS'].get('items_per_page', '4'))
+    return output_cache.request_key(selected_df, items_per_page, slip_template_path(config), 'batch',
+                                    datetime.now().strftime("%Y%m%d"))
+
+def evict_cached_outputs(config, keep=None):
+    """Apply the size and age limits from settings to the cached documents"""
+    try:
+        output_cache.evict(
+            config['PATHS']['output_dir'],
+            max_mb=config['SETTINGS'].getfloat('output_cache_max_mb', fallback=output_cache.MAX_CACHE_MB),
+            max_age_hours=config['SETTINGS'].getfloat('output_cache_max_age_hours', fallback=output_cache.MAX_CACHE_AGE_HOURS),
+            keep=keep
+        )
+    except Exception as e:
+        logger.warning(f"Output cache eviction failed: {e}")
+
+def run_full_process_inventory_slips(selected_df, config, status_callback=None, progress_callback=None, cache_key=None,
+                                     shared_spool=False):
     # ...existing code...
     
     try:
         # Get vendor name from first row
         vendor_name = selected_df['Vendor'].iloc[0] if not selected_df.empty else "Unknown"
+        if pd.isna(vendor_name):
+            vendor_name = "Unknown"
         # Clean vendor name (remove special characters and spaces)
         vendor_name = "".join(c for c in vendor_name if c.isalnum() or c.isspace()).strip()
         # Get today's date
@@ -597,19 +550,29 @@ def run_full_process_inventory_slips(selected_df, config, status_callback=None,
         # Create filename
         outname = f"{today_date}_{vendor_name}_Slips.docx"
         output_dir = config['PATHS']['output_dir']
-        if not os.path.exists(output_dir):
+        keep_files = spooled_output.keep_output_files(config)
+        if keep_files and not os.path.exists(output_dir):
             os.makedirs(output_dir, exist_ok=True)
-        outpath = os.path.join(output_dir, outname)
         
         # ...rest of existing code...
         
         # Get settings from config
         items_per_page = int(config['SETTINGS'].get('items_per_page', '4'))
-        template_path = config['PATHS'].get('template_path')
-        if not template_path or not os.path.exists(template_path):
-            template_path = os.path.join(os.path.dirname(__file__), "templates/documents/InventorySlips.docx")
-            if not os.path.exists(template_path):
-                raise ValueError(f"Template file not found at: {template_path}")
+        template_path = slip_template_path(config)
+        if not os.path.exists(template_path):
+            raise ValueError(f"Template file not found at: {template_path}")
+        
+        # Serve an identical earlier request straight from the output cache
+        if keep_files:
+            if cache_key is None:
+                cache_key = output_cache.request_key(selected_df, items_per_page, template_path, 'template')
+            cached = output_cache.lookup(output_dir, cache_key, 'inventory_slips')
+            if cached:
+                if status_callback:
+                    status_callback("Using the document already generated for this selection.")
+                if progress_callback:
+                    progress_callback(100)
+                return True, cached
         
         if status_callback:
             status_callback("Processing data...")
@@ -633,142 +596,118 @@ def run_full_process_inventory_slips(selected_df, config, status_callback=None,
                     cleaned_record[key] = cleaned_value[:200] if len(cleaned_value) > 200 else cleaned_value
             cleaned_records.append(cleaned_record)
         
-        pages = []
+        contexts = []
 
         # Process records in chunks of 4 (or configured size)
-        total_chunks = (len(cleaned_records) + items_per_page - 1) // items_per_page
-        current_chunk = 0
-
         for chunk in chunk_records(cleaned_records, items_per_page):
-            current_chunk += 1
+            context = {}
+
+            # Fill context with records - modified vendor handling
+            for idx, record in enumerate(chunk, 1):
+                # Get vendor info, using full vendor name if available
+                vendor_name = record.get("Vendor", "")
+                # If vendor is in format "license - name", extract just the name
+                if " - " in vendor_name:
+                    vendor_name = vendor_name.split(" - ")[1]
+
+                # Ensure all values are strings and not too long
+                context[f"Label{idx}"] = {
+                    "ProductName": str(record.get("Product Name*", ""))[:100],
+                    "Barcode": str(record.get("Barcode*", ""))[:50],
+                    "AcceptedDate": str(record.get("Accepted Date", ""))[:20],
+                    "QuantityReceived": str(record.get("Quantity Received*", ""))[:20],
+                    "Vendor": str(vendor_name or "Unknown Vendor")[:50],
+                    "ProductType": str(record.get("Product Type*", ""))[:50]
+                }
+
+            # Fill remaining slots with empty values
+            for i in range(len(chunk) + 1, items_per_page + 1):
+                context[f"Label{i}"] = {
+                    "ProductName": "",
+                    "Barcode": "",
+                    "AcceptedDate": "",
+                    "QuantityReceived": "",
+                    "Vendor": "",
+                    "ProductType": ""
+                }
+
+            contexts.append(context)
+
+        if not contexts:
+            return False, "No documents generated."
+
+        # Render every page into a single document parsed from the template once
+        def page_progress(page_num, total):
             if progress_callback:
-                progress = (current_chunk / total_chunks) * 50
-                progress_callback(int(progress))
+                progress_callback(int((page_num / total) * 90))
+            if status_callback:
+                status_callback(f"Generating page {page_num} of {total}...")
+
+        # Add page numbers to footer
+        from docx.oxml import OxmlElement
+        from docx.oxml.ns import qn
+        def add_page_number(footer):
+            paragraph = footer.paragraphs[0]
+            run = paragraph.add_run()
+            fldChar1 = OxmlElement('w:fldChar')
+            fldChar1.set(qn('w:fldCharType'), 'begin')
+            instrText = OxmlElement('w:instrText')
+            instrText.text = 'PAGE'
+            fldChar2 = OxmlElement('w:fldChar')
+            fldChar2.set(qn('w:fldCharType'), 'end')
+            run._r.append(fldChar1)
+            run._r.append(instrText)
+            run._r.append(fldChar2)
+
+        def finish_document(master):
+            for section in master.sections:
+                add_page_number(section.footer)
+
+            # Validate the in-memory document before anything touches the disk
+            if not DocxValidator.check_structure(master):
+                raise ValueError("Generated document is corrupted")
 
             if status_callback:
-                status_callback(f"Generating page {current_chunk} of {total_chunks}...")
+                status_callback("Saving document...")
 
+        workers = parallel_render.workers_from_config(config)
+        if not keep_files:
+            # Write straight into a spooled buffer; the download streams it from there
+            output = spooled_output.SpooledOutput(outname, spooled_output.spool_limit(config), shared=shared_spool)
             try:
-                # Create a fresh template instance for each chunk
-                tpl = DocxTemplate(template_path)
-                context = {}
-
-                # Fill context with records - modified vendor handling
-                for idx, record in enumerate(chunk, 1):
-                    # Get vendor info, using full vendor name if available
-                    vendor_name = record.get("Vendor", "")
-                    # If vendor is in format "license - name", extract just the name
-                    if " - " in vendor_name:
-                        vendor_name = vendor_name.split(" - ")[1]
-                    
-                    # Ensure all values are strings and not too long
-                    context[f"Label{idx}"] = {
-                        "ProductName": str(record.get("Product Name*", ""))[:100],
-                        "Barcode": str(record.get("Barcode*", ""))[:50],
-                        "AcceptedDate": str(record.get("Accepted Date", ""))[:20],
-                        "QuantityReceived": str(record.get("Quantity Received*", ""))[:20],
-                        "Vendor": str(vendor_name or "Unknown Vendor")[:50],
-                        "ProductType": str(record.get("Product Type*", ""))[:50]
-                    }
-
-                # Fill remaining slots with empty values
-                for i in range(len(chunk) + 1, items_per_page + 1):
-                    context[f"Label{i}"] = {
-                        "ProductName": "",
-                        "Barcode": "",
-                        "AcceptedDate": "",
-                        "QuantityReceived": "",
-                        "Vendor": "",
-                        "ProductType": ""
-                    }
-
-                # Render template with context
-                tpl.render(context)
-                
-                # Save to BytesIO with proper error handling
-                output = BytesIO()
-                tpl.save(output)
-                output.seek(0)
-                
-                # Create document from BytesIO
-                doc = Document(output)
-                pages.append(doc)
-
+                parallel_render.render_to_file(template_path, contexts, output.file, workers=workers,
+                                               prepare=finish_document, progress_callback=page_progress)
             except Exception as e:
-                logger.error(f"Error generating page {current_chunk}: {e}")
-                raise ValueError(f"Error generating page {current_chunk}: {e}")
-
-        if not pages:
-            return False, "No documents generated."
-
-        # Combine pages with better error handling
-        if status_callback:
-            status_callback("Combining pages...")
+                output.close()
+                logger.error(f"Error generating document: {e}")
+                raise ValueError(f"Error generating document: {e}")
+            if progress_callback:
+                progress_callback(100)
+            return True, output
 
         try:
-            master = pages[0]
-            composer = Composer(master)
-            
-            for i, doc in enumerate(pages[1:]):
-                if progress_callback:
-                    progress = 50 + ((i + 1) / len(pages[1:])) * 40
-                    progress_callback(int(progress))
-                
-                # Add page break before appending
-                if hasattr(composer, 'doc') and composer.doc.paragraphs:
-                    composer.doc.paragraphs[-1].add_run().add_break()
-                
-                composer.append(doc)
+            # Save final document under its cache key so repeats can reuse it
+            outpath = output_cache.cache_path(output_dir, cache_key, 'inventory_slips')
 
-            # Save final document with proper error handling
-            now = datetime.now().strftime("%Y%m%d_%H%M%S")
-            outname = f"inventory_slips_{now}.docx"
-            outpath = os.path.join(config['PATHS']['output_dir'], outname)
-
-            if status_callback:
-                status_callback("Saving document...")
+            # Single write: save to a temporary file, then move into place.
+            # Pages may be rendered across processes (render_workers in settings).
+            temp_path = f"{outpath}.{os.getpid()}.{threading.get_ident()}.tmp"
+            try:
+                parallel_render.render_to_file(template_path, contexts, temp_path, workers=workers,
+                                               prepare=finish_document, progress_callback=page_progress)
+                os.replace(temp_path, outpath)
+            finally:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+            evict_cached_outputs(config, keep=outpath)
 
-            # Save to a temporary file first, then move to final location
-            temp_path = outpath + ".tmp"
-            master.save(temp_path)
-            
-            # Validate the saved document
-            if not validate_docx(temp_path):
-                raise ValueError("Generated document is corrupted")
-            
-            # Move to final location
-            import shutil
-            shutil.move(temp_path, outpath)
-
-            # Add page numbers to footer
-            from docx.oxml import OxmlElement
-            from docx.oxml.ns import qn
-            def add_page_number(footer):
-                paragraph = footer.paragraphs[0]
-                run = paragraph.add_run()
-                fldChar1 = OxmlElement('w:fldChar')
-                fldChar1.set(qn('w:fldCharType'), 'begin')
-                instrText = OxmlElement('w:instrText')
-                instrText.text = 'PAGE'
-                fldChar2 = OxmlElement('w:fldChar')
-                fldChar2.set(qn('w:fldCharType'), 'end')
-                run._r.append(fldChar1)
-                run._r.append(instrText)
-                run._r.append(fldChar2)
-            for section in master.sections:
-                add_page_number(section.footer)
-            master.save(temp_path)
-            # Adjust font sizes
-            if status_callback:
-                status_callback("Adjusting formatting...")
-            adjust_table_font_sizes(outpath)
             if progress_callback:
                 progress_callback(100)
             return True, outpath
 
         except Exception as e:
-            logger.error(f"Error combining or saving documents: {e}")
-            raise ValueError(f"Error combining or saving documents: {e}")
+            logger.error(f"Error generating or saving document: {e}")
+            raise ValueError(f"Error generating or saving document: {e}")
 
     except Exception as e:
         if status_callback:
@@ -776,53 +715,79 @@ def run_full_process_inventory_slips(selected_df, config, status_callback=None,
         logger.error(f"Error in run_full_process_inventory_slips: {str(e)}")
         return False, str(e)
 
+def report_missing_partitions(results, status_callback=None):
+    """Tell the caller which vendor/date documents are missing from a batch; True if any are"""
+    missing = batch_export.missing_partitions(results)
+    if missing:
+        message = (f"{len(missing)} of {len(results)} documents could not be generated and are missing "
+                   f"from the archive (see {batch_export.MISSING_NAME}): " + "; ".join(missing))
+        logger.warning(message)
+        if status_callback:
+            status_callback(message)
+    return bool(missing)
+
+def run_batch_inventory_slips(selected_df, config, status_callback=None, progress_callback=None, cache_key=None,
+                              shared_spool=False):
+    """Generate one slip document per vendor and accepted date and bundle them in a ZIP"""
+    try:
+        today_date = datetime.now().strftime("%Y%m%d")
+        concurrency = config['SETTINGS'].getint('batch_concurrency', fallback=batch_export.DEFAULT_CONCURRENCY)
+
+        def generate(rows):
+            return run_full_process_inventory_slips(rows, config)
+
+        if not spooled_output.keep_output_files(config):
+            output = spooled_output.SpooledOutput(f"{today_date}_InventorySlips.zip",
+                                                  spooled_output.spool_limit(config),
+                                                  mimetype=spooled_output.ZIP_MIMETYPE, shared=shared_spool)
+            try:
+                results = batch_export.export_batch(selected_df, generate, output.file, concurrency,
+                                                    status_callback, progress_callback)
+            except Exception:
+                output.close()
+                raise
+            report_missing_partitions(results, status_callback)
+            return True, output
+
+        # Serve an identical earlier batch straight from the output cache
+        output_dir = config['PATHS']['output_dir']
+        if cache_key is None:
+            cache_key = batch_request_key(selected_df, config)
+        prefix = f"{today_date}_InventorySlips"
+        cached = output_cache.lookup(output_dir, cache_key, prefix, ext='.zip')
+        if cached:
+            if status_callback:
+                status_callback("Using the archive already generated for this selection.")
+            return True, cached
+
+        outpath = output_cache.cache_path(output_dir, cache_key, prefix, ext='.zip')
+        temp_path = f"{outpath}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            results = batch_export.export_batch(selected_df, generate, temp_path, concurrency,
+                                                status_callback, progress_callback)
+            if report_missing_partitions(results, status_callback):
+                # An incomplete archive must never be served for a later identical request
+                outpath = output_cache.cache_path(output_dir, uuid.uuid4().hex, f"{prefix}_partial", ext='.zip')
+            os.replace(temp_path, outpath)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+        evict_cached_outputs(config, keep=outpath)
+        return True, outpath
+
+    except Exception as e:
+        logger.error(f"Error in run_batch_inventory_slips: {str(e)}")
+        return False, str(e)
+
 # Parse Bamboo transfer schema JSON
 def parse_bamboo_data(json_data):
     if not json_data:
         return pd.DataFrame()
     
     try:
-        # Get vendor information
-        from_license_number = json_data.get("from_license_number", "")
-        from_license_name = json_data.get("from_license_name", "")
-        vendor_meta = f"{from_license_number} - {from_license_name}"
-        
-        # Get transfer date
-        raw_date = json_data.get("est_arrival_at", "") or json_data.get("transferred_at", "")
-        accepted_date = raw_date.split("T")[0] if "T" in raw_date else raw_date
-        
-        # Process inventory items
-        items = json_data.get("inventory_transfer_items", [])
-        logger.info(f"Bamboo data: found {len(items)} inventory_transfer_items")
-        records = []
-        
-        for item in items:
-            # Extract THC and CBD content from lab_result_data if available
-            thc_content = ""
-            cbd_content = ""
-            
-            lab_data = item.get("lab_result_data", {})
-            if lab_data and "potency" in lab_data:
-                for potency_item in lab_data["potency"]:
-                    if potency_item.get("type") == "total-thc":
-                        thc_content = f"{potency_item.get('value', '')}%"
-                    elif potency_item.get("type") == "total-cbd":
-                        cbd_content = f"{potency_item.get('value', '')}%"
-            
-            records.append({
-                "Product Name*": item.get("product_name", ""),
-                "Product Type*": item.get("inventory_type", ""),
-                "Quantity Received*": item.get("qty", ""),
-                "Barcode*": item.get("inventory_id", "") or item.get("external_id", ""),
-                "Accepted Date": accepted_date,
-                "Vendor": vendor_meta,
-                "Strain Name": item.get("strain_name", ""),
-                "THC Content": thc_content,
-                "CBD Content": cbd_content,
-                "Source System": "Bamboo"
-            })
-        
-        return pd.DataFrame(records)
+        df = normalize_manifest(json_data, 'Bamboo')
+        logger.info(f"Bamboo data: found {len(df)} inventory_transfer_items")
+        return df
     
     except Exception as e:
         raise ValueError(f"Failed to parse Bamboo transfer data: {e}")
@@ -837,53 +802,7 @@ def parse_cultivera_data(json_data):
         if not json_data.get("data") or not isinstance(json_data.get("data"), dict):
             raise ValueError("Not a valid Cultivera format")
         
-        data = json_data.get("data", {})
-        manifest = data.get("manifest", {})
-        
-        # Get vendor information
-        from_license = manifest.get("from_license", {})
-        vendor_name = from_license.get("name", "")
-        vendor_license = from_license.get("license_number", "")
-        vendor_meta = f"{vendor_license} - {vendor_name}" if vendor_license and vendor_name else "Unknown Vendor"
-        
-        # Get transfer date
-        created_at = manifest.get("created_at", "")
-        accepted_date = created_at.split("T")[0] if "T" in created_at else created_at
-        
-        # Process inventory items
-        items = manifest.get("items", [])
-        records = []
-        
-        for item in items:
-            # Extract product info
-            product = item.get("product", {})
-            
-            # Extract THC and CBD content
-            thc_content = ""
-            cbd_content = ""
-            
-            test_results = item.get("test_results", [])
-            if test_results:
-                for result in test_results:
-                    if "thc" in result.get("type", "").lower():
-                        thc_content = f"{result.get('percentage', '')}%"
-                    elif "cbd" in result.get("type", "").lower():
-                        cbd_content = f"{result.get('percentage', '')}%"
-            
-            records.append({
-                "Product Name*": product.get("name", ""),
-                "Product Type*": product.get("category", ""),
-                "Quantity Received*": item.get("quantity", ""),
-                "Barcode*": item.get("barcode", "") or item.get("id", ""),
-                "Accepted Date": accepted_date,
-                "Vendor": vendor_meta,
-                "Strain Name": product.get("strain_name", ""),
-                "THC Content": thc_content,
-                "CBD Content": cbd_content,
-                "Source System": "Cultivera"
-            })
-        
-        return pd.DataFrame(records)
+        return normalize_manifest(json_data, 'Cultivera')
     
     except Exception as e:
         raise ValueError(f"Failed to parse Cultivera data: {e}")
@@ -896,33 +815,7 @@ def parse_growflow_data(json_data):
                 'from_license_name' in json_data):
             return pd.DataFrame()
         
-        vendor_meta = f"{json_data.get('from_license_number', '')} - {json_data.get('from_license_name', 'Unknown Vendor')}"
-        raw_date = json_data.get("est_arrival_at", "") or json_data.get("transferred_at", "")
-        accepted_date = raw_date.split("T")[0] if "T" in raw_date else raw_date
-        
-        items = json_data.get("inventory_transfer_items", [])
-        mapped_data = []
-        
-        for item in items:
-            potency_data = item.get("lab_result_data", {}).get("potency", [])
-            thc_value = next((p.get('value') for p in potency_data if p.get('type') in ["total-thc", "thc"]), 0)
-            cbd_value = next((p.get('value') for p in potency_data if p.get('type') in ["total-cbd", "cbd"]), 0)
-            
-            mapped_item = {
-                "Product Name*": item.get("product_name", ""),
-                "Product Type*": item.get("inventory_type", ""),
-                "Quantity Received*": item.get("qty", ""),
-                "Barcode*": item.get("product_sku", "") or item.get("inventory_id", ""),
-                "Accepted Date": accepted_date,
-                "Vendor": vendor_meta,
-                "Strain Name": item.get("strain_name", ""),
-                "THC Content": f"{thc_value}%",
-                "CBD Content": f"{cbd_value}%",
-                "Source System": "GrowFlow"
-            }
-            mapped_data.append(mapped_item)
-        
-        return pd.DataFrame(mapped_data)
+        return normalize_manifest(json_data, 'GrowFlow')
     
     except Exception as e:
         logger.error(f"Error parsing GrowFlow data: {str(e)}")
@@ -940,28 +833,16 @@ def parse_inventory_json(json_data):
     try:
         if isinstance(json_data, str):
             json_data = json.loads(json_data)
-        # Try parsing as Bamboo
-        if "inventory_transfer_items" in json_data:
-            df = parse_bamboo_data(json_data)
-            logger.info(f"Parsed Bamboo format, records: {len(df) if df is not None else 0}")
-            print(f"Parsed Bamboo format, records: {len(df) if df is not None else 0}")
-            return df, "Bamboo"
-        # Try parsing as Cultivera
-        elif "data" in json_data and isinstance(json_data["data"], dict) and "manifest" in json_data["data"]:
-            df = parse_cultivera_data(json_data)
-            logger.info(f"Parsed Cultivera format, records: {len(df) if df is not None else 0}")
-            print(f"Parsed Cultivera format, records: {len(df) if df is not None else 0}")
-            return df, "Cultivera"
-        # Try parsing as GrowFlow
-        elif "document_schema_version" in json_data:
-            df = parse_growflow_data(json_data)
-            logger.info(f"Parsed GrowFlow format, records: {len(df) if df is not None else 0}")
-            print(f"Parsed GrowFlow format, records: {len(df) if df is not None else 0}")
-            return df, "GrowFlow"
-        else:
+        # The format registry decides which provider's parser applies
+        fmt = detect_format(json_data)
+        if fmt is None:
             logger.info("Unknown JSON format in parse_inventory_json.")
             print("Unknown JSON format in parse_inventory_json.")
             return None, "Unknown JSON format"
+        df = fmt.parse(json_data)
+        logger.info(f"Parsed {fmt.name} format, records: {len(df) if df is not None else 0}")
+        print(f"Parsed {fmt.name} format, records: {len(df) if df is not None else 0}")
+        return df, fmt.name
     except json.JSONDecodeError:
         logger.error("Invalid JSON data in parse_inventory_json.")
         print("Invalid JSON data in parse_inventory_json.")
@@ -974,98 +855,28 @@ def parse_inventory_json(json_data):
 # Process CSV data
 def process_csv_data(df):
     try:
-        # Strip whitespace from column names
-        df.columns = [col.strip() for col in df.columns]
+        # Resolve the header once: uniqueness suffixes, renames and target lookup
         logger.info(f"Original columns: {df.columns.tolist()}")
+        columns = resolve_columns(df.columns)
+        df.columns = columns.columns
+        logger.info(f"Columns after renaming: {columns.columns}")
         
-        # First, ensure column names are unique by adding a suffix if needed
-        df.columns = [f"{col}_{i}" if df.columns.tolist().count(col) > 1 else col 
-                     for i, col in enumerate(df.columns)]
-        logger.info(f"Columns after ensuring uniqueness: {df.columns.tolist()}")
-        
-        # Map column names to expected format
-        col_map = {
-            "Product Name*": "Product Name*",
-            "Product Name": "Product Name*",
-            "Quantity Received": "Quantity Received*",
-            "Quantity*": "Quantity Received*",
-            "Quantity": "Quantity Received*",
-            "Lot Number*": "Barcode*",
-            "Barcode": "Barcode*",
-            "Lot Number": "Barcode*",
-            "Accepted Date": "Accepted Date",
-            "Vendor": "Vendor",
-            "Strain Name": "Strain Name",
-            "Product Type*": "Product Type*",
-            "Product Type": "Product Type*",
-            "Inventory Type": "Product Type*"
-        }
-        
-        # Now rename columns according to our mapping
-        new_columns = {}
-        target_counts = {}  # Keep track of how many times we've used each target name
-        
-        for col in df.columns:
-            base_col = col.split('_')[0]  # Remove any suffix
-            if base_col in col_map:
-                target_name = col_map[base_col]
-                # If we've seen this target name before, add a suffix
-                if target_name in target_counts:
-                    target_counts[target_name] += 1
-                    new_columns[col] = f"{target_name}_{target_counts[target_name]}"
-                else:
-                    target_counts[target_name] = 0
-                    new_columns[col] = target_name
-            else:
-                new_columns[col] = col
-        
-        logger.info(f"Column mapping: {new_columns}")
-        df = df.rename(columns=new_columns)
-        logger.info(f"Columns after renaming: {df.columns.tolist()}")
-        
-        # Ensure required columns exist
-        required_cols = ["Product Name*", "Barcode*"]
-        missing_cols = [col for col in required_cols if not any(col in c for c in df.columns)]
-        
-        if missing_cols:
-            return None, f"CSV is missing required columns: {', '.join(missing_cols)}"
+        # Required columns present and none duplicated
+        error = check_columns(columns)
+        if error:
+            return None, error
         
         # Set default values for missing columns
-        if not any("Vendor" in c for c in df.columns):
-            df["Vendor"] = "Unknown Vendor"
-        else:
-            vendor_col = next(c for c in df.columns if "Vendor" in c)
-            df[vendor_col] = df[vendor_col].fillna("Unknown Vendor")
-        
-        if not any("Accepted Date" in c for c in df.columns):
-            today = datetime.today().strftime("%Y-%m-%d")
-            df["Accepted Date"] = today
-        
-        if not any("Product Type*" in c for c in df.columns):
-            df["Product Type*"] = "Unknown"
-        
-        if not any("Strain Name" in c for c in df.columns):
-            df["Strain Name"] = ""
+        df = apply_defaults(df, columns)
         
         # Sort if possible
         try:
-            sort_cols = []
-            if any("Product Type*" in c for c in df.columns):
-                sort_cols.append(next(c for c in df.columns if "Product Type*" in c))
-            if any("Product Name*" in c for c in df.columns):
-                sort_cols.append(next(c for c in df.columns if "Product Name*" in c))
-            
+            sort_cols = [columns.first[col] for col in ("Product Type*", "Product Name*") if columns.has(col)]
             if sort_cols:
-                df = df.sort_values(sort_cols, ascending=[True, True])
+                df = df.sort_values(sort_cols, ascending=[True] * len(sort_cols))
         except:
             pass  # If sorting fails, continue without sorting
         
-        # Final check for duplicate columns
-        if len(df.columns) != len(set(df.columns)):
-            duplicates = [col for col in df.columns if df.columns.tolist().count(col) > 1]
-            logger.error(f"Duplicate columns found: {duplicates}")
-            return None, f"Duplicate columns found: {', '.join(duplicates)}"
-        
         return df, "Success"
     
     except Exception as e:
@@ -1079,82 +890,68 @@ def limit_dataframe_for_session(df, max_rows=25):
         return df.head(max_rows)
     return df
 
-def store_chunked_data(key, data):
-    """Store data with improved chunking and size validation"""
+def store_session_data(key, data):
+    """Store a loaded dataset server-side and keep only its id in the session"""
     try:
-        # Compress data first
-        compressed = compress_session_data(data)
-        
-        # Clear existing chunks
-        clear_chunked_data(key)
-        
-        # Split into smaller chunks
-        chunks = [compressed[i:i + MAX_CHUNK_SIZE] for i in range(0, len(compressed), MAX_CHUNK_SIZE)]
+        dataset_id = session_storage.store_dataset(data)
+        if dataset_id is None:
+            raise ValueError("Dataset could not be written")
         
-        if len(chunks) > 20:  # Limit number of chunks
-            raise ValueError(f"Data too large: {len(chunks)} chunks needed")
+        store_session_dataset(key, dataset_id)
+        _request_datasets()[dataset_id] = data
         
-        # Store chunks with size validation
-        session[f'{key}_chunks'] = len(chunks)
-        for i, chunk in enumerate(chunks):
-            chunk_key = f'{key}_chunk_{i}'
-            if len(chunk) > MAX_CHUNK_SIZE:
-                raise ValueError(f"Chunk {i} exceeds maximum size")
-            session[chunk_key] = chunk
-            
-        logger.info(f"Stored {len(chunks)} chunks for {key} (total size: {len(compressed)})")
+        rows = len(data) if isinstance(data, pd.DataFrame) else None
+        logger.info(f"Stored {key} as dataset {dataset_id}" + (f" ({rows} rows)" if rows is not None else ""))
         return True
         
     except Exception as e:
-        logger.error(f"Error storing chunked data: {str(e)}")
-        clear_chunked_data(key)  # Clean up on error
+        logger.error(f"Error storing session data: {str(e)}")
         return False
 
-def get_chunked_data(key):
-    """Retrieve chunked data with improved error handling"""
-    try:
-        num_chunks = session.get(f'{key}_chunks')
-        if num_chunks is None:
-            return None
-            
-        # Validate chunk count
-        if num_chunks > 20:  # Safety check
-            logger.error(f"Too many chunks for {key}: {num_chunks}")
-            return None
-            
-        # Reconstruct data
-        chunks = []
-        for i in range(num_chunks):
-            chunk = session.get(f'{key}_chunk_{i}')
-            if chunk is None or len(chunk) > MAX_CHUNK_SIZE:
-                logger.error(f"Invalid chunk {i} for {key}")
-                return None
-            chunks.append(chunk)
-            
-        # Combine and decompress
-        encoded_data = ''.join(chunks)
-        try:
-            compressed = base64.b64decode(encoded_data)
-            decompressed = zlib.decompress(compressed)
-            return decompressed.decode('utf-8')
-        except Exception as e:
-            logger.error(f"Decompression error: {str(e)}")
-            return None
-            
-    except Exception as e:
-        logger.error(f"Error retrieving chunked data: {str(e)}")
+def store_session_dataset(key, dataset_id):
+    """Point key at a dataset already in the store, e.g. one built by a DatasetWriter"""
+    # Replace any dataset previously stored under this key
+    clear_session_data(key)
+    session[f'{key}_dataset'] = dataset_id
+
+def _request_datasets():
+    """Datasets already loaded during the current request, by dataset id"""
+    if 'session_datasets' not in g:
+        g.session_datasets = {}
+    return g.session_datasets
+
+def has_session_data(key):
+    """Check that a dataset is stored under key without loading it"""
+    dataset_id = session.get(f'{key}_dataset')
+    if not dataset_id:
+        return False
+    return dataset_id in _request_datasets() or session_storage.dataset_exists(dataset_id)
+
+def get_session_data(key):
+    """Load the dataset stored under key for this session, or None.
+    Each dataset is read from disk at most once per request."""
+    dataset_id = session.get(f'{key}_dataset')
+    if not dataset_id:
         return None
+    loaded = _request_datasets()
+    if dataset_id in loaded:
+        return loaded[dataset_id]
+    data = session_storage.load_dataset(dataset_id)
+    if data is None:
+        logger.error(f"Dataset {dataset_id} for {key} is missing")
+        return None
+    loaded[dataset_id] = data
+    return data
 
-def clear_chunked_data(key):
-    """Remove all chunks for a given key"""
+def clear_session_data(key):
+    """Forget the dataset stored under key and remove its file"""
     try:
-        num_chunks = session.get(f'{key}_chunks')
-        if num_chunks is not None:
-            for i in range(num_chunks):
-                session.pop(f'{key}_chunk_{i}', None)
-        session.pop(f'{key}_chunks', None)
+        dataset_id = session.pop(f'{key}_dataset', None)
+        if dataset_id:
+            _request_datasets().pop(dataset_id, None)
+            session_storage.remove_dataset(dataset_id)
     except Exception as e:
-        logger.error(f"Error clearing chunked data: {str(e)}")
+        logger.error(f"Error clearing session data: {str(e)}")
 
 def cleanup_temp_files():
     """Clean up any temporary files that might be left behind"""
@@ -1173,6 +970,10 @@ def cleanup_temp_files():
                     logger.info(f"Cleaned up temporary file: {temp_file}")
                 except Exception as e:
                     logger.warning(f"Could not remove temporary file {temp_file}: {e}")
+        
+        # Datasets left behind by expired sessions, and job outputs never downloaded
+        session_storage.cleanup_old_files()
+        spooled_output.cleanup_shared()
     except Exception as e:
         logger.error(f"Error during cleanup: {e}")
 
@@ -1184,130 +985,51 @@ def create_robust_inventory_slip(selected_df, config, status_callback=None):
             vendor_name = vendor_name.split(" - ")[1]
         vendor_name = "".join(c for c in vendor_name if c.isalnum() or c.isspace()).strip()
         
-        # Create filename
+        # The sheet prints today's date, so it is part of the cache key
         today_date = datetime.now().strftime("%Y%m%d")
-        outname = f"{today_date}_{vendor_name}_OrderSheet.docx"
-        outpath = os.path.join(config['PATHS']['output_dir'], outname)
-
-        # Create new document with landscape orientation first
-        doc = Document()
-        section = doc.sections[0]
-        section.orientation = WD_ORIENT.LANDSCAPE
-        section.page_width = Inches(11)
-        section.page_height = Inches(8.5)
-        
-        # Set margins
-        section.left_margin = Inches(0.5)
-        section.right_margin = Inches(0.5)
-        section.top_margin = Inches(0.5)
-        section.bottom_margin = Inches(0.5)
-
-        # Add title
-        title = doc.add_paragraph()
-        title.alignment = WD_ALIGN_PARAGRAPH.CENTER
-        run = title.add_run("Order Sheet")
-        run.bold = True
-        run.font.size = Pt(14)
-
-        # Add date and vendor info
-        info = doc.add_paragraph()
-        run = info.add_run(f"Date: {today_date}    Vendor: {vendor_name}")
-        run.font.size = Pt(11)
-
-        # Create table with proper dimensions
-        table = doc.add_table(rows=1, cols=6)
-        table.style = 'Table Grid'
-        table.autofit = False  # Prevent autofit to keep our dimensions
-
-        # Set column widths proportionally
-        widths = [4, 2, 1, 2, 2, 2]  # Total = 13 inches
-        total_width = sum(widths)
-        page_width = 10  # Actual usable width after margins
-        
-        for i, width in enumerate(widths):
-            for cell in table.columns[i].cells:
-                cell.width = Inches(width * page_width / total_width)
-
-        # Add headers
-        headers = ['Product Name', 'Barcode', 'Quantity', 'Vendor', 'Accepted Date']
-        for i, header in enumerate(headers):
-            cell = table.cell(0, i)
-            paragraph = cell.paragraphs[0]
-            run = paragraph.add_run(header)
-            run.bold = True
-            run.font.size = Pt(11)
-
-        # Add data rows with pagination
-        rows_per_page = 20  # Adjust based on page size and margins
-        current_row = 0
-        
-        for _, row in selected_df.iterrows():
-            if current_row > 0 and current_row % rows_per_page == 0:
-                doc.add_page_break()
-                # Add header row in new page
-                # Create table with proper dimensions
-                table = doc.add_table(rows=1, cols=6)
-                table.style = 'Table Grid'
-                table.autofit = False  # Keep autofit false for manual width control
-
-                # Set column widths proportionally for better fit
-                widths = [5, 2, 0.75, 1.5, 1.5, 1.75]  # Adjusted widths for better proportions
-                total_width = sum(widths)
-                page_width = 10  # Actual usable width after margins
-
-                # Apply widths to first table
-                for i, width in enumerate(widths):
-                    for cell in table.columns[i].cells:
-                        cell.width = Inches(width * page_width / total_width)
-
-                # When creating new tables for additional pages, use the same settings
-                if current_row > 0 and current_row % rows_per_page == 0:
-                    doc.add_page_break()
-                    table = doc.add_table(rows=1, cols=6)
-                    table.style = 'Table Grid'
-                    table.autofit = False  # Keep autofit false for consistent width control
-                    
-                    # Apply same widths to new table
-                    for i, width in enumerate(widths):
-                        for cell in table.columns[i].cells:
-                            cell.width = Inches(width * page_width / total_width)
-                current_row += 1
-                
-                # Add headers to new page
-                for i, header in enumerate(headers):
-                    cell = table.cell(0, i)
-                    paragraph = cell.paragraphs[0]
-                    run = paragraph.add_run(header)
-                    run.bold = True
-                    run.font.size = Pt(11)
-
-            row_cells = table.add_row().cells
-            data = [
-                str(row.get('Product Name*', ''))[:100],
-                str(row.get('Barcode*', ''))[:50],
-                str(row.get('Quantity Received*', ''))[:5],
-                str(row.get('Vendor', ''))[:20],
-                str(row.get('Accepted Date', ''))[:10]
-            ]
-            
-            for i, value in enumerate(data):
-                paragraph = row_cells[i].paragraphs[0]
-                run = paragraph.add_run(value)
-                run.font.size = Pt(10)
-            
-            current_row += 1
+        outpath = None
+        if not spooled_output.keep_output_files(config):
+            if status_callback:
+                status_callback("Writing order sheet...")
+            output = spooled_output.SpooledOutput(f"{today_date}_{vendor_name}_OrderSheet.docx",
+                                                  spooled_output.spool_limit(config))
+            try:
+                order_sheet.write_order_sheet(output.file, order_sheet.rows_from_frame(selected_df),
+                                              vendor_name, today_date)
+            except Exception:
+                output.close()
+                raise
+            return True, output
 
-        # Save document
-        doc.save(outpath)
+        output_dir = config['PATHS']['output_dir']
+        cache_key = output_cache.request_key(selected_df, '', None, 'order_sheet', today_date)
+        prefix = f"{today_date}_{vendor_name}_OrderSheet"
+        cached = output_cache.lookup(output_dir, cache_key, prefix)
+        if cached:
+            return True, cached
+        outpath = output_cache.cache_path(output_dir, cache_key, prefix)
+
+        # Stream the sheet into a temporary file, then move it into place
+        if status_callback:
+            status_callback("Writing order sheet...")
+        temp_path = f"{outpath}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            order_sheet.write_order_sheet(temp_path, order_sheet.rows_from_frame(selected_df),
+                                          vendor_name, today_date)
+            os.replace(temp_path, outpath)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
         
         if os.path.exists(outpath):
+            evict_cached_outputs(config, keep=outpath)
             return True, outpath
             
         return False, "Failed to create document"
 
     except Exception as e:
         logger.error(f"Error in create_robust_inventory_slip: {str(e)}")
-        if os.path.exists(outpath):
+        if outpath and os.path.exists(outpath):
             try:
                 os.remove(outpath)
             except:
@@ -1332,12 +1054,12 @@ def paste_json():
             return jsonify({'success': False, 'message': 'Could not process pasted JSON data.'}), 400
 
         # Store data using chunked storage
-        store_chunked_data('df_json', result_df)
+        store_session_data('df_json', result_df)
         # Only store raw data if it's small enough
         if len(pasted_json) < 2000:
-            store_chunked_data('raw_json', pasted_json)
+            store_session_data('raw_json', pasted_json)
         else:
-            store_chunked_data('raw_json', {"type": "large_json", "size": len(pasted_json)})
+            store_session_data('raw_json', {"type": "large_json", "size": len(pasted_json)})
         session['format_type'] = format_type
 
         return jsonify({'success': True, 'redirect': url_for('data_view')})
@@ -1346,6 +1068,11 @@ def paste_json():
 
 @app.route('/upload-csv', methods=['POST'])
 def upload_csv():
+    # Flask >= 3.1 allows a per-request limit; older versions keep the app-wide one
+    try:
+        request.max_content_length = MAX_CSV_UPLOAD_MB * 1024 * 1024
+    except AttributeError:
+        pass
     if 'file' not in request.files:
         flash('No file part')
         return redirect(url_for('index'))
@@ -1354,35 +1081,52 @@ def upload_csv():
         flash('No selected file')
         return redirect(url_for('index'))
     if file and allowed_file(file.filename):
-        filename = secure_filename(file.filename)
-        filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-        file.save(filepath)
+        # Parse the upload stream chunk by chunk straight into the dataset store;
+        # only the mapped columns of one chunk are in memory at a time
+        upload_id = request.form.get('upload_id')
+        upload_progress.cleanup()
+        stream = csv_columns.CountingStream(file.stream)
+        total_bytes = request.content_length
+        
+        def report(rows):
+            upload_progress.update(upload_id, status='processing', rows=rows,
+                                   bytes_read=stream.bytes_read, total_bytes=total_bytes)
+        
         try:
-            df = pd.read_csv(filepath)
-            processed_df, msg = process_csv_data(df)
-            if processed_df is None:
-                flash(msg)
-                return redirect(url_for('index'))
+            report(0)
+            with session_storage.DatasetWriter(source='csv', filename=secure_filename(file.filename)) as writer:
+                rows, error = csv_columns.ingest_csv(stream, writer.append, progress=report)
+                if error:
+                    writer.abort()
+                    upload_progress.update(upload_id, status='error', message=error)
+                    flash(error)
+                    return redirect(url_for('index'))
+                dataset_id = writer.commit()
             
-            # Store data using chunked storage
-            store_chunked_data('df_json', processed_df)
-            # Only store raw data if it's small enough
-            raw_json = df.to_json(orient='records', default_handler=str)
-            if len(raw_json) < 2000:
-                store_chunked_data('raw_json', raw_json)
-            else:
-                store_chunked_data('raw_json', {"type": "large_csv", "rows": len(df), "columns": list(df.columns)})
+            store_session_dataset('df_json', dataset_id)
+            store_session_data('raw_json', {"type": "large_csv", "rows": rows, "columns": writer.columns or []})
             session['format_type'] = 'CSV'
+            upload_progress.update(upload_id, status='done', rows=rows)
             
             flash('CSV uploaded and processed successfully')
             return redirect(url_for('data_view'))
         except Exception as e:
+            logger.error(f"Error processing CSV upload: {str(e)}", exc_info=True)
+            upload_progress.update(upload_id, status='error', message=str(e))
             flash(f'Failed to process CSV: {str(e)}')
             return redirect(url_for('index'))
     else:
         flash('Invalid file type')
         return redirect(url_for('index'))
 
+@app.route('/upload-progress/<upload_id>')
+def upload_progress_status(upload_id):
+    """Rows parsed so far for an upload in progress, polled by the upload forms"""
+    progress = upload_progress.get(upload_id)
+    if progress is None:
+        return jsonify({'status': 'unknown'}), 404
+    return jsonify(progress)
+
 # Excel Upload Route (labelMaker-style fields)
 @app.route('/upload-excel', methods=['POST'])
 def upload_excel():
@@ -1409,35 +1153,14 @@ def upload_excel():
             validate_excel_data
         )
         
-        # Save file temporarily
         filename = secure_filename(file.filename)
-        filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-        file.save(filepath)
-        
         logger.info(f"Processing Excel file: {filename}")
         
-        # Process Excel file with labelMaker field mapping
-        df = process_excel_file(filepath)
-        
-        # Validate data
-        is_valid, error_msg = validate_excel_data(df)
-        if not is_valid:
-            flash(f'Excel validation failed: {error_msg}', 'error')
-            return redirect(url_for('index'))
-        
-        # Convert to inventory format
-        inventory_df = convert_to_inventory_format(df)
-        
         # Check if there's existing JSON data with a vendor
         json_vendor = None
-        df_json = get_chunked_data('df_json')
-        if df_json:
+        json_df = get_session_data('df_json')
+        if json_df is not None:
             try:
-                if isinstance(df_json, list):
-                    json_df = pd.DataFrame(df_json)
-                else:
-                    json_df = pd.read_json(df_json, orient='records')
-                
                 if not json_df.empty and 'Vendor' in json_df.columns:
                     json_vendor = json_df['Vendor'].iloc[0] if len(json_df) > 0 else None
                     if json_vendor:
@@ -1448,36 +1171,43 @@ def upload_excel():
             except Exception as e:
                 logger.warning(f"Could not extract vendor from existing JSON data: {e}")
         
-        # Filter Excel data by vendor if JSON vendor exists
-        if json_vendor and 'vendor' in inventory_df.columns:
-            original_count = len(inventory_df)
-            # Match vendor name (case-insensitive)
-            inventory_df = inventory_df[
-                inventory_df['vendor'].str.lower().str.contains(json_vendor.lower(), na=False)
-            ]
-            filtered_count = len(inventory_df)
-            
+        # Read only the mapped columns straight from the upload, dropping other
+        # vendors' rows (case-insensitive match) while the sheet is read
+        df = process_excel_file(file.stream, vendor=json_vendor, filename=filename)
+        if df.attrs.get('vendor_filtered') and df.attrs.get('rows_read'):
+            original_count = df.attrs.get('rows_read', 0)
+            filtered_count = len(df)
             if filtered_count == 0:
                 flash(f'No products found matching vendor "{json_vendor}" in Excel file. Showing all {original_count} products.', 'warning')
-                # Reset to original data if no matches
-                inventory_df = convert_to_inventory_format(df)
+                # Read again without the filter if nothing matched
+                file.stream.seek(0)
+                df = process_excel_file(file.stream, filename=filename)
             else:
                 logger.info(f"Filtered Excel data: {filtered_count} of {original_count} products match vendor '{json_vendor}'")
                 flash(f'Filtered to {filtered_count} products matching vendor "{json_vendor}"', 'success')
         else:
-            logger.info(f"No vendor filter applied - processed all {len(inventory_df)} products from Excel")
+            logger.info(f"No vendor filter applied - processed all {len(df)} products from Excel")
+        
+        # Validate data
+        is_valid, error_msg = validate_excel_data(df)
+        if not is_valid:
+            flash(f'Excel validation failed: {error_msg}', 'error')
+            return redirect(url_for('index'))
+        
+        # Convert to inventory format
+        inventory_df = convert_to_inventory_format(df)
         
         # Store data using chunked storage
-        if not store_chunked_data('excel_df', inventory_df):
+        if not store_session_data('excel_df', inventory_df):
             flash('Failed to store Excel data. The dataset may be too large.', 'error')
             return redirect(url_for('index'))
         
         # Store original Excel data (if small enough)
         raw_json = df.to_json(orient='records', default_handler=str)
         if len(raw_json) < 10000:
-            store_chunked_data('excel_raw', raw_json)
+            store_session_data('excel_raw', raw_json)
         else:
-            store_chunked_data('excel_raw', {
+            store_session_data('excel_raw', {
                 "type": "excel_upload", 
                 "rows": len(df), 
                 "columns": list(df.columns)
@@ -1492,13 +1222,6 @@ def upload_excel():
         logger.error(f'Failed to process Excel file: {str(e)}', exc_info=True)
         flash(f'Failed to process Excel file: {str(e)}', 'error')
         return redirect(url_for('index'))
-    finally:
-        # Clean up temporary file
-        if os.path.exists(filepath):
-            try:
-                os.remove(filepath)
-            except:
-                pass
 
 # Then, update the URL loading function
 @app.route('/load-url', methods=['POST'])
@@ -1529,9 +1252,9 @@ def load_url():
         
         # Clear existing data and store new data
         for key in ['df_json', 'raw_json']:
-            clear_chunked_data(key)
+            clear_session_data(key)
             
-        if not store_chunked_data('df_json', result_df):
+        if not store_session_data('df_json', result_df):
             print("Failed to store DataFrame")
             flash('Failed to store data. The dataset may be too large. Please try a smaller dataset.', 'error')
             return redirect(url_for('index'))
@@ -1539,7 +1262,7 @@ def load_url():
         # Store format type and raw data if available
         session['format_type'] = format_type
         if raw_data and len(str(raw_data)) < 10000:  # Only store if not too large
-            store_chunked_data('raw_json', json.dumps(raw_data))
+            store_session_data('raw_json', json.dumps(raw_data))
             
         flash(f'Successfully loaded {len(result_df)} records from {format_type} data source.', 'success')
         print("Redirecting to data_view")
@@ -1564,11 +1287,11 @@ def handle_bamboo_url(url):
             flash('Could not process Bamboo data from URL', 'error')
             return redirect(url_for('index'))
         
-        store_chunked_data('df_json', result_df)
+        store_session_data('df_json', result_df)
         
         # Store raw data for transfer info extraction
         if raw_data:
-            store_chunked_data('raw_json', json.dumps(raw_data))
+            store_session_data('raw_json', json.dumps(raw_data))
         
         session['format_type'] = format_type
         flash(f'{format_type} data loaded successfully', 'success')
@@ -1582,68 +1305,47 @@ def load_from_url(url):
     """Download JSON or CSV data from a URL and return as DataFrame, format_type, and raw_data."""
     import traceback
     try:
-        import ijson
-        # Add headers to mimic a real browser and avoid bot detection
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-            'Accept': 'application/json, text/plain, */*',
-            'Accept-Language': 'en-US,en;q=0.9',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'Connection': 'keep-alive',
-            'Cache-Control': 'no-cache',
-            'Pragma': 'no-cache'
-        }
-        
-        with requests.get(url, timeout=30, stream=True, headers=headers, allow_redirects=True) as response:
+        # A previously parsed copy is revalidated instead of downloaded and parsed again
+        cache_key = http_cache.cache_key(url, headers=http_client.BROWSER_HEADERS, kind='load_from_url')
+        cached = http_cache.lookup(cache_key)
+        headers = dict(http_client.BROWSER_HEADERS, **http_cache.conditional_headers(cached))
+        
+        # Browser-like headers avoid bot detection; the pooled client decodes gzip/br while streaming
+        with http_client.get(url, timeout=30, stream=True, headers=headers, allow_redirects=True) as response:
+            if response.status_code == 304 and cached:
+                return http_cache.reuse(cache_key, cached)
             response.raise_for_status()
             content_type = response.headers.get('Content-Type', '').lower()
-            raw_text = response.text
-            print(f"Raw response (first 500 chars): {raw_text[:500]}")
+            
+            # Parse straight from the socket; the body is never held in memory as a whole
+            response.raw.decode_content = True
+            kind, body = sniff(response.raw)
+            logger.info(f"Streaming {kind} payload from {url} (Content-Type: {content_type or 'not set'})")
             
             # Check if response is HTML (error page)
-            if raw_text.strip().startswith('<') or 'text/html' in content_type:
+            if kind == 'html' or 'text/html' in content_type:
                 raise ValueError(f"The URL returned HTML content instead of JSON. This usually means the URL is incorrect, the server is down, or you need authentication. URL: {url}")
             
-            # Decide how to parse based on first non-whitespace character
-            first_char = raw_text.lstrip()[0] if raw_text.lstrip() else ''
-            if 'application/json' in content_type or url.lower().endswith('.json'):
-                if first_char == '{':
-                    # Top-level object, use json.loads
-                    data = json.loads(raw_text)
-                    df, format_type = parse_inventory_json(data)
-                    return df, format_type, data
-                elif first_char == '[':
-                    # Top-level array, use ijson
-                    parser = ijson.items(response.raw, 'item')
-                    data = [item for item in parser]
-                    df, format_type = parse_inventory_json(data)
-                    return df, format_type, data
-                else:
-                    raise ValueError("Unknown JSON structure")
-            elif 'text/csv' in content_type or url.lower().endswith('.csv'):
-                df = pd.read_csv(response.raw)
-                df, msg = process_csv_data(df)
-                return df, 'CSV', None
+            is_json = 'application/json' in content_type or url.lower().endswith('.json')
+            is_csv = 'text/csv' in content_type or url.lower().endswith('.csv')
+            if kind == 'object' and not is_csv:
+                result = stream_manifest(body)
+            elif kind == 'array' and not is_csv:
+                # Top-level arrays are not a known manifest format
+                return None, "Unknown JSON format", None
+            elif is_json:
+                raise ValueError("Unknown JSON structure")
             else:
                 try:
-                    if first_char == '{':
-                        data = json.loads(raw_text)
-                        df, format_type = parse_inventory_json(data)
-                        return df, format_type, data
-                    elif first_char == '[':
-                        parser = ijson.items(response.raw, 'item')
-                        data = [item for item in parser]
-                        df, format_type = parse_inventory_json(data)
-                        return df, format_type, data
-                    else:
-                        raise ValueError("Unknown JSON structure")
-                except Exception:
-                    try:
-                        df = pd.read_csv(response.raw)
-                        df, msg = process_csv_data(df)
-                        return df, 'CSV', None
-                    except Exception as e:
-                        raise ValueError(f"Unsupported data format or failed to parse: {e}")
+                    df = csv_columns.read_csv(body)
+                    df, msg = process_csv_data(df)
+                    result = (df, 'CSV', None)
+                except Exception as e:
+                    raise ValueError(f"Unsupported data format or failed to parse: {e}")
+        
+        if result[0] is not None:
+            http_cache.store(cache_key, response, result)
+        return result
                         
     except requests.exceptions.ConnectionError as e:
         error_msg = f"Connection failed: Unable to connect to {url}. The server may be down or the URL may be incorrect. Please verify the URL and try again."
@@ -1677,7 +1379,7 @@ def load_from_url(url):
         error_msg = "Too many redirects: The URL redirects too many times. Please check the URL or contact the provider."
         logger.error(f"Too many redirects for URL {url}: {str(e)}")
         raise ValueError(error_msg)
-    except json.JSONDecodeError as e:
+    except (json.JSONDecodeError, ijson.JSONError) as e:
         error_msg = "Invalid JSON format: The response contains malformed JSON data. Please verify the URL provides valid JSON."
         logger.error(f"JSON decode error for URL {url}: {str(e)}")
         raise ValueError(error_msg)
@@ -1694,30 +1396,17 @@ def load_from_url(url):
 @app.route('/data-view')
 def data_view():
     try:
-        # Get chunked data from session
-        df_json = get_chunked_data('df_json')
+        # Load the dataset stored for this session
+        df = get_session_data('df_json')
         format_type = session.get('format_type')
 
-        if df_json is None:
+        if df is None:
             flash('No data available. Please load data first.')
             return redirect(url_for('index'))
-
-        try:
-            if isinstance(df_json, list):
-                df = pd.DataFrame(df_json)
-            else:
-                df = pd.read_json(df_json, orient='records')
-        except Exception as e:
-            logger.error(f"Error parsing JSON data: {str(e)}")
-            flash('Error loading data. Please try again.')
-            return redirect(url_for('index'))
         
         # Debug logging
         logger.info(f"DataFrame shape: {df.shape}")
         logger.info(f"DataFrame columns: {df.columns.tolist()}")
-        if not df.empty:
-            logger.info(f"First row data: {df.iloc[0].to_dict()}")
-            logger.info(f"First row keys: {list(df.iloc[0].keys())}")
         
         # Extract transfer information from the DataFrame (first row)
         transfer_info = {
@@ -1728,7 +1417,6 @@ def data_view():
         
         if not df.empty:
             first_row = df.iloc[0]
-            logger.info(f"Extracting from first row: {first_row.to_dict()}")
             
             # Use the exact column names that exist in the data
             if 'Vendor' in first_row:
@@ -1745,140 +1433,37 @@ def data_view():
         
         logger.info(f"Final transfer info: {transfer_info}")
         
-        # Check if there's Excel data to merge
-        excel_df_json = get_chunked_data('excel_df')
-        excel_products = []
-        
-        if excel_df_json and session.get('has_excel_data'):
-            try:
-                if isinstance(excel_df_json, list):
-                    excel_df = pd.DataFrame(excel_df_json)
-                else:
-                    excel_df = pd.read_json(excel_df_json, orient='records')
-                
-                logger.info(f"Found Excel data with {len(excel_df)} products")
-                
-                # Convert Excel data to product format
-                for idx, row in excel_df.iterrows():
-                    product = {
-                        'id': len(df) + idx,  # Offset ID to avoid conflicts
-                        'name': str(row.get('product_name', '')),
-                        'strain': str(row.get('strain_name', '')),
-                        'sku': str(row.get('sku', '') or row.get('barcode', '')),
-                        'quantity': str(row.get('quantity', '0')),
-                        'source': 'Excel Upload',
-                        'vendor': str(row.get('vendor', 'Unknown')),
-                        'manifest_id': str(row.get('sku', 'N/A')),
-                        'accepted_date': str(row.get('accepted_date', 'N/A')),
-                        'type': str(row.get('product_type', 'Unknown')),
-                        'cost': float(row.get('price', 0)) if 'price' in row else 0,
-                        'brand': str(row.get('brand', '')),
-                        'weight': str(row.get('weight', '')),
-                        'weight_unit': str(row.get('weight_unit', ''))
-                    }
-                    excel_products.append(product)
-                
-                logger.info(f"Added {len(excel_products)} products from Excel")
-            except Exception as e:
-                logger.error(f"Error processing Excel data for display: {e}")
-        
-        # Format data for template
-        products = []
-        for idx, row in df.iterrows():
-            product = {
-                'id': idx,
-                'name': str(row.get('Product Name*', '')),
-                'strain': str(row.get('Strain Name', '')),
-                'sku': str(row.get('Barcode*', '')),
-                'quantity': str(row.get('Quantity Received*', '')),
-                'source': format_type or 'Unknown',
-                'vendor': str(row.get('Vendor', 'Unknown')),
-                'manifest_id': str(row.get('Barcode*', 'N/A')),
-                'accepted_date': str(row.get('Accepted Date', 'N/A')),
-                'type': str(row.get('Product Type*', 'Unknown')),
-                'cost': float(row.get('Cost', 0)) if 'Cost' in row else 0
-            }
-            products.append(product)
-        
-        # Merge Excel products with JSON products
-        products.extend(excel_products)
-
-        # Smart grouping by similar product terms, then alphabetical
-        def create_smart_groups(products):
-            """Group products by similar terms first, then alphabetically within groups"""
-            from collections import defaultdict
-            import re
-            
-            # Define priority terms to group by (case insensitive)
-            priority_terms = [
-                'vaporizer',
-                'honey crystal', 
-                'rosin',
-                'shatter',
-                'wax',
-                'live resin',
-                'distillate',
-                'cart',
-                'cartridge',
-                'edible',
-                'gummies',
-                'chocolate',
-                'flower',
-                'pre-roll',
-                'joint',
-                'hash',
-                'kief',
-                'tincture',
-                'oil',
-                'capsule',
-                'topical',
-                'cream',
-                'balm'
-            ]
+        def build_view_products():
+            # Check if there's Excel data to merge
+            excel_df = get_session_data('excel_df')
+            excel_products = []
             
-            # Group products by matching terms
-            term_groups = defaultdict(list)
-            unmatched_products = []
-            
-            for product in products:
-                product_name = product['name'].lower()
-                matched = False
-                
-                # Check for priority terms
-                for term in priority_terms:
-                    if term in product_name:
-                        term_groups[term.title()].append(product)
-                        matched = True
-                        break
-                
-                if not matched:
-                    unmatched_products.append(product)
-            
-            # Sort each term group alphabetically
-            sorted_groups = []
-            for term in sorted(term_groups.keys()):
-                group_products = sorted(term_groups[term], key=lambda x: x['name'].lower())
-                # Split into chunks of 4
-                for i in range(0, len(group_products), 4):
-                    sorted_groups.append({
-                        'group_label': f"{term} Products",
-                        'products': group_products[i:i+4]
-                    })
+            if excel_df is not None and session.get('has_excel_data'):
+                try:
+                    logger.info(f"Found Excel data with {len(excel_df)} products")
+                    
+                    # Convert Excel data to product format
+                    excel_products = build_excel_products(excel_df, len(df))
+                    
+                    logger.info(f"Added {len(excel_products)} products from Excel")
+                except Exception as e:
+                    logger.error(f"Error processing Excel data for display: {e}")
             
-            # Add unmatched products, grouped alphabetically
-            if unmatched_products:
-                unmatched_sorted = sorted(unmatched_products, key=lambda x: x['name'].lower())
-                # Split into chunks of 4
-                for i in range(0, len(unmatched_sorted), 4):
-                    group_start_letter = unmatched_sorted[i]['name'][0].upper() if unmatched_sorted[i]['name'] else 'Other'
-                    sorted_groups.append({
-                        'group_label': f"Other Products ({group_start_letter}+)",
-                        'products': unmatched_sorted[i:i+4]
-                    })
+            # Format data for template
+            products = build_products(df, format_type)
             
-            return sorted_groups
-
-        sorted_groups = create_smart_groups(products)
+            # Merge Excel products with JSON products
+            products.extend(excel_products)
+            return products
+
+        # Smart grouping by similar product terms, then alphabetical.
+        # Groups are rebuilt only when the stored datasets change.
+        data_version = (
+            session.get('df_json_dataset'),
+            session.get('excel_df_dataset') if session.get('has_excel_data') else None,
+            format_type
+        )
+        sorted_groups = grouped_products(data_version, build_view_products)
 
         # Load configuration
         config = load_config()
@@ -1903,138 +1488,225 @@ def data_view():
         flash('Error loading data. Please try again.')
         return redirect(url_for('index'))
 
+def selected_for_generation():
+    """Load the session dataset and the rows picked in the form.
+    Returns (selected_df, None), or (None, error response) to send back as is."""
+    # Check if session is valid and not timed out. Attempt recovery if data still present.
+    if not is_session_valid():
+        logger.info("Session reported invalid at generation start; attempting recovery.")
+        if has_session_data('df_json'):
+            update_session_activity()
+            logger.info("Recovered session using existing df_json data.")
+        else:
+            return None, (jsonify({
+                'success': False,
+                'timeout': True,
+                'message': 'Your session has timed out due to inactivity. Please refresh the page and reupload your data to continue.'
+            }), 440)  # Session timeout status code
+
+    # Update session activity
+    update_session_activity()
+
+    # Get selected products
+    selected_indices = request.form.getlist('selected_indices[]')
+
+    if not selected_indices:
+        return None, (jsonify({
+            'success': False,
+            'message': 'No products selected.'
+        }), 400)
+
+    # Convert indices to integers
+    try:
+        selected_indices = [int(idx) for idx in selected_indices]
+    except ValueError:
+        return None, (jsonify({
+            'success': False,
+            'message': 'Invalid product selection.'
+        }), 400)
+
+    logger.info(f"Selected indices: {selected_indices}")
+
+    # Load the dataset stored for this session
+    df = get_session_data('df_json')
+
+    if df is None:
+        return None, (jsonify({
+            'success': False,
+            'timeout': True,
+            'message': 'Session data is no longer available. Please refresh the page and reupload your data.'
+        }), 440)
+
+    logger.info(f"DataFrame shape: {df.shape}")
+    logger.info(f"DataFrame columns: {df.columns.tolist()}")
+
+    # Validate selected indices
+    if max(selected_indices) >= len(df):
+        return None, (jsonify({
+            'success': False,
+            'message': 'Invalid product selection - some selected items no longer exist.'
+        }), 400)
+
+    # Get only selected rows
+    selected_df = df.iloc[selected_indices].copy()
+    logger.info(f"Selected DataFrame shape: {selected_df.shape}")
+    return selected_df, None
+
 @app.route('/generate-slips', methods=['POST'])
 def generate_slips():
-    """Generate inventory slips using the original template-based method"""
+    """Queue inventory slip generation (template-based method) and return a job id to poll"""
     try:
-        # Check if session is valid and not timed out. Attempt recovery if data still present.
-        if not is_session_valid():
-            logger.info("Session reported invalid at generation start; attempting recovery.")
-            df_json_recover = get_chunked_data('df_json')
-            if df_json_recover is not None:
-                update_session_activity()
-                logger.info("Recovered session using existing df_json data.")
-            else:
-                return jsonify({
-                    'success': False,
-                    'timeout': True,
-                    'message': 'Your session has timed out due to inactivity. Please refresh the page and reupload your data to continue.'
-                }), 440  # Session timeout status code
-        
-        # Update session activity
-        update_session_activity()
-        
-        # Get selected products
-        selected_indices = request.form.getlist('selected_indices[]')
-        
-        if not selected_indices:
-            return jsonify({
-                'success': False,
-                'message': 'No products selected.'
-            }), 400
+        selected_df, error = selected_for_generation()
+        if error:
+            return error
         
-        # Convert indices to integers
-        try:
-            selected_indices = [int(idx) for idx in selected_indices]
-        except ValueError:
-            return jsonify({
-                'success': False,
-                'message': 'Invalid product selection.'
-            }), 400
-            
-        logger.info(f"Selected indices: {selected_indices}")
-        
-        # Load data from session using chunked data
-        df_json = get_chunked_data('df_json')
-        
-        if df_json is None:
-            return jsonify({
-                'success': False,
-                'timeout': True,
-                'message': 'Session data is no longer available. Please refresh the page and reupload your data.'
-            }), 440
+        # Load configuration
+        config = load_config()
         
-        # Convert JSON to DataFrame
+        # Queue the generation; the client polls /jobs/<id> for progress.
+        # Repeated clicks for the same selection share one job and one output file.
+        cache_key = slip_request_key(selected_df, config)
         try:
-            if isinstance(df_json, list):
-                df = pd.DataFrame(df_json)
-            else:
-                df = pd.read_json(df_json, orient='records')
-        except Exception as e:
-            logger.error(f"Error converting JSON to DataFrame: {str(e)}")
-            return jsonify({
-                'success': False,
-                'timeout': True,
-                'message': 'Data appears to be corrupted. Please refresh the page and reupload your data.'
-            }), 440
-        
-        logger.info(f"DataFrame shape: {df.shape}")
-        logger.info(f"DataFrame columns: {df.columns.tolist()}")
-        
-        # Validate selected indices
-        if max(selected_indices) >= len(df):
+            job = generation_jobs.submit(
+                run_full_process_inventory_slips,
+                selected_df,
+                config,
+                owner=current_job_owner(),
+                dedupe_key=cache_key,
+                cache_key=cache_key,
+                # Unsaved documents go where any worker process can serve the download
+                shared_spool=True
+            )
+        except QueueFullError as e:
+            logger.warning(f"Generation queue full: {e}")
             return jsonify({
                 'success': False,
-                'message': 'Invalid product selection - some selected items no longer exist.'
-            }), 400
+                'message': 'The server is busy generating other documents. Please try again in a moment.'
+            }), 503
         
-        # Get only selected rows
-        selected_df = df.iloc[selected_indices].copy()
-        logger.info(f"Selected DataFrame shape: {selected_df.shape}")
+        logger.info(f"Queued document generation job {job.job_id}")
+        return jsonify({
+            'success': True,
+            'job_id': job.job_id,
+            'status_url': url_for('job_status', job_id=job.job_id),
+            'download_url': url_for('job_download', job_id=job.job_id)
+        }), 202
+    
+    except Exception as e:
+        logger.error(f"Error in generate_slips: {str(e)}", exc_info=True)
+        return jsonify({
+            'success': False,
+            'message': f'Error generating slips: {str(e)}'
+        }), 500
+
+@app.route('/generate-slips-batch', methods=['POST'])
+def generate_slips_batch():
+    """Queue one slip document per vendor and accepted date, downloaded as a single ZIP"""
+    try:
+        selected_df, error = selected_for_generation()
+        if error:
+            return error
         
-        # Load configuration
         config = load_config()
-        
-        # Generate the file
-        status_messages = []
-        progress_values = []
-        
-        def status_callback(msg):
-            status_messages.append(msg)
-            logger.info(f"Status: {msg}")
-        
-        def progress_callback(value):
-            progress_values.append(value)
-        
-        logger.info("Starting document generation...")
-        success, result = run_full_process_inventory_slips(
-            selected_df,
-            config,
-            status_callback,
-            progress_callback
-        )
-        
-        if success:
-            logger.info(f"Document generated successfully: {result}")
-            # Validate the generated file
-            if not validate_docx(result):
-                logger.error("Generated document failed validation")
-                return jsonify({
-                    'success': False,
-                    'message': 'Generated document appears to be corrupted. Please try again.'
-                }), 500
-            
-            # Return the file for download
-            return send_file(
-                result,
-                as_attachment=True,
-                download_name=os.path.basename(result),
-                mimetype='application/vnd.openxmlformats-officedocument.wordprocessingml.document'
+        cache_key = batch_request_key(selected_df, config)
+        try:
+            job = generation_jobs.submit(
+                run_batch_inventory_slips,
+                selected_df,
+                config,
+                owner=current_job_owner(),
+                dedupe_key=cache_key,
+                cache_key=cache_key,
+                # Unsaved documents go where any worker process can serve the download
+                shared_spool=True
             )
-        else:
-            logger.error(f"Document generation failed: {result}")
+        except QueueFullError as e:
+            logger.warning(f"Generation queue full: {e}")
             return jsonify({
                 'success': False,
-                'message': f'Failed to generate inventory slips: {result}'
-            }), 500
+                'message': 'The server is busy generating other documents. Please try again in a moment.'
+            }), 503
+        
+        logger.info(f"Queued batch generation job {job.job_id}")
+        return jsonify({
+            'success': True,
+            'job_id': job.job_id,
+            'status_url': url_for('job_status', job_id=job.job_id),
+            'download_url': url_for('job_download', job_id=job.job_id)
+        }), 202
     
     except Exception as e:
-        logger.error(f"Error in generate_slips: {str(e)}", exc_info=True)
+        logger.error(f"Error in generate_slips_batch: {str(e)}", exc_info=True)
         return jsonify({
             'success': False,
             'message': f'Error generating slips: {str(e)}'
         }), 500
 
+def send_generated(result, close=False):
+    """Download response for a generator result: a saved path, or a SpooledOutput
+    streamed straight from memory (closed afterwards when close is set)"""
+    if isinstance(result, spooled_output.SpooledOutput):
+        def chunks():
+            try:
+                yield from result.iter_chunks()
+            finally:
+                if close:
+                    result.close()
+        response = Response(chunks(), mimetype=result.mimetype)
+        response.headers['Content-Length'] = str(result.size)
+        response.headers.set('Content-Disposition', 'attachment', filename=result.filename)
+        return response
+    return send_file(
+        result,
+        as_attachment=True,
+        download_name=os.path.basename(result),
+        mimetype=spooled_output.ZIP_MIMETYPE if result.endswith('.zip') else spooled_output.DOCX_MIMETYPE
+    )
+
+def current_job_owner():
+    """Identify the browser session that owns a generation job"""
+    return getattr(session, 'sid', None)
+
+@app.route('/jobs/<job_id>', methods=['GET'])
+def job_status(job_id):
+    """Report state, progress and new status messages for a generation job.
+    Pass ?since=<next_message> to receive only messages not seen yet."""
+    job = generation_jobs.get(job_id, current_job_owner())
+    if job is None:
+        return jsonify({'success': False, 'message': 'Unknown job.'}), 404
+    
+    since = request.args.get('since', 0, type=int)
+    status = job.to_dict(since)
+    status['success'] = True
+    if job.state == 'done':
+        status['download_url'] = url_for('job_download', job_id=job.job_id)
+    return jsonify(status)
+
+@app.route('/jobs/<job_id>/download', methods=['GET'])
+def job_download(job_id):
+    """Serve the document produced by a finished generation job"""
+    job = generation_jobs.get(job_id, current_job_owner())
+    if job is None:
+        return jsonify({'success': False, 'message': 'Unknown job.'}), 404
+    if job.state == 'failed':
+        return jsonify({'success': False, 'message': f'Failed to generate inventory slips: {job.error}'}), 500
+    if job.state != 'done':
+        return jsonify({'success': False, 'message': 'Document is not ready yet.'}), 409
+    result = job.result
+    if isinstance(result, dict):
+        # Spooled by a job in another worker process
+        result = spooled_output.SpooledOutput.from_state(result)
+    if isinstance(result, spooled_output.SpooledOutput):
+        if not result.available:
+            return jsonify({'success': False, 'message': 'Generated document is no longer available.'}), 410
+        # Spooled documents are removed once they have been streamed
+        return send_generated(result, close=True)
+    # Saved documents are only ever served from the output cache
+    if not (isinstance(result, str) and output_cache.in_cache(load_config()['PATHS']['output_dir'], result)):
+        return jsonify({'success': False, 'message': 'Generated document is no longer available.'}), 410
+    
+    return send_generated(result)
+
 @app.route('/session/ping', methods=['GET'])
 def session_ping():
     """Keep-alive endpoint to refresh session activity while user is active on data view.
@@ -2064,24 +1736,13 @@ def generate_robust_slips_docx():
         selected_indices = [int(idx) for idx in selected_indices]
         logger.info(f"Selected indices for robust slip: {selected_indices}")
         
-        # Load data from session using chunked data
-        df_json = get_chunked_data('df_json')
+        # Load the dataset stored for this session
+        df = get_session_data('df_json')
         
-        if df_json is None:
+        if df is None:
             flash('No data available. Please load data first.')
             return redirect(url_for('data_view'))
         
-        # Convert JSON to DataFrame
-        try:
-            if isinstance(df_json, list):
-                df = pd.DataFrame(df_json)
-            else:
-                df = pd.read_json(df_json, orient='records')
-        except Exception as e:
-            logger.error(f"Error converting JSON to DataFrame: {str(e)}")
-            flash('Error loading data. Please try again.')
-            return redirect(url_for('data_view'))
-        
         # Get only selected rows
         selected_df = df.iloc[selected_indices].copy()
         logger.info(f"Selected DataFrame shape for robust slip: {selected_df.shape}")
@@ -2103,12 +1764,7 @@ def generate_robust_slips_docx():
         if success:
             logger.info(f"Robust document generated successfully: {result}")
             # Return the file for download
-            return send_file(
-                result,
-                as_attachment=True,
-                download_name=os.path.basename(result),
-                mimetype='application/vnd.openxmlformats-officedocument.wordprocessingml.document'
-            )
+            return send_generated(result, close=True)
         else:
             logger.error(f"Robust document generation failed: {result}")
             flash(f'Failed to generate robust inventory slips: {result}')
@@ -2175,6 +1831,17 @@ def settings():
             if output_dir:
                 config['PATHS']['output_dir'] = output_dir
         
+        if 'template_path' in request.form:
+            template_path = request.form['template_path'].strip()
+            old_template_path = config['PATHS'].get('template_path', '')
+            if template_path and template_path != old_template_path:
+                if not os.path.exists(template_path) or not template_path.lower().endswith('.docx'):
+                    flash(f'Template not found or not a .docx file: {template_path}')
+                    return redirect(url_for('settings'))
+                config['PATHS']['template_path'] = template_path
+                # Drop the compiled copy of the old template
+                template_cache.invalidate(old_template_path)
+        
         # Save updated config
         save_config(config)
         flash('Settings saved successfully')
@@ -2233,8 +1900,15 @@ class APIClient:
         url = f"{self.api_config['base_url']}/{self.api_config['version']}/{endpoint}"
         headers = self.get_headers()
         
+        # GET responses are revalidated against the cached copy for these credentials
+        cache_key = cached = None
+        if method == 'GET':
+            cache_key = http_cache.cache_key(url, params=params, headers=headers, kind='api_json')
+            cached = http_cache.lookup(cache_key)
+            headers.update(http_cache.conditional_headers(cached))
+        
         try:
-            response = requests.request(
+            response = http_client.request(
                 method=method,
                 url=url,
                 headers=headers,
@@ -2242,12 +1916,274 @@ class APIClient:
                 json=data,
                 timeout=30
             )
+            if response.status_code == 304 and cached:
+                return http_cache.reuse(cache_key, cached)
             response.raise_for_status()
-            return response.json()
+            result = response.json()
+            if cache_key:
+                http_cache.store(cache_key, response, result)
+            return result
         except requests.exceptions.RequestException as e:
             logger.error(f"API request failed: {str(e)}")
             raise
 
+    def iter_pages(self, endpoint, params=None, page_size=API_PAGE_SIZE):
+        """Yield each page of a listing endpoint, requesting the next one only when needed"""
+        params = dict(params or {})
+        paging = self.api_config.get('paging')
+        if not paging:
+            yield self.make_request(endpoint, params=params)
+            return
+        
+        params[paging['size_param']] = page_size
+        page_number = 1
+        for _ in range(API_MAX_PAGES):
+            if paging['style'] == 'page':
+                params[paging['page_param']] = page_number
+            page = self.make_request(endpoint, params=params)
+            yield page
+            
+            if paging['style'] == 'cursor':
+                cursor = page
+                for key in paging['next_cursor'].split('.'):
+                    cursor = cursor.get(key) if isinstance(cursor, dict) else None
+                if not cursor:
+                    return
+                params[paging['cursor_param']] = cursor
+            else:
+                total_pages = page.get('total_pages') if isinstance(page, dict) else None
+                if total_pages is not None and page_number >= int(total_pages):
+                    return
+                if len(page_documents(page)) < page_size:
+                    return
+                page_number += 1
+        logger.warning(f"{self.api_type} listing {endpoint} stopped after {API_MAX_PAGES} pages")
+    
+    def fetch_transfers(self, date_from, date_to):
+        """Fetch the transfers listed between two dates"""
+        endpoint, from_param, to_param = TRANSFER_ENDPOINTS[self.api_type]
+        return self.make_request(endpoint, params={from_param: date_from, to_param: date_to})
+    
+    def iter_transfer_pages(self, date_from=None, date_to=None, updated_since=None):
+        """Yield transfer listing pages for a date range and/or everything updated since a mark"""
+        endpoint, from_param, to_param = TRANSFER_ENDPOINTS[self.api_type]
+        params = {}
+        if date_from:
+            params[from_param] = date_from
+        if date_to:
+            params[to_param] = date_to
+        if updated_since:
+            params[self.api_config['updated_since_param']] = updated_since
+        return self.iter_pages(endpoint, params=params)
+
+    def fetch_manifest(self, url):
+        """Fetch one manifest by its shared URL"""
+        # None of the provider APIs documents a fetch-by-ID route, so only shared URLs are accepted
+        if not url.startswith(('http://', 'https://')):
+            raise ValueError(f"Not a manifest URL: {url}")
+        response = http_client.get(url, timeout=30, headers=http_client.BROWSER_HEADERS, allow_redirects=True)
+        response.raise_for_status()
+        return response.json()
+
+def page_documents(page):
+    """Transfer documents on one listing page (a bare manifest counts as one)"""
+    if isinstance(page, list):
+        return page
+    if isinstance(page, dict):
+        for key in ('data', 'items', 'results', 'transfers'):
+            if isinstance(page.get(key), list):
+                return page[key]
+        return [page] if page else []
+    return []
+
+def parse_transfer_documents(documents):
+    """Parse listed transfer documents into one DataFrame.
+
+    Returns (DataFrame, format_type, errors): format_type is None unless every
+    document had the same format, and errors holds one message per document
+    that could not be parsed.
+    """
+    frames, formats, errors = [], set(), []
+    for number, document in enumerate(documents, 1):
+        df, format_type = parse_inventory_json(document)
+        if df is None:
+            errors.append(f"document {number}: {format_type}")
+            continue
+        formats.add(format_type)
+        if not df.empty:
+            frames.append(df)
+    result_df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+    return result_df, formats.pop() if len(formats) == 1 else None, errors
+
+def get_sync_mark(api_type, date_from=None, date_to=None):
+    """High-water mark of the sync that produced this session's dataset, or None.
+
+    The mark is kept in the session next to the id of the dataset the sync was
+    merged into; it only applies while that dataset is still loaded and the
+    provider and date range are the same, otherwise a full sync is needed.
+    """
+    state = session.get('sync_mark')
+    if not state or state.get('api_type') != api_type:
+        return None
+    if (state.get('date_from'), state.get('date_to')) != (date_from or None, date_to or None):
+        return None
+    if state.get('dataset') != session.get('df_json_dataset') or not has_session_data('df_json'):
+        return None
+    return state.get('updated_since')
+
+def save_sync_mark(api_type, mark, date_from=None, date_to=None):
+    """Record the high-water mark for the dataset now stored under df_json"""
+    session['sync_mark'] = {
+        'api_type': api_type,
+        'date_from': date_from or None,
+        'date_to': date_to or None,
+        'updated_since': mark,
+        'dataset': session.get('df_json_dataset'),
+    }
+
+def sync_transfers(client, date_from=None, date_to=None, since=None):
+    """Pull transfers updated since a high-water mark (or all of them), page by page.
+
+    Returns (DataFrame, new_mark). The mark is the time the sync started, so
+    anything updated while paging is pulled again next time. Raises
+    APIDataError if any transfer could not be parsed, so the caller keeps the
+    old mark and those transfers are requested again.
+    """
+    started_at = datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+    frames, errors = [], []
+    for page_number, page in enumerate(client.iter_transfer_pages(date_from, date_to, updated_since=since), 1):
+        df, _, page_errors = parse_transfer_documents(page_documents(page))
+        errors += [f"page {page_number}, {error}" for error in page_errors]
+        if not df.empty:
+            frames.append(df)
+    if errors:
+        raise APIDataError(f"{len(errors)} transfers could not be parsed ({'; '.join(errors[:3])})")
+    result_df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+    return result_df, started_at
+
+def batch_fetch_targets(form):
+    """Manifest URLs/IDs from the form, or one date per day of the requested range"""
+    manifests = [m.strip() for m in re.split(r'[\s,]+', form.get('manifests', '')) if m.strip()]
+    manifests += [m.strip() for m in form.getlist('manifests[]') if m.strip()]
+    if manifests:
+        bare = [m for m in manifests if not m.startswith(('http://', 'https://'))]
+        if bare:
+            raise ValueError(f"manifests must be shared manifest URLs, not IDs ({', '.join(bare[:3])})")
+        return list(dict.fromkeys(manifests)), False
+
+    start = datetime.strptime(form.get('date_from', ''), '%Y-%m-%d').date()
+    end = datetime.strptime(form.get('date_to', ''), '%Y-%m-%d').date()
+    days = (end - start).days + 1
+    if days < 1:
+        raise ValueError('date_to must not be before date_from')
+    if days > MAX_BATCH_DAYS:
+        raise ValueError(f'Date range too long for a batch fetch ({days} days, max {MAX_BATCH_DAYS})')
+    return [(start + timedelta(days=i)).isoformat() for i in range(days)], True
+
+def fetch_transfers_batch(client, config, form):
+    """Fetch several manifests concurrently and merge them into one dataset"""
+    try:
+        targets, by_day = batch_fetch_targets(form)
+    except ValueError as e:
+        return jsonify({'error': f'Invalid batch request: {e}'}), 400
+
+    concurrency = form.get('concurrency', type=int) or config.getint(
+        'HTTP', 'fetch_concurrency', fallback=batch_fetch.DEFAULT_CONCURRENCY)
+    if by_day:
+        # Each day is a listing: every page, and every transfer on it
+        def fetch(day):
+            return [document for page in client.iter_transfer_pages(day, day) for document in page_documents(page)]
+
+        def parse(documents):
+            df, format_type, errors = parse_transfer_documents(documents)
+            if errors:
+                raise ValueError(f"{len(errors)} of {len(documents)} transfers could not be parsed ({errors[0]})")
+            return df, format_type or client.api_type
+    else:
+        fetch = client.fetch_manifest
+        parse = parse_inventory_json
+
+    start = time.perf_counter()
+    try:
+        result_df, results = batch_fetch.fetch_batch(targets, fetch, parse, concurrency=concurrency)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    elapsed = round(time.perf_counter() - start, 3)
+
+    failed = [r for r in results if not r['ok']]
+    logger.info(f"Batch fetch: {len(results) - len(failed)}/{len(results)} manifests in {elapsed}s")
+    if result_df is None:
+        return jsonify({'error': 'No data found', 'manifests': results, 'elapsed_seconds': elapsed}), 404
+
+    formats = {r['format'] for r in results if r['ok']}
+    store_session_data('df_json', result_df)
+    session['format_type'] = formats.pop() if len(formats) == 1 else client.api_type
+    store_session_data('raw_json', {"type": "batch_fetch", "manifests": results})
+
+    message = f'Successfully fetched {len(result_df)} records from {len(results) - len(failed)} manifests'
+    if failed:
+        message += f' ({len(failed)} failed)'
+    return jsonify({
+        'success': True,
+        'message': message,
+        'manifests': results,
+        'elapsed_seconds': elapsed,
+        'redirect': url_for('data_view')
+    })
+
+def merge_transfer_delta(existing_df, delta_df):
+    """Append synced rows, dropping the existing rows they update.
+
+    Only existing rows whose barcode appears in the delta are replaced; blank
+    barcodes identify nothing, and barcodes repeated within the existing
+    data the delta did not touch are kept as they are.
+    """
+    kept_df = existing_df
+    if not delta_df.empty and 'Barcode*' in existing_df.columns and 'Barcode*' in delta_df.columns:
+        updated = delta_df['Barcode*'].fillna('').astype(str).str.strip()
+        updated = set(updated[updated != ''])
+        existing = existing_df['Barcode*'].fillna('').astype(str).str.strip()
+        kept_df = existing_df[~existing.isin(updated)]
+    return pd.concat([kept_df, delta_df], ignore_index=True)
+
+def fetch_transfers_incremental(client, date_from=None, date_to=None):
+    """Sync the transfer delta and merge it into this session's dataset for the provider"""
+    api_type = client.api_type
+    # Without the dataset the last sync was merged into, only a full sync is complete
+    since = get_sync_mark(api_type, date_from, date_to)
+    existing_df = get_session_data('df_json') if since else None
+    if existing_df is None:
+        since = None
+    try:
+        delta_df, mark = sync_transfers(client, date_from, date_to, since=since)
+    except APIDataError as e:
+        logger.error(f"Incremental {api_type} sync failed: {e}")
+        return jsonify({'error': str(e), 'since': since}), 502
+    logger.info(f"Incremental {api_type} sync since {since or 'the beginning'}: {len(delta_df)} records")
+    
+    result_df = delta_df
+    if existing_df is not None and not existing_df.empty:
+        result_df = merge_transfer_delta(existing_df, delta_df)
+    
+    if result_df.empty:
+        return jsonify({'error': 'No data found', 'since': since, 'synced_to': mark}), 404
+    
+    if not delta_df.empty:
+        if not store_session_data('df_json', result_df):
+            return jsonify({'error': 'Could not store the synced data', 'since': since}), 500
+        session['format_type'] = api_type
+        store_session_data('raw_json', {"type": "incremental_sync", "since": since, "synced_to": mark, "rows": len(delta_df)})
+    save_sync_mark(api_type, mark, date_from, date_to)
+    
+    return jsonify({
+        'success': True,
+        'message': (f'Fetched {len(delta_df)} updated records ({len(result_df)} total)' if since
+                    else f'Fetched all {len(result_df)} records'),
+        'since': since,
+        'synced_to': mark,
+        'redirect': url_for('data_view')
+    })
+
 # Add these new routes
 
 @app.route('/api/fetch-transfers', methods=['POST'])
@@ -2259,29 +2195,36 @@ def fetch_transfers():
         date_from = request.form.get('date_from')
         date_to = request.form.get('date_to')
         
+        if api_type not in TRANSFER_ENDPOINTS:
+            return jsonify({'error': 'Unsupported API type'}), 400
+        
         config = load_config()
         client = APIClient(api_type, config)
         
+        # Only transfers updated since the last successful sync, merged into the loaded data
+        if request.form.get('incremental'):
+            return fetch_transfers_incremental(client, date_from, date_to)
+        
+        # Several manifests (or one request per day of the range) fetched concurrently
+        if request.form.get('batch') or request.form.get('manifests') or request.form.getlist('manifests[]'):
+            return fetch_transfers_batch(client, config, request.form)
+        
         # Fetch data based on API type
+        data = client.fetch_transfers(date_from, date_to)
         if api_type == 'bamboo':
-            data = client.make_request('transfers', params={'start_date': date_from, 'end_date': date_to})
             result_df = parse_bamboo_data(data)
         elif api_type == 'cultivera':
-            data = client.make_request('manifests', params={'fromDate': date_from, 'toDate': date_to})
             result_df = parse_cultivera_data(data)
-        elif api_type == 'growflow':
-            data = client.make_request('inventory/transfers', params={'dateStart': date_from, 'dateEnd': date_to})
-            result_df = parse_growflow_data(data)
         else:
-            return jsonify({'error': 'Unsupported API type'}), 400
+            result_df = parse_growflow_data(data)
         
         if result_df is None or result_df.empty:
             return jsonify({'error': 'No data found'}), 404
             
-        # Store in session
-        session['df_json'] = result_df.to_json(orient='records')
+        # Store server-side; the session only keeps the dataset ids
+        store_session_data('df_json', result_df)
         session['format_type'] = api_type
-        session['raw_json'] = json.dumps(data)
+        store_session_data('raw_json', json.dumps(data))
         
         return jsonify({
             'success': True,
@@ -2398,14 +2341,14 @@ def handle_api_error(error):
 
 @app.route('/test-chunked-data')
 def test_chunked_data():
-    """Test route to debug chunked data storage"""
+    """Test route to debug server-side session data storage"""
     try:
         # Test storing and retrieving data
         test_data = {"test": "data", "number": 123}
-        logger.info("Testing chunked data storage...")
+        logger.info("Testing session data storage...")
         
-        store_chunked_data('test_key', json.dumps(test_data))
-        retrieved_data = get_chunked_data('test_key')
+        store_session_data('test_key', json.dumps(test_data))
+        retrieved_data = get_session_data('test_key')
         
         logger.info(f"Test data: {test_data}")
         logger.info(f"Retrieved data: {retrieved_data}")
@@ -2424,6 +2367,42 @@ def test_chunked_data():
         logger.error(f"Test failed: {str(e)}", exc_info=True)
         return jsonify({'success': False, 'error': str(e)})
 
+@app.route('/template-cache/stats')
+def template_cache_stats():
+    """Report compiled template cache hit/miss counters for this worker"""
+    return jsonify({
+        'success': True,
+        'pid': os.getpid(),
+        'stats': template_cache.cache_stats()
+    })
+
+@app.route('/dataset-cache/stats')
+def dataset_cache_stats():
+    """Report in-memory dataset LRU counters for this worker"""
+    return jsonify({
+        'success': True,
+        'pid': os.getpid(),
+        'stats': session_storage.cache_stats()
+    })
+
+@app.route('/output-cache/stats')
+def output_cache_stats():
+    """Report generated-document cache hit/miss/eviction counters for this worker"""
+    return jsonify({
+        'success': True,
+        'pid': os.getpid(),
+        'stats': output_cache.cache_stats()
+    })
+
+@app.route('/http-cache/stats')
+def http_cache_stats():
+    """Report manifest HTTP cache revalidation counters for this worker"""
+    return jsonify({
+        'success': True,
+        'pid': os.getpid(),
+        'stats': http_cache.cache_stats()
+    })
+
 @app.route('/test-url', methods=['POST'])
 def test_url():
     """Test URL accessibility and content type"""
@@ -2432,17 +2411,7 @@ def test_url():
         if not url:
             return jsonify({'success': False, 'message': 'No URL provided'}), 400
         
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-            'Accept': 'application/json, text/plain, */*',
-            'Accept-Language': 'en-US,en;q=0.9',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'Connection': 'keep-alive',
-            'Cache-Control': 'no-cache',
-            'Pragma': 'no-cache'
-        }
-        
-        response = requests.get(url, timeout=10, headers=headers, allow_redirects=True)
+        response = http_client.get(url, timeout=10, headers=http_client.BROWSER_HEADERS, allow_redirects=True)
         
         result = {
             'success': True,
@@ -2559,7 +2528,7 @@ def search_json_or_api():
         # Check if it looks like a URL
         if search_input.startswith(('http://', 'https://')):
             # Handle as API URL
-            return load_from_url(search_input)
+            return handle_bamboo_url(search_input)
         else:
             # Handle as JSON data
             return paste_json_data(search_input)
@@ -2584,29 +2553,14 @@ def paste_json_data(json_text):
             return redirect(url_for('index'))
         
         # Determine format and process
-        if 'transfers' in json_data:
-            # Bamboo format
-            df = parse_bamboo_data(json_data)
-            format_type = 'Bamboo'
-        elif 'manifest' in json_data:
-            # Cultivera format
-            df = parse_cultivera_data(json_data)
-            format_type = 'Cultivera'
-        elif 'data' in json_data and isinstance(json_data['data'], list):
-            # GrowFlow format
-            df = parse_growflow_data(json_data)
-            format_type = 'GrowFlow'
-        else:
-            # Generic inventory format
-            df = parse_inventory_json(json_data)
-            format_type = 'Generic'
+        df, format_type = parse_inventory_json(json_data)
         
         if df is None or df.empty:
             flash('No valid data found in JSON.')
             return redirect(url_for('index'))
         
         # Store data in session
-        store_chunked_data('df_json', df)
+        store_session_data('df_json', df)
         session['format_type'] = format_type
         
         flash(f'Successfully loaded {len(df)} items from {format_type} data.')
@@ -2659,12 +2613,13 @@ def validate_docx(file_path):
 def clear_data():
     """Clear all session data"""
     try:
-        # Clear all chunked data
-        for key in ['df_json', 'raw_json']:
-            clear_chunked_data(key)
+        # Clear all stored datasets
+        for key in ['df_json', 'raw_json', 'excel_df', 'excel_raw']:
+            clear_session_data(key)
         
         # Clear other session data
         session.pop('format_type', None)
+        session.pop('has_excel_data', None)
         
         flash('All data has been cleared successfully.', 'success')
         return redirect(url_for('index'))
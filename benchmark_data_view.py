@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Benchmark the data view product list: the old iterrows() loop against the
+column-wise builders in src/data/product_view.py.
+
+Usage: python benchmark_data_view.py [rows ...]   (default: 1000 10000 50000)
+"""
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.data.product_view import build_products, build_excel_products
+
+
+def legacy_products(df, format_type):
+    products = []
+    for idx, row in df.iterrows():
+        products.append({
+            'id': idx,
+            'name': str(row.get('Product Name*', '')),
+            'strain': str(row.get('Strain Name', '')),
+            'sku': str(row.get('Barcode*', '')),
+            'quantity': str(row.get('Quantity Received*', '')),
+            'source': format_type or 'Unknown',
+            'vendor': str(row.get('Vendor', 'Unknown')),
+            'manifest_id': str(row.get('Barcode*', 'N/A')),
+            'accepted_date': str(row.get('Accepted Date', 'N/A')),
+            'type': str(row.get('Product Type*', 'Unknown')),
+            'cost': float(row.get('Cost', 0)) if 'Cost' in row else 0
+        })
+    return products
+
+
+def legacy_excel_products(excel_df, offset):
+    products = []
+    for idx, row in excel_df.iterrows():
+        products.append({
+            'id': offset + idx,
+            'name': str(row.get('product_name', '')),
+            'strain': str(row.get('strain_name', '')),
+            'sku': str(row.get('sku', '') or row.get('barcode', '')),
+            'quantity': str(row.get('quantity', '0')),
+            'source': 'Excel Upload',
+            'vendor': str(row.get('vendor', 'Unknown')),
+            'manifest_id': str(row.get('sku', 'N/A')),
+            'accepted_date': str(row.get('accepted_date', 'N/A')),
+            'type': str(row.get('product_type', 'Unknown')),
+            'cost': float(row.get('price', 0)) if 'price' in row else 0,
+            'brand': str(row.get('brand', '')),
+            'weight': str(row.get('weight', '')),
+            'weight_unit': str(row.get('weight_unit', ''))
+        })
+    return products
+
+
+def manifest_frame(rows):
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        'Product Name*': [f"Product {i} Live Resin Cart" for i in range(rows)],
+        'Product Type*': rng.choice(['Concentrate', 'Flower', 'Edible'], rows),
+        'Quantity Received*': rng.integers(1, 500, rows),
+        'Barcode*': [f"ID{i:08d}" for i in range(rows)],
+        'Accepted Date': '2025-06-22',
+        'Vendor': '123 - Vend Co',
+        'Strain Name': np.where(rng.random(rows) < 0.1, None, 'Blue Dream'),
+        'Cost': rng.random(rows) * 100,
+    })
+
+
+def excel_frame(rows):
+    rng = np.random.default_rng(1)
+    return pd.DataFrame({
+        'product_name': [f"Item {i}" for i in range(rows)],
+        'sku': np.where(rng.random(rows) < 0.2, '', [f"SKU{i}" for i in range(rows)]),
+        'barcode': [f"BC{i}" for i in range(rows)],
+        'quantity': rng.integers(0, 50, rows),
+        'vendor': 'Vend Co',
+        'price': np.where(rng.random(rows) < 0.05, np.nan, rng.random(rows) * 20),
+        'weight': rng.random(rows),
+    })
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def main(sizes):
+    print(f"{'rows':>8} {'source':>8} {'iterrows':>10} {'columnar':>10} {'speedup':>8}")
+    for rows in sizes:
+        df = manifest_frame(rows)
+        old, t_old = timed(legacy_products, df, 'Bamboo')
+        new, t_new = timed(build_products, df, 'Bamboo')
+        assert repr(old) == repr(new), "manifest products differ"
+        print(f"{rows:>8} {'json':>8} {t_old:>9.3f}s {t_new:>9.3f}s {t_old / t_new:>7.1f}x")
+
+        excel_df = excel_frame(rows)
+        old, t_old = timed(legacy_excel_products, excel_df, rows)
+        new, t_new = timed(build_excel_products, excel_df, rows)
+        assert repr(old) == repr(new), "excel products differ"
+        print(f"{rows:>8} {'excel':>8} {t_old:>9.3f}s {t_new:>9.3f}s {t_old / t_new:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or [1000, 10000, 50000])
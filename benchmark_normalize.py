@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Benchmark manifest normalization: the old per-item parse loops against the
+column-wise engine in src/data/normalize.py.
+
+Usage: python benchmark_normalize.py [items ...]   (default: 10000 50000 100000)
+"""
+import sys
+import time
+import random
+
+import pandas as pd
+
+from src.data.normalize import normalize_manifest
+
+
+def legacy_bamboo(json_data):
+    vendor_meta = f"{json_data.get('from_license_number', '')} - {json_data.get('from_license_name', '')}"
+    raw_date = json_data.get("est_arrival_at", "") or json_data.get("transferred_at", "")
+    accepted_date = raw_date.split("T")[0] if "T" in raw_date else raw_date
+    records = []
+    for item in json_data.get("inventory_transfer_items", []):
+        thc_content = ""
+        cbd_content = ""
+        lab_data = item.get("lab_result_data", {})
+        if lab_data and "potency" in lab_data:
+            for potency_item in lab_data["potency"]:
+                if potency_item.get("type") == "total-thc":
+                    thc_content = f"{potency_item.get('value', '')}%"
+                elif potency_item.get("type") == "total-cbd":
+                    cbd_content = f"{potency_item.get('value', '')}%"
+        records.append({
+            "Product Name*": item.get("product_name", ""),
+            "Product Type*": item.get("inventory_type", ""),
+            "Quantity Received*": item.get("qty", ""),
+            "Barcode*": item.get("inventory_id", "") or item.get("external_id", ""),
+            "Accepted Date": accepted_date,
+            "Vendor": vendor_meta,
+            "Strain Name": item.get("strain_name", ""),
+            "THC Content": thc_content,
+            "CBD Content": cbd_content,
+            "Source System": "Bamboo"
+        })
+    return pd.DataFrame(records)
+
+
+def legacy_cultivera(json_data):
+    manifest = json_data.get("data", {}).get("manifest", {})
+    from_license = manifest.get("from_license", {})
+    vendor_name = from_license.get("name", "")
+    vendor_license = from_license.get("license_number", "")
+    vendor_meta = f"{vendor_license} - {vendor_name}" if vendor_license and vendor_name else "Unknown Vendor"
+    created_at = manifest.get("created_at", "")
+    accepted_date = created_at.split("T")[0] if "T" in created_at else created_at
+    records = []
+    for item in manifest.get("items", []):
+        product = item.get("product", {})
+        thc_content = ""
+        cbd_content = ""
+        for result in item.get("test_results", []) or []:
+            if "thc" in result.get("type", "").lower():
+                thc_content = f"{result.get('percentage', '')}%"
+            elif "cbd" in result.get("type", "").lower():
+                cbd_content = f"{result.get('percentage', '')}%"
+        records.append({
+            "Product Name*": product.get("name", ""),
+            "Product Type*": product.get("category", ""),
+            "Quantity Received*": item.get("quantity", ""),
+            "Barcode*": item.get("barcode", "") or item.get("id", ""),
+            "Accepted Date": accepted_date,
+            "Vendor": vendor_meta,
+            "Strain Name": product.get("strain_name", ""),
+            "THC Content": thc_content,
+            "CBD Content": cbd_content,
+            "Source System": "Cultivera"
+        })
+    return pd.DataFrame(records)
+
+
+def legacy_growflow(json_data):
+    vendor_meta = f"{json_data.get('from_license_number', '')} - {json_data.get('from_license_name', 'Unknown Vendor')}"
+    raw_date = json_data.get("est_arrival_at", "") or json_data.get("transferred_at", "")
+    accepted_date = raw_date.split("T")[0] if "T" in raw_date else raw_date
+    records = []
+    for item in json_data.get("inventory_transfer_items", []):
+        potency_data = item.get("lab_result_data", {}).get("potency", [])
+        thc_value = next((p.get('value') for p in potency_data if p.get('type') in ["total-thc", "thc"]), 0)
+        cbd_value = next((p.get('value') for p in potency_data if p.get('type') in ["total-cbd", "cbd"]), 0)
+        records.append({
+            "Product Name*": item.get("product_name", ""),
+            "Product Type*": item.get("inventory_type", ""),
+            "Quantity Received*": item.get("qty", ""),
+            "Barcode*": item.get("product_sku", "") or item.get("inventory_id", ""),
+            "Accepted Date": accepted_date,
+            "Vendor": vendor_meta,
+            "Strain Name": item.get("strain_name", ""),
+            "THC Content": f"{thc_value}%",
+            "CBD Content": f"{cbd_value}%",
+            "Source System": "GrowFlow"
+        })
+    return pd.DataFrame(records)
+
+
+def potency(rng, kinds, value_key):
+    results = [{"type": kind, value_key: round(rng.random() * 30, 2)} for kind in kinds if rng.random() < 0.8]
+    return results if rng.random() < 0.9 else []
+
+
+def bamboo_manifest(items, rng, growflow=False):
+    rows = []
+    for i in range(items):
+        item = {
+            "product_name": f"Product {i} Live Resin Cart",
+            "inventory_type": rng.choice(["Concentrate", "Flower", "Edible"]),
+            "qty": rng.randint(1, 500),
+            "inventory_id": "" if rng.random() < 0.1 else f"ID{i:08d}",
+            "external_id": f"EXT{i}",
+            "product_sku": "" if rng.random() < 0.5 else f"SKU{i}",
+            "lab_result_data": {"potency": potency(rng, ["total-thc", "thca", "total-cbd", "thc"], "value")},
+        }
+        if rng.random() < 0.9:
+            item["strain_name"] = "Blue Dream"
+        rows.append(item)
+    manifest = {"from_license_number": "123", "from_license_name": "Vend Co",
+                "est_arrival_at": "2025-06-22T10:00:00", "inventory_transfer_items": rows}
+    if growflow:
+        manifest["document_schema_version"] = 2
+    return manifest
+
+
+def cultivera_manifest(items, rng):
+    rows = [{
+        "product": {"name": f"Item {i}", "category": "Flower", "strain_name": "OG"},
+        "quantity": rng.randint(1, 50),
+        "barcode": "" if rng.random() < 0.2 else f"BC{i}",
+        "id": i,
+        "test_results": potency(rng, ["THC", "THCA", "CBD"], "percentage"),
+    } for i in range(items)]
+    return {"data": {"manifest": {"created_at": "2025-06-22T10:00:00",
+                                  "from_license": {"name": "Grow Co", "license_number": "456"},
+                                  "items": rows}}}
+
+
+def timed(func, *args, repeat=3):
+    """Result and best wall time over a few runs"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - start)
+    return result, best
+
+
+def main(sizes):
+    rng = random.Random(0)
+    print(f"{'items':>8} {'provider':>10} {'loop':>9} {'columnar':>9} {'speedup':>8}")
+    for items in sizes:
+        cases = [
+            ('Bamboo', legacy_bamboo, bamboo_manifest(items, rng)),
+            ('Cultivera', legacy_cultivera, cultivera_manifest(items, rng)),
+            ('GrowFlow', legacy_growflow, bamboo_manifest(items, rng, growflow=True)),
+        ]
+        for provider, legacy, manifest in cases:
+            old, t_old = timed(legacy, manifest)
+            new, t_new = timed(normalize_manifest, manifest, provider)
+            pd.testing.assert_frame_equal(old, new)
+            print(f"{items:>8} {provider:>10} {t_old:>8.3f}s {t_new:>8.3f}s {t_old / t_new:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main([int(arg) for arg in sys.argv[1:]] or [10000, 50000, 100000])
@@ -4,10 +4,8 @@ import os
 import sys
 import json
 import datetime
-import urllib.request
 import pandas as pd
-from docx import Document
-from docx.shared import Pt
+import requests
 import threading
 import configparser
 import webbrowser
@@ -17,6 +15,10 @@ import sqlite3
 
 # Import our custom document generator
 from src.utils.docgen import DocxGenerator
+from src.utils import http_client
+from src.data.normalize import normalize_manifest
+from src.data.formats import detect_format
+from src.data import csv_columns
 
 # Constants
 CONFIG_FILE = os.path.expanduser("~/inventory_generator_config.ini")
@@ -62,45 +64,6 @@ def save_config(config):
     with open(CONFIG_FILE, 'w') as f:
         config.write(f)
 
-# Helper to adjust font sizes after rendering
-def adjust_table_font_sizes(doc_path):
-    """
-    Post-process a DOCX file to dynamically adjust font size inside table cells based on thresholds.
-    """
-    thresholds = [
-        (30, 12),   # <=30 chars → 12pt
-        (45, 10),   # <=45 chars → 10pt
-        (60, 8),    # <=60 chars → 8pt
-        (float('inf'), 7)  # >60 chars → 7pt
-    ]
-
-    def get_font_size(text_len):
-        for limit, size in thresholds:
-            if text_len <= limit:
-                return size
-        return 7  # Fallback
-
-    doc = Document(doc_path)
-
-    for table in doc.tables:
-        for row in table.rows:
-            for cell in row.cells:
-                for paragraph in cell.paragraphs:
-                    text = paragraph.text.strip()
-                    if not text:
-                        continue
-
-                    # If line is Product Name (first line), force 10pt
-                    if paragraph == cell.paragraphs[0]:
-                        font_size = 10
-                    else:
-                        font_size = get_font_size(len(text))
-
-                    for run in paragraph.runs:
-                        run.font.size = Pt(font_size)
-
-    doc.save(doc_path)
-
 # Open files after saving
 def open_file(path):
     try:
@@ -301,46 +264,7 @@ def parse_bamboo_data(json_data):
         return pd.DataFrame()
     
     try:
-        # Get vendor information
-        from_license_number = json_data.get("from_license_number", "")
-        from_license_name = json_data.get("from_license_name", "")
-        vendor_meta = f"{from_license_number} - {from_license_name}"
-        
-        # Get transfer date
-        raw_date = json_data.get("est_arrival_at", "") or json_data.get("transferred_at", "")
-        accepted_date = raw_date.split("T")[0] if "T" in raw_date else raw_date
-        
-        # Process inventory items
-        items = json_data.get("inventory_transfer_items", [])
-        records = []
-        
-        for item in items:
-            # Extract THC and CBD content from lab_result_data if available
-            thc_content = ""
-            cbd_content = ""
-            
-            lab_data = item.get("lab_result_data", {})
-            if lab_data and "potency" in lab_data:
-                for potency_item in lab_data["potency"]:
-                    if potency_item.get("type") == "total-thc":
-                        thc_content = f"{potency_item.get('value', '')}%"
-                    elif potency_item.get("type") == "total-cbd":
-                        cbd_content = f"{potency_item.get('value', '')}%"
-            
-            records.append({
-                "Product Name*": item.get("product_name", ""),
-                "Product Type*": item.get("inventory_type", ""),
-                "Quantity Received*": item.get("qty", ""),
-                "Barcode*": item.get("inventory_id", "") or item.get("external_id", ""),
-                "Accepted Date": accepted_date,
-                "Vendor": vendor_meta,
-                "Strain Name": item.get("strain_name", ""),
-                "THC Content": thc_content,
-                "CBD Content": cbd_content,
-                "Source System": "Bamboo"
-            })
-        
-        return pd.DataFrame(records)
+        return normalize_manifest(json_data, 'Bamboo')
     
     except Exception as e:
         raise ValueError(f"Failed to parse Bamboo transfer data: {e}")
@@ -355,53 +279,7 @@ def parse_cultivera_data(json_data):
         if not json_data.get("data") or not isinstance(json_data.get("data"), dict):
             raise ValueError("Not a valid Cultivera format")
         
-        data = json_data.get("data", {})
-        manifest = data.get("manifest", {})
-        
-        # Get vendor information
-        from_license = manifest.get("from_license", {})
-        vendor_name = from_license.get("name", "")
-        vendor_license = from_license.get("license_number", "")
-        vendor_meta = f"{vendor_license} - {vendor_name}" if vendor_license and vendor_name else "Unknown Vendor"
-        
-        # Get transfer date
-        created_at = manifest.get("created_at", "")
-        accepted_date = created_at.split("T")[0] if "T" in created_at else created_at
-        
-        # Process inventory items
-        items = manifest.get("items", [])
-        records = []
-        
-        for item in items:
-            # Extract product info
-            product = item.get("product", {})
-            
-            # Extract THC and CBD content
-            thc_content = ""
-            cbd_content = ""
-            
-            test_results = item.get("test_results", [])
-            if test_results:
-                for result in test_results:
-                    if "thc" in result.get("type", "").lower():
-                        thc_content = f"{result.get('percentage', '')}%"
-                    elif "cbd" in result.get("type", "").lower():
-                        cbd_content = f"{result.get('percentage', '')}%"
-            
-            records.append({
-                "Product Name*": product.get("name", ""),
-                "Product Type*": product.get("category", ""),
-                "Quantity Received*": item.get("quantity", ""),
-                "Barcode*": item.get("barcode", "") or item.get("id", ""),
-                "Accepted Date": accepted_date,
-                "Vendor": vendor_meta,
-                "Strain Name": product.get("strain_name", ""),
-                "THC Content": thc_content,
-                "CBD Content": cbd_content,
-                "Source System": "Cultivera"
-            })
-        
-        return pd.DataFrame(records)
+        return normalize_manifest(json_data, 'Cultivera')
     
     except Exception as e:
         raise ValueError(f"Failed to parse Cultivera data: {e}")
@@ -419,17 +297,13 @@ def parse_inventory_json(json_data):
         if isinstance(json_data, str):
             json_data = json.loads(json_data)
         
-        # Try parsing as Bamboo
-        if "inventory_transfer_items" in json_data:
-            return parse_bamboo_data(json_data), "Bamboo"
-        
-        # Try parsing as Cultivera
-        elif "data" in json_data and isinstance(json_data["data"], dict) and "manifest" in json_data["data"]:
-            return parse_cultivera_data(json_data), "Cultivera"
+        # Detect the provider from its signature keys
+        fmt = detect_format(json_data)
+        if fmt is not None:
+            return fmt.parse(json_data), fmt.name
         
         # Unknown format
-        else:
-            return None, "Unknown JSON format. Please use Bamboo or Cultivera format."
+        return None, "Unknown JSON format. Please use Bamboo or Cultivera format."
     
     except json.JSONDecodeError:
         return None, "Invalid JSON data. Please check the format."
@@ -1555,9 +1429,9 @@ class InventorySlipGenerator:
         
         def fetch_data():
             try:
-                req = urllib.request.Request(url, headers=headers)
-                with urllib.request.urlopen(req) as resp:
-                    data = json.loads(resp.read().decode())
+                resp = http_client.get(url, headers=headers)
+                resp.raise_for_status()
+                data = resp.json()
                 
                 # Process data based on format
                 self.root.after(0, lambda: self.process_api_data(data, api_type))
@@ -2026,8 +1900,7 @@ class InventorySlipGenerator:
         
         def fetch_data():
             try:
-                import requests
-                response = requests.get(url, timeout=30)
+                response = http_client.get(url, timeout=30)
                 response.raise_for_status()
                 data = response.json()
 
@@ -2128,7 +2001,14 @@ class InventorySlipGenerator:
         
         def load_data():
             try:
-                df = pd.read_csv(file_path)
+                # Parse only the mapped columns, chunk by chunk, reporting rows read
+                chunks = []
+                rows = 0
+                for chunk in csv_columns.read_csv_chunks(file_path):
+                    chunks.append(chunk)
+                    rows += len(chunk)
+                    self.root.after(0, lambda rows=rows: self.status_var.set(f"Loading data... {rows:,} rows read"))
+                df = pd.concat(chunks, ignore_index=True) if len(chunks) > 1 else chunks[0]
                 
                 # Add to recent files if not already there
                 if file_path not in self.recent_files:
@@ -2465,37 +2345,38 @@ class InventorySlipGenerator:
             
             def fetch_data():
                 try:
-                    req = urllib.request.Request(url, headers=headers)
-                    with urllib.request.urlopen(req) as resp:
-                        data = json.loads(resp.read().decode())
-                        
-                        # Process the data
-                        self.root.after(0, lambda: self.process_json_data(data))
-                        
-                        # Cache the response for offline use
-                        cache_dir = os.path.join(os.path.expanduser("~"), ".inventory_slip_cache")
-                        if not os.path.exists(cache_dir):
-                            os.makedirs(cache_dir)
-                        
-                        cache_file = os.path.join(cache_dir, "bamboo_latest.json")
-                        with open(cache_file, 'w') as f:
-                            json.dump(data, f)
-                        
-                        # Add to recent URLs
-                        if url not in self.recent_urls:
-                            self.recent_urls.insert(0, url)
-                            self.recent_urls = self.recent_urls[:10]
-                            self.config['PATHS']['recent_urls'] = '|'.join(self.recent_urls)
-                            save_config(self.config)
-                            self.update_recent_menu()
+                    resp = http_client.get(url, headers=headers)
+                    resp.raise_for_status()
+                    data = resp.json()
+                    
+                    # Process the data
+                    self.root.after(0, lambda: self.process_json_data(data))
+                    
+                    # Cache the response for offline use
+                    cache_dir = os.path.join(os.path.expanduser("~"), ".inventory_slip_cache")
+                    if not os.path.exists(cache_dir):
+                        os.makedirs(cache_dir)
+                    
+                    cache_file = os.path.join(cache_dir, "bamboo_latest.json")
+                    with open(cache_file, 'w') as f:
+                        json.dump(data, f)
+                    
+                    # Add to recent URLs
+                    if url not in self.recent_urls:
+                        self.recent_urls.insert(0, url)
+                        self.recent_urls = self.recent_urls[:10]
+                        self.config['PATHS']['recent_urls'] = '|'.join(self.recent_urls)
+                        save_config(self.config)
+                        self.update_recent_menu()
                 
-                except urllib.error.HTTPError as e:
-                    if e.code == 403:
+                except requests.exceptions.HTTPError as e:
+                    status, reason = e.response.status_code, e.response.reason
+                    if status == 403:
                         # Handle "forbidden" error - try to use cached data
                         self.root.after(0, lambda: self.handle_bamboo_forbidden())
                     else:
-                        self.root.after(0, lambda: messagebox.showerror("Error", f"API Error: {e.code} - {e.reason}"))
-                        self.root.after(0, lambda: self.status_var.set(f"Failed to fetch data: {e.reason}"))
+                        self.root.after(0, lambda: messagebox.showerror("Error", f"API Error: {status} - {reason}"))
+                        self.root.after(0, lambda: self.status_var.set(f"Failed to fetch data: {reason}"))
                         self.root.after(0, lambda: self.progress_var.set(0))
                 
                 except Exception as e:
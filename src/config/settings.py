@@ -28,7 +28,8 @@ def load_config():
         'items_per_page': '4',
         'auto_open': 'true',
         'theme': 'dark',
-        'font_size': '12'
+        'font_size': '12',
+        'render_workers': '1'
     }
     
     # Load existing config if it exists
@@ -0,0 +1,240 @@
+"""
+Column resolution and selective reading for uploaded inventory CSVs.
+
+Wide state-system exports carry 100+ columns of which only a handful are
+used. The header is resolved once into a rename map and a lookup of the
+first column holding each target, in a single pass over the names. The
+same resolution picks the columns worth reading, so the CSV is parsed with
+`usecols` and explicit text dtypes, in chunks, and unused columns are never
+materialized.
+
+ingest_csv() goes one step further for large uploads: each chunk is
+normalized and handed on as soon as it is parsed, so memory stays bounded
+by the chunk size rather than the file size.
+"""
+import io
+import logging
+from collections import Counter
+from datetime import datetime
+
+import pandas as pd
+
+from .stream_ingest import PrefixedStream
+
+logger = logging.getLogger(__name__)
+
+# Constants
+CSV_CHUNK_ROWS = 50000
+HEADER_READ_BYTES = 65536
+
+# Source header -> standard column
+COLUMN_MAP = {
+    "Product Name*": "Product Name*",
+    "Product Name": "Product Name*",
+    "Quantity Received": "Quantity Received*",
+    "Quantity*": "Quantity Received*",
+    "Quantity": "Quantity Received*",
+    "Lot Number*": "Barcode*",
+    "Barcode": "Barcode*",
+    "Lot Number": "Barcode*",
+    "Accepted Date": "Accepted Date",
+    "Vendor": "Vendor",
+    "Strain Name": "Strain Name",
+    "Product Type*": "Product Type*",
+    "Product Type": "Product Type*",
+    "Inventory Type": "Product Type*"
+}
+
+# Standard columns looked up by substring, as process_csv_data always has
+TARGET_COLUMNS = ("Product Name*", "Barcode*", "Vendor", "Accepted Date", "Product Type*", "Strain Name")
+
+# Other columns used downstream (data view cost, potency on slips)
+EXTRA_COLUMNS = ("Quantity Received*", "Cost", "THC Content", "CBD Content", "Source System")
+
+# Columns a CSV must resolve to be usable
+REQUIRED_COLUMNS = ("Product Name*", "Barcode*")
+
+# Read as text so barcodes and lot numbers keep leading zeros
+TEXT_COLUMNS = frozenset(("Product Name*", "Barcode*", "Vendor", "Accepted Date", "Product Type*", "Strain Name"))
+
+
+class ColumnResolution:
+    """Result of resolving a CSV header"""
+
+    def __init__(self, renames, columns, first, duplicates):
+        self.renames = renames  # original (stripped, de-duplicated) name -> new name
+        self.columns = columns  # column names after renaming, in order
+        self.first = first  # target -> first column whose name contains it
+        self.duplicates = duplicates  # every column whose name is still duplicated
+
+    def has(self, target):
+        return target in self.first
+
+
+def resolve_columns(names):
+    """Resolve a header in one pass: uniqueness suffixes, renames and target lookup.
+
+    Same rules as before: duplicated names get a positional suffix, the part
+    before the first underscore is looked up in COLUMN_MAP, a target mapped
+    more than once gets _1, _2, ... and targets are found by substring.
+    """
+    names = [str(name).strip() for name in names]
+    counts = Counter(names)
+    unique = [f"{name}_{i}" if counts[name] > 1 else name for i, name in enumerate(names)]
+
+    renames = {}
+    columns = []
+    used = Counter()
+    first = {}
+    pending = list(TARGET_COLUMNS)
+    for name in unique:
+        target = COLUMN_MAP.get(name.split('_')[0])
+        if target is None:
+            new_name = name
+        else:
+            new_name = target if used[target] == 0 else f"{target}_{used[target]}"
+            used[target] += 1
+        renames[name] = new_name
+        columns.append(new_name)
+        for wanted in pending:
+            if wanted in new_name:
+                first[wanted] = new_name
+        pending = [wanted for wanted in pending if wanted not in first]
+
+    column_counts = Counter(columns)
+    duplicates = [name for name in columns if column_counts[name] > 1]
+    return ColumnResolution(renames, columns, first, duplicates)
+
+
+def check_columns(resolution):
+    """Error message for a header that cannot be processed, or None"""
+    missing_cols = [col for col in REQUIRED_COLUMNS if not resolution.has(col)]
+    if missing_cols:
+        return f"CSV is missing required columns: {', '.join(missing_cols)}"
+    if resolution.duplicates:
+        logger.error(f"Duplicate columns found: {resolution.duplicates}")
+        return f"Duplicate columns found: {', '.join(resolution.duplicates)}"
+    return None
+
+
+def apply_defaults(df, resolution, today=None):
+    """Fill vendor, date, type and strain defaults on a renamed frame or chunk"""
+    if not resolution.has("Vendor"):
+        df["Vendor"] = "Unknown Vendor"
+    else:
+        vendor_col = resolution.first["Vendor"]
+        df[vendor_col] = df[vendor_col].fillna("Unknown Vendor")
+
+    if not resolution.has("Accepted Date"):
+        df["Accepted Date"] = today or datetime.today().strftime("%Y-%m-%d")
+
+    if not resolution.has("Product Type*"):
+        df["Product Type*"] = "Unknown"
+
+    if not resolution.has("Strain Name"):
+        df["Strain Name"] = ""
+    return df
+
+
+def wanted_columns(names):
+    """(usecols, dtype) for reading only the columns process_csv_data keeps"""
+    resolution = resolve_columns(names)
+    keep = TARGET_COLUMNS + EXTRA_COLUMNS
+    usecols = []
+    dtype = {}
+    for raw, new_name in zip(names, resolution.columns):
+        if any(wanted in new_name for wanted in keep):
+            usecols.append(raw)
+            if any(text in new_name for text in TEXT_COLUMNS):
+                dtype[raw] = str
+    return usecols, dtype
+
+
+def _read_header(source):
+    """Header names of a CSV path or binary stream, plus a source that still yields everything"""
+    if isinstance(source, str) or hasattr(source, 'seek'):
+        names = pd.read_csv(source, nrows=0).columns.tolist()
+        if hasattr(source, 'seek'):
+            source.seek(0)
+        return names, source
+
+    head = b""
+    while b"\n" not in head:
+        block = source.read(HEADER_READ_BYTES)
+        if not block:
+            break
+        head += block
+    names = pd.read_csv(io.BytesIO(head.split(b"\n", 1)[0]), nrows=0).columns.tolist()
+    return names, PrefixedStream(head, source)
+
+
+def _open_chunks(source, chunksize):
+    """(names of the columns that will be read, chunk reader) for a CSV source"""
+    names, source = _read_header(source)
+    usecols, dtype = wanted_columns(names)
+    if not usecols:
+        usecols = None
+    else:
+        logger.info(f"Reading {len(usecols)} of {len(names)} CSV columns")
+    reader = pd.read_csv(source, usecols=usecols, dtype=dtype, chunksize=chunksize)
+    return usecols or names, reader
+
+
+def read_csv_chunks(source, chunksize=CSV_CHUNK_ROWS):
+    """Yield DataFrame chunks of a CSV with only the wanted columns parsed.
+
+    Falls back to every column when none of them resolve, so
+    process_csv_data can still report which required columns are missing.
+    """
+    _, reader = _open_chunks(source, chunksize)
+    with reader:
+        yield from reader
+
+
+def read_csv(source, chunksize=CSV_CHUNK_ROWS):
+    """Whole DataFrame of the wanted CSV columns, parsed chunk by chunk"""
+    chunks = list(read_csv_chunks(source, chunksize))
+    if not chunks:
+        return pd.DataFrame()
+    return pd.concat(chunks, ignore_index=True) if len(chunks) > 1 else chunks[0]
+
+
+class CountingStream:
+    """Read-only wrapper counting the bytes consumed from a binary stream"""
+
+    def __init__(self, stream):
+        self._stream = stream
+        self.bytes_read = 0
+
+    def read(self, size=-1):
+        data = self._stream.read(size)
+        self.bytes_read += len(data)
+        return data
+
+
+def ingest_csv(source, append, progress=None, chunksize=CSV_CHUNK_ROWS):
+    """Parse, normalize and hand on a CSV one chunk at a time.
+
+    The header is resolved and checked before any rows are parsed. Each
+    chunk is renamed, given the usual defaults and passed to append(chunk);
+    progress(rows), if given, is called after every chunk. Unlike
+    process_csv_data the rows are not sorted, since that needs them all.
+    Returns (rows, error message or None).
+    """
+    names, reader = _open_chunks(source, chunksize)
+    with reader:
+        resolution = resolve_columns(names)
+        error = check_columns(resolution)
+        if error:
+            return 0, error
+
+        today = datetime.today().strftime("%Y-%m-%d")
+        rows = 0
+        for chunk in reader:
+            chunk.columns = resolution.columns
+            append(apply_defaults(chunk, resolution, today))
+            rows += len(chunk)
+            if progress:
+                progress(rows)
+    logger.info(f"Ingested {rows} CSV rows in chunks of {chunksize}")
+    return rows, None
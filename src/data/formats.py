@@ -0,0 +1,121 @@
+"""
+Registry of manifest formats and their detection signatures.
+
+A format declares a signature: a path of object keys that only its
+documents contain (e.g. ('data', 'manifest') for Cultivera). Formats are
+checked in registration order, so an earlier format wins when a document
+carries several signatures. Signatures are indexed by (parent prefix, key),
+which lets a streamed document be detected with one dict lookup per key
+event as the keys arrive, and whole documents with a walk of a few keys.
+
+New providers are added with register_format(); giving them a normalize
+spec makes them parseable from both whole documents and streams.
+"""
+import logging
+
+from .normalize import PROVIDERS, normalize_manifest
+
+logger = logging.getLogger(__name__)
+
+
+class ManifestFormat:
+    """A detectable manifest format and how to turn a document into rows"""
+
+    def __init__(self, name, signature, parse=None):
+        self.name = name
+        self.signature = tuple(signature)
+        self._parse = parse
+
+    @property
+    def items_prefix(self):
+        """ijson prefix of the format's items, or None if it has no normalize spec"""
+        spec = PROVIDERS.get(self.name)
+        return f"{spec['items']}.item" if spec else None
+
+    def matches(self, json_data):
+        """True if the document contains this format's signature path"""
+        node = json_data
+        for key in self.signature:
+            if not isinstance(node, dict) or key not in node:
+                return False
+            node = node[key]
+        return True
+
+    def parse(self, json_data):
+        """DataFrame of normalized rows for a whole document"""
+        if self._parse is not None:
+            return self._parse(json_data)
+        return normalize_manifest(json_data, self.name)
+
+    def __repr__(self):
+        return f"ManifestFormat({self.name!r}, {self.signature!r})"
+
+
+_formats = []
+_by_name = {}
+_by_key = {}  # (parent prefix, key) -> formats with that signature, in priority order
+
+
+def register_format(name, signature, parse=None, spec=None):
+    """Add a format after the existing ones.
+
+    `spec` is a normalize.PROVIDERS entry; without one, `parse(json_data)`
+    must return the normalized DataFrame.
+    """
+    if name in _by_name:
+        raise ValueError(f"Manifest format already registered: {name}")
+    if spec is not None:
+        PROVIDERS[name] = spec
+    if parse is None and name not in PROVIDERS:
+        raise ValueError(f"Manifest format {name} needs a parse function or a normalize spec")
+
+    fmt = ManifestFormat(name, signature, parse)
+    _formats.append(fmt)
+    _by_name[name] = fmt
+    _by_key.setdefault(('.'.join(fmt.signature[:-1]), fmt.signature[-1]), []).append(fmt)
+    return fmt
+
+
+def get_format(name):
+    """Registered format by name, or None"""
+    return _by_name.get(name)
+
+
+def formats():
+    """Registered formats in detection order"""
+    return list(_formats)
+
+
+def detect_format(json_data):
+    """The first registered format whose signature the document contains, or None"""
+    if not isinstance(json_data, dict):
+        return None
+    for fmt in _formats:
+        if fmt.matches(json_data):
+            return fmt
+    return None
+
+
+class FormatDetector:
+    """Detects the format of a streamed document from its ijson key events"""
+
+    def __init__(self):
+        self._matched = set()
+
+    def feed(self, prefix, event, value):
+        if event == 'map_key':
+            found = _by_key.get((prefix, value))
+            if found:
+                self._matched.update(fmt.name for fmt in found)
+
+    def best(self):
+        """Highest-priority format seen so far, or None"""
+        for fmt in _formats:
+            if fmt.name in self._matched:
+                return fmt
+        return None
+
+
+register_format('Bamboo', ('inventory_transfer_items',))
+register_format('Cultivera', ('data', 'manifest'))
+register_format('GrowFlow', ('document_schema_version',))
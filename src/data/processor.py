@@ -2,51 +2,16 @@ import json
 import pandas as pd
 import datetime
 
+from .normalize import normalize_manifest
+from .formats import detect_format
+from .csv_columns import COLUMN_MAP
+
 def parse_bamboo_data(json_data):
     if not json_data:
         return pd.DataFrame()
     
     try:
-        # Get vendor information
-        from_license_number = json_data.get("from_license_number", "")
-        from_license_name = json_data.get("from_license_name", "")
-        vendor_meta = f"{from_license_number} - {from_license_name}"
-        
-        # Get transfer date
-        raw_date = json_data.get("est_arrival_at", "") or json_data.get("transferred_at", "")
-        accepted_date = raw_date.split("T")[0] if "T" in raw_date else raw_date
-        
-        # Process inventory items
-        items = json_data.get("inventory_transfer_items", [])
-        records = []
-        
-        for item in items:
-            # Extract THC and CBD content from lab_result_data if available
-            thc_content = ""
-            cbd_content = ""
-            
-            lab_data = item.get("lab_result_data", {})
-            if lab_data and "potency" in lab_data:
-                for potency_item in lab_data["potency"]:
-                    if potency_item.get("type") == "total-thc":
-                        thc_content = f"{potency_item.get('value', '')}%"
-                    elif potency_item.get("type") == "total-cbd":
-                        cbd_content = f"{potency_item.get('value', '')}%"
-            
-            records.append({
-                "Product Name*": item.get("product_name", ""),
-                "Product Type*": item.get("inventory_type", ""),
-                "Quantity Received*": item.get("qty", ""),
-                "Barcode*": item.get("inventory_id", "") or item.get("external_id", ""),
-                "Accepted Date": accepted_date,
-                "Vendor": vendor_meta,
-                "Strain Name": item.get("strain_name", ""),
-                "THC Content": thc_content,
-                "CBD Content": cbd_content,
-                "Source System": "Bamboo"
-            })
-        
-        return pd.DataFrame(records)
+        return normalize_manifest(json_data, 'Bamboo')
     
     except Exception as e:
         raise ValueError(f"Failed to parse Bamboo transfer data: {e}")
@@ -60,53 +25,7 @@ def parse_cultivera_data(json_data):
         if not json_data.get("data") or not isinstance(json_data.get("data"), dict):
             raise ValueError("Not a valid Cultivera format")
         
-        data = json_data.get("data", {})
-        manifest = data.get("manifest", {})
-        
-        # Get vendor information
-        from_license = manifest.get("from_license", {})
-        vendor_name = from_license.get("name", "")
-        vendor_license = from_license.get("license_number", "")
-        vendor_meta = f"{vendor_license} - {vendor_name}" if vendor_license and vendor_name else "Unknown Vendor"
-        
-        # Get transfer date
-        created_at = manifest.get("created_at", "")
-        accepted_date = created_at.split("T")[0] if "T" in created_at else created_at
-        
-        # Process inventory items
-        items = manifest.get("items", [])
-        records = []
-        
-        for item in items:
-            # Extract product info
-            product = item.get("product", {})
-            
-            # Extract THC and CBD content
-            thc_content = ""
-            cbd_content = ""
-            
-            test_results = item.get("test_results", [])
-            if test_results:
-                for result in test_results:
-                    if "thc" in result.get("type", "").lower():
-                        thc_content = f"{result.get('percentage', '')}%"
-                    elif "cbd" in result.get("type", "").lower():
-                        cbd_content = f"{result.get('percentage', '')}%"
-            
-            records.append({
-                "Product Name*": product.get("name", ""),
-                "Product Type*": product.get("category", ""),
-                "Quantity Received*": item.get("quantity", ""),
-                "Barcode*": item.get("barcode", "") or item.get("id", ""),
-                "Accepted Date": accepted_date,
-                "Vendor": vendor_meta,
-                "Strain Name": product.get("strain_name", ""),
-                "THC Content": thc_content,
-                "CBD Content": cbd_content,
-                "Source System": "Cultivera"
-            })
-        
-        return pd.DataFrame(records)
+        return normalize_manifest(json_data, 'Cultivera')
     
     except Exception as e:
         raise ValueError(f"Failed to parse Cultivera data: {e}")
@@ -123,17 +42,13 @@ def parse_inventory_json(json_data):
         if isinstance(json_data, str):
             json_data = json.loads(json_data)
         
-        # Try parsing as Bamboo
-        if "inventory_transfer_items" in json_data:
-            return parse_bamboo_data(json_data), "Bamboo"
-        
-        # Try parsing as Cultivera
-        elif "data" in json_data and isinstance(json_data["data"], dict) and "manifest" in json_data["data"]:
-            return parse_cultivera_data(json_data), "Cultivera"
+        # Detect the provider from its signature keys
+        fmt = detect_format(json_data)
+        if fmt is not None:
+            return fmt.parse(json_data), fmt.name
         
         # Unknown format
-        else:
-            return None, "Unknown JSON format. Please use Bamboo or Cultivera format."
+        return None, "Unknown JSON format. Please use Bamboo or Cultivera format."
     
     except json.JSONDecodeError:
         return None, "Invalid JSON data. Please check the format."
@@ -146,24 +61,7 @@ def process_csv_data(df):
     """
     try:
         # Map column names to expected format
-        col_map = {
-            "Product Name*": "Product Name*",
-            "Product Name": "Product Name*",
-            "Quantity Received": "Quantity Received*",
-            "Quantity*": "Quantity Received*",
-            "Quantity": "Quantity Received*",
-            "Lot Number*": "Barcode*",
-            "Barcode": "Barcode*",
-            "Lot Number": "Barcode*",
-            "Accepted Date": "Accepted Date",
-            "Vendor": "Vendor",
-            "Strain Name": "Strain Name",
-            "Product Type*": "Product Type*",
-            "Product Type": "Product Type*",
-            "Inventory Type": "Product Type*"
-        }
-        
-        df = df.rename(columns=lambda x: col_map.get(x.strip(), x.strip()))
+        df = df.rename(columns=lambda x: COLUMN_MAP.get(x.strip(), x.strip()))
         
         # Ensure required columns exist
         required_cols = ["Product Name*", "Barcode*"]
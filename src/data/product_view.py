@@ -0,0 +1,70 @@
+"""
+Product view model for the data view page.
+
+Builds the list of product dicts rendered by data_view.html column by column
+instead of row by row, so large manifests do not pay for iterrows(). Each
+field is converted as a whole column and the dicts are zipped together at the
+end (DataFrame.to_dict('records') re-boxes every value and is slower still).
+"""
+from itertools import repeat
+
+
+def _text(df, column, default):
+    """str() of every value in a column, or the default when the column is missing"""
+    if column not in df.columns:
+        return [default] * len(df)
+    return list(map(str, df[column].tolist()))
+
+
+def _number(df, column):
+    """float() of every value in a column, or 0 when the column is missing"""
+    if column not in df.columns:
+        return [0] * len(df)
+    return [float(value) for value in df[column].tolist()]
+
+
+def _records(columns, rows):
+    """Zip {field: column} into one dict per row; str values are repeated as constants"""
+    keys = list(columns)
+    values = [repeat(col, rows) if isinstance(col, str) else col for col in columns.values()]
+    return [dict(zip(keys, row)) for row in zip(*values)]
+
+
+def build_products(df, source):
+    """Product dicts for the loaded manifest; ids are the DataFrame index labels"""
+    barcodes = _text(df, 'Barcode*', '')
+    return _records({
+        'id': df.index.tolist(),
+        'name': _text(df, 'Product Name*', ''),
+        'strain': _text(df, 'Strain Name', ''),
+        'sku': barcodes,
+        'quantity': _text(df, 'Quantity Received*', ''),
+        'source': source or 'Unknown',
+        'vendor': _text(df, 'Vendor', 'Unknown'),
+        'manifest_id': barcodes if 'Barcode*' in df.columns else ['N/A'] * len(df),
+        'accepted_date': _text(df, 'Accepted Date', 'N/A'),
+        'type': _text(df, 'Product Type*', 'Unknown'),
+        'cost': _number(df, 'Cost'),
+    }, len(df))
+
+
+def build_excel_products(excel_df, id_offset):
+    """Product dicts for an uploaded Excel sheet; ids start after the manifest's"""
+    skus = excel_df['sku'].tolist() if 'sku' in excel_df.columns else [''] * len(excel_df)
+    barcodes = excel_df['barcode'].tolist() if 'barcode' in excel_df.columns else [''] * len(excel_df)
+    return _records({
+        'id': (id_offset + excel_df.index).tolist(),
+        'name': _text(excel_df, 'product_name', ''),
+        'strain': _text(excel_df, 'strain_name', ''),
+        'sku': [str(sku or barcode) for sku, barcode in zip(skus, barcodes)],
+        'quantity': _text(excel_df, 'quantity', '0'),
+        'source': 'Excel Upload',
+        'vendor': _text(excel_df, 'vendor', 'Unknown'),
+        'manifest_id': _text(excel_df, 'sku', 'N/A'),
+        'accepted_date': _text(excel_df, 'accepted_date', 'N/A'),
+        'type': _text(excel_df, 'product_type', 'Unknown'),
+        'cost': _number(excel_df, 'price'),
+        'brand': _text(excel_df, 'brand', ''),
+        'weight': _text(excel_df, 'weight', ''),
+        'weight_unit': _text(excel_df, 'weight_unit', ''),
+    }, len(excel_df))
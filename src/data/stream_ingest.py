@@ -0,0 +1,165 @@
+"""
+Streaming ingestion of manifest payloads.
+
+The response body is parsed incrementally with ijson straight from the
+socket: the format is sniffed from the first bytes, inventory items are
+normalized as they arrive and collected in compact DataFrame batches. Only
+the normalized rows and the manifest's top-level fields are kept, never the
+raw body, so memory stays proportional to the output rather than the export.
+
+Items are normalized in batches by the same engine as the whole-document
+parsers (src/data/normalize.py), so both paths produce identical rows.
+"""
+import logging
+
+import ijson
+import pandas as pd
+
+from .formats import FormatDetector, formats
+from .normalize import header_paths, manifest_header, normalize_items
+
+logger = logging.getLogger(__name__)
+
+# Constants
+BATCH_SIZE = 1000  # Normalized rows per DataFrame batch
+SNIFF_BYTES = 65536  # Bytes read up front to detect the payload type
+
+SCALAR_EVENTS = ('string', 'number', 'boolean', 'null')
+
+
+class PrefixedStream:
+    """File-like wrapper that replays bytes already read from a stream"""
+
+    def __init__(self, head, stream):
+        self._head = head
+        self._stream = stream
+
+    def read(self, size=-1):
+        if self._head:
+            if size is None or size < 0:
+                data, self._head = self._head + self._stream.read(), b""
+                return data
+            data, self._head = self._head[:size], self._head[size:]
+            return data
+        return self._stream.read() if size is None or size < 0 else self._stream.read(size)
+
+
+def sniff(stream):
+    """Peek at the first non-whitespace byte.
+
+    Returns (kind, stream) where kind is 'object', 'array', 'html', 'text'
+    or 'empty' and stream still yields the whole body.
+    """
+    head = stream.read(SNIFF_BYTES) or b""
+    if head.startswith(b"\xef\xbb\xbf"):
+        head = head[3:]
+    first = head.lstrip()[:1]
+    kinds = {b"{": 'object', b"[": 'array', b"<": 'html', b"": 'empty'}
+    return kinds.get(first, 'text'), PrefixedStream(head, stream)
+
+
+class _Batches:
+    """Collects raw items and normalizes them a batch at a time"""
+
+    def __init__(self, provider, batch_size=BATCH_SIZE):
+        self.provider = provider
+        self.batch_size = batch_size
+        self.frames = []
+        self.rows = []
+        self.count = 0
+
+    def add(self, item):
+        self.rows.append(item)
+        self.count += 1
+        if len(self.rows) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if self.rows:
+            # Vendor and date may only appear after the items; filled in by frame()
+            self.frames.append(normalize_items(self.rows, self.provider))
+            self.rows = []
+
+    def frame(self, **constants):
+        """Concatenate the batches and fill per-manifest constant columns"""
+        self.flush()
+        if not self.frames:
+            return pd.DataFrame()
+        df = pd.concat(self.frames, ignore_index=True) if len(self.frames) > 1 else self.frames[0]
+        self.frames = []
+        for column, value in constants.items():
+            df[column] = value
+        return df
+
+
+def _build_value(events, event, value):
+    """Build the object or array that starts with this event from the remaining events"""
+    builder = ijson.ObjectBuilder()
+    builder.event(event, value)
+    depth = 1
+    for _, event, value in events:
+        builder.event(event, value)
+        if event in ('start_map', 'start_array'):
+            depth += 1
+        elif event in ('end_map', 'end_array'):
+            depth -= 1
+            if depth == 0:
+                break
+    return builder.value
+
+
+def stream_manifest(stream, batch_size=BATCH_SIZE):
+    """Parse a top-level JSON object manifest from a byte stream.
+
+    Returns (DataFrame, format_type, header) with the same format priority
+    and rows as parse_inventory_json. header holds the manifest's top-level
+    scalar fields.
+    """
+    # Items are collected per items prefix; the first format registered for a
+    # prefix normalizes them (its signature is that prefix's key, or nearby)
+    batches = {}
+    for fmt in formats():
+        prefix = fmt.items_prefix
+        if prefix and prefix not in batches:
+            batches[prefix] = _Batches(fmt.name, batch_size)
+    wanted_fields = header_paths()
+    detector = FormatDetector()
+    header = {}
+    header_fields = {}
+
+    events = ijson.parse(stream, use_float=True)
+    for prefix, event, value in events:
+        items = batches.get(prefix)
+        if items is not None:
+            if event in ('start_map', 'start_array'):
+                value = _build_value(events, event, value)
+            elif event not in SCALAR_EVENTS:
+                continue
+            try:
+                items.add(value)
+            except Exception as e:
+                raise ValueError(f"Failed to parse {items.provider} data: {e}")
+        elif event == 'map_key':
+            detector.feed(prefix, event, value)
+        elif event in SCALAR_EVENTS:
+            if prefix and '.' not in prefix:
+                header[prefix] = value
+            if prefix in wanted_fields:
+                header_fields[prefix] = value
+
+    fmt = detector.best()
+    if fmt is None:
+        logger.info("Unknown JSON format in streamed manifest.")
+        return None, "Unknown JSON format", header
+    items = batches.get(fmt.items_prefix)
+    if items is None or items.provider != fmt.name:
+        # e.g. GrowFlow documents without inventory_transfer_items carry no rows
+        return pd.DataFrame(), fmt.name, header
+
+    vendor_meta, accepted_date = manifest_header(fmt.name, header_fields.get)
+    try:
+        df = items.frame(**{"Accepted Date": accepted_date, "Vendor": vendor_meta})
+    except Exception as e:
+        raise ValueError(f"Failed to parse {fmt.name} data: {e}")
+    logger.info(f"Streamed {fmt.name} format, records: {len(df)}")
+    return df, fmt.name, header
@@ -4,7 +4,6 @@ import os
 import sys
 import json
 import datetime
-import urllib.request
 import pandas as pd
 from io import BytesIO
 from docxtpl import DocxTemplate
@@ -20,7 +19,9 @@ from ..base.base_ui import BaseUI
 from ..config.settings import load_config, save_config, resource_path, APP_VERSION
 from ..themes.theme_manager import ThemeColors
 from ..data.processor import parse_inventory_json, process_csv_data
+from ..data import csv_columns
 from ..utils.helpers import run_full_process_inventory_slips, open_file
+from ..utils import http_client
 
 class InventorySlipGenerator(BaseUI):
     def __init__(self, root):
@@ -544,8 +545,8 @@ class InventorySlipGenerator(BaseUI):
     
     def load_csv_from_path(self, file_path):
         try:
-            # Read CSV file
-            df = pd.read_csv(file_path)
+            # Read only the mapped columns, chunk by chunk
+            df = csv_columns.read_csv(file_path)
             
             # Process CSV data
             df = process_csv_data(df)
@@ -585,8 +586,9 @@ class InventorySlipGenerator(BaseUI):
             self.progress_var.set(0)
             
             # Fetch data from URL
-            response = urllib.request.urlopen(url)
-            json_data = json.loads(response.read().decode())
+            response = http_client.get(url)
+            response.raise_for_status()
+            json_data = response.json()
             
             # Parse JSON data
             df, source = parse_inventory_json(json_data)
@@ -1167,8 +1169,9 @@ class InventorySlipGenerator(BaseUI):
                 url += f"?start_date={start_date}&end_date={end_date}"
             
             # Fetch data
-            response = urllib.request.urlopen(url)
-            json_data = json.loads(response.read().decode())
+            response = http_client.get(url)
+            response.raise_for_status()
+            json_data = response.json()
             
             # Parse JSON data
             df, source = parse_inventory_json(json_data)
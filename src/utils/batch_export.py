@@ -0,0 +1,145 @@
+"""
+Batch export: one slip document per vendor and accepted date, in one ZIP.
+
+The selection is partitioned by Vendor and Accepted Date. Each partition is
+generated on a bounded thread pool through the normal single-document
+generator, so the output cache and render workers apply to it as usual, and
+the documents are written into the ZIP in partition order as they finish.
+Every partition is timed and reported individually: one failing partition
+does not fail the batch, but it is listed in MISSING.txt inside the ZIP.
+"""
+
+import re
+import time
+import logging
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Constants
+DEFAULT_CONCURRENCY = 4
+MAX_CONCURRENCY = 8
+MAX_PARTITIONS = 200  # Refuse batches larger than this
+PARTITION_COLUMNS = ('Vendor', 'Accepted Date')
+MISSING_NAME = 'MISSING.txt'  # Lists the partitions that failed, when some did
+
+
+def _vendor_label(vendor: Any) -> str:
+    """Vendor name as the slip file names use it: license prefix dropped, alphanumerics only"""
+    name = "" if pd.isna(vendor) else str(vendor)
+    if " - " in name:
+        name = name.split(" - ")[1]
+    return "".join(c for c in name if c.isalnum() or c.isspace()).strip() or "Unknown"
+
+
+def _date_label(accepted: Any) -> str:
+    """Accepted date as YYYYMMDD, or NoDate"""
+    if pd.isna(accepted):
+        return "NoDate"
+    return re.sub(r"\D", "", str(accepted)[:10]) or "NoDate"
+
+
+def partition(selected_df: pd.DataFrame) -> List[Tuple[str, str, pd.DataFrame]]:
+    """Split the selection into (vendor label, date label, rows) groups, sorted by label"""
+    df = selected_df.reset_index(drop=True)
+    vendors = df['Vendor'].map(_vendor_label) if 'Vendor' in df.columns else pd.Series("Unknown", index=df.index)
+    dates = df['Accepted Date'].map(_date_label) if 'Accepted Date' in df.columns else pd.Series("NoDate", index=df.index)
+    groups = df.groupby([vendors, dates], sort=True)
+    return [(vendor, date, rows) for (vendor, date), rows in groups]
+
+
+def _timed_generate(generate: Callable[[pd.DataFrame], Tuple[bool, Any]], rows: pd.DataFrame):
+    start = time.perf_counter()
+    success, result = generate(rows)
+    return success, result, time.perf_counter() - start
+
+
+def _add_document(package: zipfile.ZipFile, name: str, result: Any) -> None:
+    """Copy one generated document (a saved path or a SpooledOutput) into the ZIP"""
+    if isinstance(result, str):
+        package.write(result, name)
+        return
+    try:
+        with package.open(name, 'w') as out:
+            for chunk in result.iter_chunks():
+                out.write(chunk)
+    finally:
+        result.close()
+
+
+def missing_partitions(results: List[Dict[str, Any]]) -> List[str]:
+    """One line per failed partition: vendor, date, item count and error"""
+    return [f"{r['vendor']} {r['accepted_date']} ({r['items']} items): {r['error']}"
+            for r in results if not r['ok']]
+
+
+def export_batch(selected_df: pd.DataFrame, generate: Callable[[pd.DataFrame], Tuple[bool, Any]],
+                 out: Any, concurrency: int = DEFAULT_CONCURRENCY,
+                 status_callback: Optional[Callable[[str], None]] = None,
+                 progress_callback: Optional[Callable[[int], None]] = None) -> List[Dict[str, Any]]:
+    """Generate every partition's slips and write them into a ZIP at out (a path or file object).
+
+    generate(rows) returns (success, path or SpooledOutput) like
+    run_full_process_inventory_slips. Returns one result dict per partition
+    with its timing and any error (see missing_partitions); raises ValueError
+    if none succeeded.
+    """
+    parts = partition(selected_df)
+    if not parts:
+        raise ValueError("No products selected.")
+    if len(parts) > MAX_PARTITIONS:
+        raise ValueError(f"Too many vendor/date groups in one batch ({len(parts)}, max {MAX_PARTITIONS})")
+    concurrency = max(1, min(int(concurrency), MAX_CONCURRENCY, len(parts)))
+
+    results: List[Dict[str, Any]] = [
+        {'vendor': vendor, 'accepted_date': date, 'items': len(rows), 'file': None,
+         'ok': False, 'seconds': None, 'error': None}
+        for vendor, date, rows in parts
+    ]
+    if status_callback:
+        status_callback(f"Generating {len(parts)} documents ({concurrency} at a time)...")
+
+    names = set()
+    # Documents are already deflated packages; storing them avoids compressing twice
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='slip-batch') as pool, \
+            zipfile.ZipFile(out, 'w', zipfile.ZIP_STORED) as package:
+        futures = [pool.submit(_timed_generate, generate, rows) for _, _, rows in parts]
+        # Written in partition order so the archive is the same however the threads finish
+        for done, (future, result) in enumerate(zip(futures, results), 1):
+            label = f"{result['vendor']} {result['accepted_date']}"
+            try:
+                success, output, seconds = future.result()
+                result['seconds'] = round(seconds, 3)
+                if not success:
+                    raise ValueError(output)
+                name = f"{result['accepted_date']}_{result['vendor']}_Slips.docx"
+                suffix = 2
+                while name in names:
+                    name = f"{result['accepted_date']}_{result['vendor']}_Slips_{suffix}.docx"
+                    suffix += 1
+                names.add(name)
+                _add_document(package, name, output)
+                result['file'] = name
+                result['ok'] = True
+                message = f"{label}: {result['items']} items in {result['seconds']:.2f}s"
+            except Exception as e:
+                result['error'] = str(e)
+                message = f"{label}: failed ({e})"
+                logger.warning(f"Batch partition {label} failed: {e}")
+            logger.info(f"Batch partition {message}")
+            if status_callback:
+                status_callback(message)
+            if progress_callback:
+                progress_callback(int(done / len(parts) * 95))
+
+        missing = missing_partitions(results)
+        if missing and len(missing) < len(results):
+            package.writestr(MISSING_NAME, "Documents that could not be generated:\n" + "\n".join(missing) + "\n")
+
+    if not any(result['ok'] for result in results):
+        raise ValueError(f"No documents generated: {results[0]['error']}")
+    return results
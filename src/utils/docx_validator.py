@@ -20,28 +20,9 @@ class DocxValidator:
             # Try to open the document
             doc = Document(file_path)
             
-            # Basic structure checks
-            if not doc.sections:
-                logger.error("Document has no sections")
+            if not DocxValidator.check_structure(doc):
                 return False, None
                 
-            # Check for basic content
-            if not doc.paragraphs and not doc.tables:
-                logger.error("Document has no content")
-                return False, None
-                
-            # Validate tables
-            for table in doc.tables:
-                if not table._tbl:
-                    logger.error("Found invalid table structure")
-                    return False, None
-                    
-            # Check sections
-            for section in doc.sections:
-                if not section._sectPr:
-                    logger.error("Found invalid section structure")
-                    return False, None
-                    
             # If everything looks good
             return True, file_path
             
@@ -52,6 +33,36 @@ class DocxValidator:
             logger.error(f"Document validation error: {str(e)}")
             return False, None
             
+    @staticmethod
+    def check_structure(doc):
+        """
+        Runs the structural checks on an already loaded Document, without
+        touching the disk. Returns True when the document looks usable.
+        """
+        # Basic structure checks
+        if not doc.sections:
+            logger.error("Document has no sections")
+            return False
+            
+        # Check for basic content
+        if not doc.paragraphs and not doc.tables:
+            logger.error("Document has no content")
+            return False
+            
+        # Validate tables
+        for table in doc.tables:
+            if table._tbl is None or not len(table._tbl.tr_lst):
+                logger.error("Found invalid table structure")
+                return False
+                
+        # Check sections
+        for section in doc.sections:
+            if section._sectPr is None:
+                logger.error("Found invalid section structure")
+                return False
+                
+        return True
+            
     @staticmethod
     def repair_document(file_path):
         """
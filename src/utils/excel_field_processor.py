@@ -0,0 +1,222 @@
+"""
+Excel product sheets with labelMaker-style field mapping.
+
+Headers are matched loosely (case, spaces and punctuation ignored, so
+"Product Name*", "ProductName" and "product_name" are the same field). An
+.xlsx workbook is read with openpyxl in read-only mode, which streams the
+sheet XML row by row: only the mapped columns are kept, and rows of other
+vendors are dropped as they are read when a vendor filter is given, so the
+full sheet is never materialized. Values are then cleaned one column at a
+time into the inventory format used by the data view.
+"""
+
+import re
+import logging
+from datetime import date, datetime
+from operator import itemgetter
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Field -> accepted headers, normalized (lowercase letters and digits only);
+# the first column matching any of them is used
+FIELD_ALIASES = {
+    'product_name': ('productname', 'product', 'name', 'itemname'),
+    'strain_name': ('productstrain', 'strainname', 'strain'),
+    'product_type': ('producttype', 'type', 'category', 'inventorytype'),
+    'vendor': ('vendor', 'vendorsupplier', 'vendorname', 'supplier'),
+    'brand': ('productbrand', 'brand'),
+    'price': ('price', 'unitprice', 'cost'),
+    'weight': ('weight', 'productweight'),
+    'weight_unit': ('units', 'unit', 'weightunit', 'uom'),
+    'quantity': ('quantity', 'qty', 'quantityreceived'),
+    'barcode': ('barcode', 'lotnumber', 'lot'),
+    'sku': ('sku', 'productsku', 'inventoryid'),
+    'accepted_date': ('accepteddate', 'receiveddate', 'date'),
+}
+
+# Inventory columns and the value used where a sheet has no such field,
+# matching what the data view shows for a missing column
+INVENTORY_DEFAULTS = {
+    'product_name': '',
+    'strain_name': '',
+    'product_type': 'Unknown',
+    'vendor': 'Unknown',
+    'brand': '',
+    'price': 0.0,
+    'weight': '',
+    'weight_unit': '',
+    'quantity': '0',
+    'barcode': '',
+    'sku': '',
+    'accepted_date': 'N/A',
+}
+
+REQUIRED_FIELDS = ('product_name',)
+
+
+def _normalize_header(header: Any) -> str:
+    return re.sub(r'[^a-z0-9]', '', str(header).lower()) if header is not None else ''
+
+
+def map_headers(headers: List[Any]) -> Dict[str, int]:
+    """Field -> index of the first column whose header matches one of its aliases"""
+    positions: Dict[str, int] = {}
+    for i, header in enumerate(headers):
+        positions.setdefault(_normalize_header(header), i)
+    mapping = {}
+    for field, aliases in FIELD_ALIASES.items():
+        for alias in aliases:
+            if alias in positions and positions[alias] not in mapping.values():
+                mapping[field] = positions[alias]
+                break
+    return mapping
+
+
+def _vendor_matcher(vendor: Optional[str]):
+    """Case-insensitive substring test for a vendor cell, or None for no filter"""
+    needle = (vendor or '').strip().lower()
+    if not needle:
+        return None
+    return lambda value: value is not None and needle in str(value).lower()
+
+
+def _read_xlsx(source, vendor: Optional[str], sheet_name: Optional[str]) -> pd.DataFrame:
+    try:
+        from openpyxl import load_workbook
+    except ImportError:
+        raise ValueError("Reading .xlsx files requires the openpyxl package")
+
+    workbook = load_workbook(source, read_only=True, data_only=True)
+    try:
+        sheet = workbook[sheet_name] if sheet_name else workbook.active
+        rows = sheet.iter_rows(values_only=True)
+
+        # The header is the first row with any content
+        headers = None
+        for row in rows:
+            if any(value is not None and str(value).strip() for value in row):
+                headers = list(row)
+                break
+        if headers is None:
+            return pd.DataFrame(columns=list(FIELD_ALIASES))
+
+        mapping = map_headers(headers)
+        fields = list(mapping)
+        if not fields:
+            return pd.DataFrame()
+        width = len(headers)
+        pick = itemgetter(*mapping.values())
+        vendor_index = mapping.get('vendor')
+        matches = _vendor_matcher(vendor) if vendor_index is not None else None
+
+        kept = []
+        scanned = 0
+        for row in rows:
+            if len(row) < width:
+                # Read-only sheets without a stored dimension yield ragged rows
+                row = tuple(row) + (None,) * (width - len(row))
+            values = pick(row) if len(fields) > 1 else (pick(row),)
+            if all(value is None for value in values):
+                continue
+            scanned += 1
+            if matches is not None and not matches(row[vendor_index]):
+                continue
+            kept.append(values)
+    finally:
+        workbook.close()
+
+    df = pd.DataFrame.from_records(kept, columns=fields) if kept else pd.DataFrame(columns=fields)
+    df.attrs['rows_read'] = scanned
+    df.attrs['vendor_filtered'] = matches is not None
+    return df
+
+
+def _read_xls(source, vendor: Optional[str], sheet_name: Optional[str]) -> pd.DataFrame:
+    """Legacy .xls through pandas (xlrd); only the mapped columns are parsed"""
+    headers = pd.read_excel(source, sheet_name=sheet_name or 0, nrows=0).columns.tolist()
+    if hasattr(source, 'seek'):
+        source.seek(0)
+    mapping = map_headers(headers)
+    if not mapping:
+        return pd.DataFrame()
+    df = pd.read_excel(source, sheet_name=sheet_name or 0, usecols=sorted(mapping.values()), dtype=object)
+    df = df.rename(columns={headers[i]: field for field, i in mapping.items()})[list(mapping)]
+    df = df.dropna(how='all').reset_index(drop=True)
+
+    scanned = len(df)
+    matches = _vendor_matcher(vendor) if 'vendor' in df.columns else None
+    if matches is not None:
+        df = df[[matches(value) for value in df['vendor'].tolist()]].reset_index(drop=True)
+    df.attrs['rows_read'] = scanned
+    df.attrs['vendor_filtered'] = matches is not None
+    return df
+
+
+def process_excel_file(source, vendor: Optional[str] = None, sheet_name: Optional[str] = None,
+                       filename: Optional[str] = None) -> pd.DataFrame:
+    """Read the mapped fields of an Excel sheet, keeping only rows of `vendor` if given.
+
+    `source` is a path or a binary file object (pass `filename` for the
+    extension then). The result has one column per mapped field, with raw
+    cell values; df.attrs holds 'rows_read' (data rows scanned) and
+    'vendor_filtered' (whether the sheet had a vendor column to filter on).
+    """
+    name = filename or (source if isinstance(source, str) else getattr(source, 'name', '')) or ''
+    if str(name).lower().endswith('.xls'):
+        df = _read_xls(source, vendor, sheet_name)
+    else:
+        df = _read_xlsx(source, vendor, sheet_name)
+    logger.info(f"Read {len(df)} of {df.attrs.get('rows_read', len(df))} Excel rows, "
+                f"fields: {list(df.columns)}")
+    return df
+
+
+def validate_excel_data(df: Optional[pd.DataFrame]) -> Tuple[bool, str]:
+    """(is_valid, error message) for a sheet read by process_excel_file"""
+    if df is None or df.empty and not df.attrs.get('rows_read'):
+        return False, "The Excel file contains no data rows"
+    missing = [field for field in REQUIRED_FIELDS if field not in df.columns]
+    if missing:
+        expected = ', '.join(f'"{alias}"' for alias in FIELD_ALIASES['product_name'])
+        return False, f"No product name column found (expected a header like {expected})"
+    if not df.empty and df['product_name'].isna().all():
+        return False, "The product name column is empty"
+    return True, ""
+
+
+def _clean_text(values: pd.Series) -> pd.Series:
+    """Cell values as stripped strings; whole floats lose their '.0' (Excel stores numbers as floats)"""
+    return pd.Series(
+        ['' if value is None or value != value
+         else str(int(value)) if isinstance(value, float) and value.is_integer()
+         else str(value).strip()
+         for value in values.tolist()],
+        index=values.index, dtype=object)
+
+
+def _clean_date(values: pd.Series) -> pd.Series:
+    return pd.Series(
+        [value.strftime('%Y-%m-%d') if isinstance(value, (datetime, date))
+         else 'N/A' if value is None or value != value or not str(value).strip()
+         else str(value).strip()
+         for value in values.tolist()],
+        index=values.index, dtype=object)
+
+
+def convert_to_inventory_format(df: pd.DataFrame) -> pd.DataFrame:
+    """Inventory columns (see INVENTORY_DEFAULTS) from the mapped fields, column by column"""
+    columns = {}
+    for field, default in INVENTORY_DEFAULTS.items():
+        if field not in df.columns:
+            columns[field] = [default] * len(df)
+        elif field == 'price':
+            columns[field] = pd.to_numeric(df[field], errors='coerce').fillna(0.0).astype(float)
+        elif field == 'accepted_date':
+            columns[field] = _clean_date(df[field])
+        else:
+            text = _clean_text(df[field])
+            columns[field] = text.where(text != '', default) if default else text
+    return pd.DataFrame(columns, index=df.index)
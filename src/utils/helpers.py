@@ -1,57 +1,16 @@
 import os
 import sys
 import json
-from docx import Document
-from docx.shared import Pt
-from docxcompose.composer import Composer
-from io import BytesIO
-from docxtpl import DocxTemplate
 import datetime
 from collections import deque
 
+from . import parallel_render
+
 def chunk_records(records, chunk_size=4):
     """Split records into chunks of specified size"""
     for i in range(0, len(records), chunk_size):
         yield records[i:i + chunk_size]
 
-def adjust_table_font_sizes(doc_path):
-    """
-    Post-process a DOCX file to dynamically adjust font size inside table cells based on thresholds.
-    """
-    thresholds = [
-        (30, 12),   # <=30 chars → 12pt
-        (45, 10),   # <=45 chars → 10pt
-        (60, 8),    # <=60 chars → 8pt
-        (float('inf'), 7)  # >60 chars → 7pt
-    ]
-
-    def get_font_size(text_len):
-        for limit, size in thresholds:
-            if text_len <= limit:
-                return size
-        return 7  # Fallback
-
-    doc = Document(doc_path)
-
-    for table in doc.tables:
-        for row in table.rows:
-            for cell in row.cells:
-                for paragraph in cell.paragraphs:
-                    text = paragraph.text.strip()
-                    if not text:
-                        continue
-
-                    # If line is Product Name (first line), force 10pt
-                    if paragraph == cell.paragraphs[0]:
-                        font_size = 10
-                    else:
-                        font_size = get_font_size(len(text))
-
-                    for run in paragraph.runs:
-                        run.font.size = Pt(font_size)
-
-    doc.save(doc_path)
-
 def open_file(path):
     """Open a file using the system's default application"""
     try:
@@ -101,7 +60,6 @@ def run_full_process_inventory_slips(selected_df, config, status_callback=None,
             status_callback("Processing data...")
         
         records = selected_df.to_dict(orient="records")
-        pages = []
 
         # Create queues per logical slot so each slot holds one product type
         def map_type_to_slot(ptype):
@@ -160,99 +118,77 @@ def run_full_process_inventory_slips(selected_df, config, status_callback=None,
         if total_pages == 0 and records:
             total_pages = 1
 
-        # Progress calculation
-        current_chunk = 0
-
         # Build pages by pulling one item per slot per page (if available)
+        contexts = []
         for page_idx in range(total_pages):
-            current_chunk += 1
-            if progress_callback:
-                progress_value = (current_chunk / max(total_pages,1)) * 50  # First half of progress
-                progress_callback(int(progress_value))
+            context = {}
+
+            # For each slot index, pop next record if available
+            for slot_num in range(1, items_per_page + 1):
+                rec = None
+                if slot_queues.get(slot_num) and len(slot_queues[slot_num]) > 0:
+                    rec = slot_queues[slot_num].popleft()
+                elif misc_queue:
+                    rec = misc_queue.popleft()
+
+                if rec:
+                    product_name = rec.get("Product Name*", "")
+                    barcode = rec.get("Barcode*", "")
+                    qty = rec.get("Quantity Received*", rec.get("Quantity*", ""))
+                    try:
+                        qty = int(float(qty))
+                    except (ValueError, TypeError):
+                        qty = ""
+
+                    context[f"Label{slot_num}"] = {
+                        "ProductName": product_name,
+                        "Barcode": barcode,
+                        "AcceptedDate": rec.get("Accepted Date", ""),
+                        "QuantityReceived": qty,
+                        "Vendor": rec.get("Vendor", ""),
+                        "StrainName": rec.get("Strain Name", ""),
+                        "ProductType": rec.get("Product Type*", rec.get("Inventory Type", "")),
+                        "THCContent": rec.get("THC Content", ""),
+                        "CBDContent": rec.get("CBD Content", "")
+                    }
+                else:
+                    context[f"Label{slot_num}"] = {
+                        "ProductName": "",
+                        "Barcode": "",
+                        "AcceptedDate": "",
+                        "QuantityReceived": "",
+                        "Vendor": "",
+                        "StrainName": "",
+                        "ProductType": "",
+                        "THCContent": "",
+                        "CBDContent": ""
+                    }
+
+            contexts.append(context)
+
+        if not contexts:
+            return False, "No documents generated."
 
+        def page_progress(page_num, total):
+            if progress_callback:
+                progress_callback(int((page_num / total) * 75))  # First three quarters of progress
             if status_callback:
-                status_callback(f"Generating page {current_chunk} of {total_pages}...")
-
-            try:
-                tpl = DocxTemplate(template_path)
-                context = {}
-
-                # For each slot index, pop next record if available
-                for slot_num in range(1, items_per_page + 1):
-                    rec = None
-                    if slot_queues.get(slot_num) and len(slot_queues[slot_num]) > 0:
-                        rec = slot_queues[slot_num].popleft()
-                    elif misc_queue:
-                        rec = misc_queue.popleft()
-
-                    if rec:
-                        product_name = rec.get("Product Name*", "")
-                        barcode = rec.get("Barcode*", "")
-                        qty = rec.get("Quantity Received*", rec.get("Quantity*", ""))
-                        try:
-                            qty = int(float(qty))
-                        except (ValueError, TypeError):
-                            qty = ""
-
-                        context[f"Label{slot_num}"] = {
-                            "ProductName": product_name,
-                            "Barcode": barcode,
-                            "AcceptedDate": rec.get("Accepted Date", ""),
-                            "QuantityReceived": qty,
-                            "Vendor": rec.get("Vendor", ""),
-                            "StrainName": rec.get("Strain Name", ""),
-                            "ProductType": rec.get("Product Type*", rec.get("Inventory Type", "")),
-                            "THCContent": rec.get("THC Content", ""),
-                            "CBDContent": rec.get("CBD Content", "")
-                        }
-                    else:
-                        context[f"Label{slot_num}"] = {
-                            "ProductName": "",
-                            "Barcode": "",
-                            "AcceptedDate": "",
-                            "QuantityReceived": "",
-                            "Vendor": "",
-                            "StrainName": "",
-                            "ProductType": "",
-                            "THCContent": "",
-                            "CBDContent": ""
-                        }
+                status_callback(f"Generating page {page_num} of {total}...")
 
-                tpl.render(context)
-                buf = BytesIO()
-                tpl.save(buf)
-                pages.append(Document(buf))
-
-            except Exception as e:
-                return False, f"Error generating page {current_chunk}: {e}"
-        
-        if not pages:
-            return False, "No documents generated."
-        
-        if status_callback:
-            status_callback("Combining pages...")
-        
-        master = pages[0]
-        composer = Composer(master)
-        for i, doc in enumerate(pages[1:]):
-            if progress_callback:
-                progress_value = 50 + ((i + 1) / len(pages[1:])) * 25  # Second quarter of progress
-                progress_callback(int(progress_value))
-            composer.append(doc)
-        
         now = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
         outname = f"{now}_inventory_slips.docx"
         outpath = os.path.join(output_dir, outname)
-        
-        if status_callback:
-            status_callback("Saving document...")
-        
-        master.save(outpath)
-        
-        if status_callback:
-            status_callback("Adjusting formatting...")
-        
-        adjust_table_font_sizes(outpath)
+
+        def announce_save(doc):
+            if status_callback:
+                status_callback("Saving document...")
+
+        try:
+            workers = parallel_render.workers_from_config(config)
+            parallel_render.render_to_file(template_path, contexts, outpath, workers, prepare=announce_save,
+                                           progress_callback=page_progress, page_breaks=False)
+        except Exception as e:
+            return False, f"Error generating pages: {e}"
         
         if progress_callback:
             progress_callback(100)  # Complete progress
@@ -0,0 +1,210 @@
+"""
+On-disk cache of parsed HTTP responses with conditional revalidation.
+
+Entries are keyed by the URL, query parameters and a fingerprint of the
+credentials sent with the request (never the credentials themselves), and
+hold the parsed result together with the response's ETag / Last-Modified
+validators, written as JSON (DataFrames in pandas' table layout) to an
+owner-only directory under the app's data directory. A repeat fetch sends If-None-Match / If-Modified-Since; a 304
+reuses the stored parse, so an unchanged manifest is neither downloaded nor
+parsed again. Responses without validators, or marked no-store, are not
+cached.
+"""
+
+import io
+import os
+import json
+import time
+import hashlib
+import logging
+import threading
+from typing import Any, Dict, Optional
+
+import pandas as pd
+
+from .private_dir import private_dir
+
+logger = logging.getLogger(__name__)
+
+# Constants
+CACHE_DIR = private_dir("http_cache")
+MAX_CACHE_MB = 200  # Total size of cached parses before the least recently used are removed
+MAX_CACHE_AGE_HOURS = 72  # Entries unused for this long are removed
+ENTRY_SUFFIX = ".json"
+CREDENTIAL_HEADERS = ('authorization', 'cookie', 'x-api-key')
+
+_lock = threading.Lock()
+_stats = {'revalidated': 0, 'modified': 0, 'stored': 0, 'evictions': 0}
+
+
+def credential_fingerprint(headers: Optional[Dict[str, str]]) -> str:
+    """Hash of the credential headers, so different keys never share an entry."""
+    digest = hashlib.sha256()
+    for name, value in sorted((headers or {}).items(), key=lambda item: item[0].lower()):
+        if name.lower() in CREDENTIAL_HEADERS:
+            digest.update(f"{name.lower()}:{value}\0".encode('utf-8'))
+    return digest.hexdigest()
+
+
+def cache_key(url: str, params: Optional[Dict[str, Any]] = None,
+              headers: Optional[Dict[str, str]] = None, kind: str = "") -> str:
+    """Key for a request; `kind` separates different parses of the same URL."""
+    digest = hashlib.sha256()
+    parts = (url, repr(sorted((params or {}).items())), credential_fingerprint(headers), kind)
+    for part in parts:
+        digest.update(part.encode('utf-8'))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def _entry_path(key: str) -> str:
+    return os.path.join(CACHE_DIR, f"{key}{ENTRY_SUFFIX}")
+
+
+def _encode(value: Any) -> Any:
+    """JSON-safe form of a parsed value: DataFrames and tuples are tagged"""
+    if isinstance(value, pd.DataFrame):
+        return {'__dataframe__': value.to_json(orient='table', date_format='iso')}
+    if isinstance(value, tuple):
+        return {'__tuple__': [_encode(item) for item in value]}
+    if isinstance(value, list):
+        return [_encode(item) for item in value]
+    if isinstance(value, dict):
+        return {str(k): _encode(v) for k, v in value.items()}
+    return value
+
+
+def _decode(value: Any) -> Any:
+    if isinstance(value, list):
+        return [_decode(item) for item in value]
+    if isinstance(value, dict):
+        if '__dataframe__' in value:
+            return pd.read_json(io.StringIO(value['__dataframe__']), orient='table')
+        if '__tuple__' in value:
+            return tuple(_decode(item) for item in value['__tuple__'])
+        return {k: _decode(v) for k, v in value.items()}
+    return value
+
+
+def lookup(key: str) -> Optional[Dict[str, Any]]:
+    """Return the stored entry ({'value', 'etag', 'last_modified', ...}) or None."""
+    path = _entry_path(key)
+    try:
+        with open(path, encoding='utf-8') as f:
+            entry = json.load(f)
+        entry['value'] = _decode(entry['value'])
+        return entry
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning(f"Discarding unreadable HTTP cache entry {path}: {e}")
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        return None
+
+
+def conditional_headers(entry: Optional[Dict[str, Any]]) -> Dict[str, str]:
+    """If-None-Match / If-Modified-Since headers that revalidate an entry."""
+    if not entry:
+        return {}
+    headers = {}
+    if entry.get('etag'):
+        headers['If-None-Match'] = entry['etag']
+    if entry.get('last_modified'):
+        headers['If-Modified-Since'] = entry['last_modified']
+    return headers
+
+
+def reuse(key: str, entry: Dict[str, Any]) -> Any:
+    """Record a 304 for this entry and return its stored value."""
+    try:
+        os.utime(_entry_path(key))
+    except OSError:
+        pass
+    with _lock:
+        _stats['revalidated'] += 1
+    logger.info(f"HTTP cache: {entry.get('url')} not modified, reusing parsed result")
+    return entry['value']
+
+
+def store(key: str, response, value: Any) -> bool:
+    """Save a parsed value with the response's validators. Returns False if not cacheable."""
+    with _lock:
+        _stats['modified'] += 1
+    etag = response.headers.get('ETag')
+    last_modified = response.headers.get('Last-Modified')
+    if not (etag or last_modified) or 'no-store' in response.headers.get('Cache-Control', '').lower():
+        return False
+
+    entry = {
+        'url': response.url,
+        'etag': etag,
+        'last_modified': last_modified,
+        'stored_at': time.time(),
+        'value': _encode(value),
+    }
+    path = _entry_path(key)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(entry, f)
+        os.replace(tmp_path, path)
+    except Exception as e:
+        logger.warning(f"Could not write HTTP cache entry for {response.url}: {e}")
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        return False
+
+    with _lock:
+        _stats['stored'] += 1
+    evict(keep=path)
+    return True
+
+
+def evict(max_mb: float = MAX_CACHE_MB, max_age_hours: float = MAX_CACHE_AGE_HOURS,
+          keep: Optional[str] = None) -> int:
+    """Remove expired entries, then the least recently used until the cache fits in max_mb."""
+    if not os.path.isdir(CACHE_DIR):
+        return 0
+    entries = []
+    for name in os.listdir(CACHE_DIR):
+        path = os.path.join(CACHE_DIR, name)
+        if not name.endswith(ENTRY_SUFFIX):
+            continue
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, path))
+
+    entries.sort()
+    cutoff = time.time() - max_age_hours * 3600
+    total = sum(size for _, size, _ in entries)
+    limit = max_mb * 1024 * 1024
+    removed = 0
+
+    for mtime, size, path in entries:
+        if path == keep or (mtime >= cutoff and total <= limit):
+            continue
+        try:
+            os.remove(path)
+        except OSError:
+            continue
+        total -= size
+        removed += 1
+
+    if removed:
+        with _lock:
+            _stats['evictions'] += removed
+        logger.info(f"Evicted {removed} HTTP cache entr{'y' if removed == 1 else 'ies'}")
+    return removed
+
+
+def cache_stats() -> Dict[str, int]:
+    """Return revalidation/store/eviction counters for this process."""
+    with _lock:
+        return dict(_stats)
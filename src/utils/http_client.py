@@ -0,0 +1,149 @@
+"""
+Process-wide HTTP client for every outbound call.
+
+A single requests.Session per process keeps connections alive and pooled per
+host, retries 429/5xx responses with exponential backoff (honouring a
+Retry-After of up to MAX_RETRY_AFTER seconds and failing fast on longer ones,
+so a throttled host cannot hold a request thread for minutes), and advertises every content encoding urllib3 can decode
+(gzip, deflate, and br when the brotli package is installed).
+"""
+
+import os
+import logging
+import threading
+from typing import Any, Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import MaxRetryError, ResponseError
+from urllib3.util import Retry, make_headers
+
+logger = logging.getLogger(__name__)
+
+# Constants
+POOL_CONNECTIONS = 10  # Hosts kept in the pool
+POOL_MAXSIZE = 20  # Keep-alive connections per host
+MAX_RETRIES = 3
+BACKOFF_FACTOR = 0.5  # Sleeps 0.5s, 1s, 2s, ... between retries
+MAX_RETRY_AFTER = 5  # Longest Retry-After (seconds) we wait out; longer ones are returned as-is
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+DEFAULT_TIMEOUT = 30
+
+ACCEPT_ENCODING = make_headers(accept_encoding=True)['accept-encoding']
+
+# Headers that make manifest hosts treat us like a browser
+BROWSER_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept': 'application/json, text/plain, */*',
+    'Accept-Language': 'en-US,en;q=0.9',
+    'Accept-Encoding': ACCEPT_ENCODING,
+    'Cache-Control': 'no-cache',
+    'Pragma': 'no-cache'
+}
+
+_lock = threading.Lock()
+_session: Optional[requests.Session] = None
+_session_pid: Optional[int] = None
+_settings: Dict[str, Any] = {
+    'pool_connections': POOL_CONNECTIONS,
+    'pool_maxsize': POOL_MAXSIZE,
+    'max_retries': MAX_RETRIES,
+    'backoff_factor': BACKOFF_FACTOR,
+    'max_retry_after': MAX_RETRY_AFTER,
+}
+
+
+class CappedRetry(Retry):
+    """Retry that gives up, rather than sleeping, when Retry-After exceeds max_retry_after"""
+
+    max_retry_after: float = MAX_RETRY_AFTER
+
+    def new(self, **kw: Any) -> "CappedRetry":
+        retry = super().new(**kw)
+        retry.max_retry_after = self.max_retry_after
+        return retry
+
+    def increment(self, method=None, url=None, response=None, error=None, _pool=None, _stacktrace=None):
+        if response is not None and self.respect_retry_after_header:
+            retry_after = self.get_retry_after(response)
+            if retry_after is not None and retry_after > self.max_retry_after:
+                # With raise_on_status off, urllib3 hands this response straight back
+                raise MaxRetryError(_pool, url, ResponseError(
+                    f"Retry-After of {retry_after:.0f}s exceeds {self.max_retry_after}s"))
+        return super().increment(method, url, response=response, error=error,
+                                 _pool=_pool, _stacktrace=_stacktrace)
+
+
+def _build_session() -> requests.Session:
+    retry = CappedRetry(
+        total=_settings['max_retries'],
+        backoff_factor=_settings['backoff_factor'],
+        status_forcelist=RETRY_STATUSES,
+        respect_retry_after_header=True,
+        raise_on_status=False,  # Hand the last response back so callers see the real status
+    )
+    retry.max_retry_after = _settings['max_retry_after']
+    adapter = HTTPAdapter(
+        pool_connections=_settings['pool_connections'],
+        pool_maxsize=_settings['pool_maxsize'],
+        max_retries=retry,
+    )
+    session = requests.Session()
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    session.headers['Accept-Encoding'] = ACCEPT_ENCODING
+    return session
+
+
+def configure(pool_connections: Optional[int] = None, pool_maxsize: Optional[int] = None,
+              max_retries: Optional[int] = None, backoff_factor: Optional[float] = None,
+              max_retry_after: Optional[float] = None) -> None:
+    """Change pool and retry settings; the shared session is rebuilt on next use."""
+    global _session
+    updates = {
+        'pool_connections': pool_connections,
+        'pool_maxsize': pool_maxsize,
+        'max_retries': max_retries,
+        'backoff_factor': backoff_factor,
+        'max_retry_after': max_retry_after,
+    }
+    with _lock:
+        _settings.update({k: v for k, v in updates.items() if v is not None})
+        old, _session = _session, None
+    if old is not None:
+        old.close()
+
+
+def configure_from_config(config) -> None:
+    """Apply the [HTTP] section of the app config, if present."""
+    if not config.has_section('HTTP'):
+        return
+    section = config['HTTP']
+    configure(
+        pool_connections=section.getint('pool_connections', fallback=None),
+        pool_maxsize=section.getint('pool_maxsize', fallback=None),
+        max_retries=section.getint('max_retries', fallback=None),
+        backoff_factor=section.getfloat('backoff_factor', fallback=None),
+        max_retry_after=section.getfloat('max_retry_after', fallback=None),
+    )
+
+
+def get_session() -> requests.Session:
+    """Return the shared session, creating it (again after a fork) when needed."""
+    global _session, _session_pid
+    with _lock:
+        if _session is None or _session_pid != os.getpid():
+            # Pooled sockets must not be shared with a forked parent
+            _session = _build_session()
+            _session_pid = os.getpid()
+        return _session
+
+
+def request(method: str, url: str, timeout: float = DEFAULT_TIMEOUT, **kwargs) -> requests.Response:
+    """requests.request() through the shared pooled session."""
+    return get_session().request(method, url, timeout=timeout, **kwargs)
+
+
+def get(url: str, timeout: float = DEFAULT_TIMEOUT, **kwargs) -> requests.Response:
+    """requests.get() through the shared pooled session."""
+    return request('GET', url, timeout=timeout, **kwargs)
@@ -0,0 +1,222 @@
+"""
+Background job queue for document generation.
+
+Jobs run on a bounded thread pool so long slip builds do not tie up request
+workers. Each job records the messages and progress values reported through
+the generator's status_callback/progress_callback so clients can poll them.
+Job state is also mirrored to a small JSON file in an owner-only directory
+(see private_dir) so that any gunicorn worker can answer a poll, not only the
+one running the job.
+"""
+
+import os
+import json
+import logging
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from .private_dir import private_dir
+
+logger = logging.getLogger(__name__)
+
+# Constants
+MAX_WORKERS = 2  # Concurrent generation jobs per process
+MAX_PENDING_JOBS = 20  # Queued + running jobs before new submissions are refused
+JOB_TTL_SECONDS = 3600  # Finished jobs are forgotten after this long
+STATE_DIR = private_dir("jobs")
+
+
+class QueueFullError(Exception):
+    """Raised when the queue already holds MAX_PENDING_JOBS unfinished jobs"""
+    pass
+
+
+class GenerationJob:
+    def __init__(self, job_id: str, owner: Optional[str] = None, state_dir: Optional[str] = None,
+                 dedupe_key: Optional[str] = None):
+        self.job_id = job_id
+        self.owner = owner
+        self.dedupe_key = dedupe_key
+        self.state_dir = state_dir
+        self.state = 'queued'  # queued -> running -> done | failed
+        self.progress = 0
+        self.messages = []
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self._lock = threading.Lock()
+
+    def status_callback(self, message: str) -> None:
+        with self._lock:
+            self.messages.append(message)
+        logger.info(f"Job {self.job_id}: {message}")
+        self.persist()
+
+    def progress_callback(self, value: int) -> None:
+        with self._lock:
+            if int(value) <= self.progress:
+                return
+            self.progress = int(value)
+        self.persist()
+
+    def set_state(self, state: str) -> None:
+        self.state = state
+        if state == 'running':
+            self.started_at = time.time()
+        elif state in ('done', 'failed'):
+            self.finished_at = time.time()
+        self.persist()
+
+    def persist(self) -> None:
+        """Mirror the job to STATE_DIR so other worker processes can report on it"""
+        if not self.state_dir:
+            return
+        try:
+            with self._lock:
+                data = {
+                    'job_id': self.job_id,
+                    'owner': self.owner,
+                    'state': self.state,
+                    'progress': self.progress,
+                    'messages': list(self.messages),
+                    # In-memory results cannot be shared; other processes see None
+                    'result': self.result if isinstance(self.result, str) else (
+                        self.result.to_state() if hasattr(self.result, 'to_state') else None),
+                    'error': self.error,
+                    'created_at': self.created_at,
+                    'started_at': self.started_at,
+                    'finished_at': self.finished_at,
+                }
+            path = os.path.join(self.state_dir, f"{self.job_id}.json")
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(data, f)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.warning(f"Could not persist job {self.job_id}: {e}")
+
+    @classmethod
+    def load(cls, state_dir: str, job_id: str) -> Optional['GenerationJob']:
+        """Rebuild a read-only snapshot of a job persisted by another process"""
+        try:
+            with open(os.path.join(state_dir, f"{job_id}.json")) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        job = cls(data['job_id'], data.get('owner'))
+        for field in ('state', 'progress', 'messages', 'result', 'error',
+                      'created_at', 'started_at', 'finished_at'):
+            setattr(job, field, data.get(field))
+        return job
+
+    @property
+    def finished(self) -> bool:
+        return self.state in ('done', 'failed')
+
+    def to_dict(self, since: int = 0) -> Dict[str, Any]:
+        """Snapshot of the job; messages start at index `since` so pollers only get new lines"""
+        with self._lock:
+            return {
+                'job_id': self.job_id,
+                'state': self.state,
+                'progress': self.progress,
+                'messages': self.messages[since:],
+                'next_message': len(self.messages),
+                'error': self.error,
+                'elapsed': round((self.finished_at or time.time()) - (self.started_at or self.created_at), 3),
+            }
+
+
+class JobQueue:
+    def __init__(self, max_workers: int = MAX_WORKERS, max_pending: int = MAX_PENDING_JOBS,
+                 ttl: int = JOB_TTL_SECONDS, state_dir: Optional[str] = STATE_DIR):
+        self.max_pending = max_pending
+        self.ttl = ttl
+        self.state_dir = state_dir
+        if state_dir:
+            os.makedirs(state_dir, exist_ok=True)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='slip-job')
+        self._jobs: Dict[str, GenerationJob] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, func: Callable, *args, owner: Optional[str] = None,
+               dedupe_key: Optional[str] = None, **kwargs) -> GenerationJob:
+        """Queue func(*args, status_callback=..., progress_callback=..., **kwargs).
+
+        func must return a (success, result) tuple like the slip generators do.
+        If the same owner already has an unfinished job with this dedupe_key,
+        that job is returned instead of queueing a duplicate.
+        """
+        with self._lock:
+            self._prune()
+            if dedupe_key is not None:
+                for existing in self._jobs.values():
+                    if (not existing.finished and existing.dedupe_key == dedupe_key
+                            and existing.owner == owner):
+                        logger.info(f"Reusing in-flight job {existing.job_id} for a repeated request")
+                        return existing
+            pending = sum(1 for job in self._jobs.values() if not job.finished)
+            if pending >= self.max_pending:
+                raise QueueFullError(f"{pending} generation jobs already pending")
+            job = GenerationJob(uuid.uuid4().hex, owner, self.state_dir, dedupe_key)
+            self._jobs[job.job_id] = job
+        job.persist()
+
+        self._executor.submit(self._run, job, func, args, kwargs)
+        return job
+
+    def get(self, job_id: str, owner: Optional[str] = None) -> Optional[GenerationJob]:
+        """Return the job, or None if it is unknown or belongs to someone else"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is None and self.state_dir and job_id.isalnum():
+            job = GenerationJob.load(self.state_dir, job_id)
+            # Every job submitted from a request has an owner; never hand out one without
+            if job is not None and job.owner is None:
+                logger.warning(f"Ignoring persisted job {job_id} without an owner")
+                return None
+        if job is None or (job.owner is not None and job.owner != owner):
+            return None
+        return job
+
+    def _run(self, job: GenerationJob, func: Callable, args: tuple, kwargs: dict) -> None:
+        job.set_state('running')
+        try:
+            success, result = func(
+                *args,
+                status_callback=job.status_callback,
+                progress_callback=job.progress_callback,
+                **kwargs
+            )
+            if success:
+                job.result = result
+                job.progress = 100
+                job.set_state('done')
+            else:
+                job.error = str(result)
+                job.set_state('failed')
+        except Exception as e:
+            logger.error(f"Job {job.job_id} crashed: {str(e)}", exc_info=True)
+            job.error = str(e)
+            job.set_state('failed')
+
+    def _prune(self) -> None:
+        """Drop finished jobs older than the TTL (caller holds the lock)"""
+        cutoff = time.time() - self.ttl
+        expired = [job_id for job_id, job in self._jobs.items()
+                   if job.finished and job.finished_at < cutoff]
+        for job_id in expired:
+            job = self._jobs.pop(job_id)
+            # Release documents held in memory rather than on disk
+            if hasattr(job.result, 'close'):
+                job.result.close()
+            if self.state_dir:
+                try:
+                    os.remove(os.path.join(self.state_dir, f"{job_id}.json"))
+                except OSError:
+                    pass
@@ -0,0 +1,180 @@
+"""
+Streaming writer for the order sheet document.
+
+The package around the body (styles, settings, content types) is taken from
+python-docx's default template once per process. word/document.xml is written
+with lxml's incremental writer straight into its zip entry, one table row at a
+time, so a long manifest is never held as a python-docx tree and each row costs
+the same no matter how many came before it.
+"""
+
+import io
+import re
+import logging
+import threading
+import zipfile
+from itertools import repeat
+
+from docx import Document
+from lxml import etree
+
+logger = logging.getLogger(__name__)
+
+W_NS = 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'
+# Written by qualified name: lxml's incremental writer mis-prefixes the xml namespace
+XML_SPACE = 'xml:space'
+
+# Constants
+ROWS_PER_PAGE = 20  # Data rows per table; each page repeats the header row
+HEADERS = ('Product Name', 'Barcode', 'Quantity', 'Vendor', 'Accepted Date')
+# (source column, max characters) for each data cell, in header order
+FIELDS = (
+    ('Product Name*', 100),
+    ('Barcode*', 50),
+    ('Quantity Received*', 5),
+    ('Vendor', 20),
+    ('Accepted Date', 10),
+)
+COLUMN_WIDTHS = (5, 2, 0.75, 1.5, 1.5, 1.75)  # Relative; the sixth column is left blank
+USABLE_WIDTH = 10 * 1440  # Landscape letter minus half-inch margins, in twips
+HEADER_SIZE = 22  # Half-points (11pt)
+DATA_SIZE = 20  # Half-points (10pt)
+
+# Characters XML 1.0 cannot carry; python-docx would reject them too
+_INVALID_XML_RE = re.compile(r'[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+_skeleton = None
+_skeleton_lock = threading.Lock()
+
+
+def _w(tag):
+    return f'{{{W_NS}}}{tag}'
+
+
+def _skeleton_parts():
+    """(name, bytes) for each part of a blank package, and the body part's name"""
+    global _skeleton
+    with _skeleton_lock:
+        if _skeleton is None:
+            doc = Document()
+            buffer = io.BytesIO()
+            doc.save(buffer)
+            body_part = doc.part.partname.lstrip('/')
+            with zipfile.ZipFile(buffer) as package:
+                parts = [(name, package.read(name)) for name in package.namelist() if name != body_part]
+            _skeleton = (parts, body_part)
+        return _skeleton
+
+
+def rows_from_frame(df):
+    """Yield the cell text of each order sheet row, read column-wise from the DataFrame"""
+    columns = []
+    for column, limit in FIELDS:
+        if column in df.columns:
+            columns.append(df[column].astype(str).str[:limit].tolist())
+        else:
+            columns.append(repeat('', len(df)))
+    return zip(*columns)
+
+
+def _empty(xf, tag, **attrs):
+    with xf.element(_w(tag), {_w(k): str(v) for k, v in attrs.items()}):
+        pass
+
+
+def _paragraph(xf, text, size, bold=False, center=False):
+    with xf.element(_w('p')):
+        if center:
+            with xf.element(_w('pPr')):
+                _empty(xf, 'jc', val='center')
+        if not text:
+            return
+        with xf.element(_w('r')):
+            with xf.element(_w('rPr')):
+                if bold:
+                    _empty(xf, 'b')
+                _empty(xf, 'sz', val=size)
+            with xf.element(_w('t'), {XML_SPACE: 'preserve'}):
+                xf.write(_INVALID_XML_RE.sub('', text))
+
+
+def _row(xf, cells, widths, size, bold=False):
+    with xf.element(_w('tr')):
+        for text, width in zip(cells, widths):
+            with xf.element(_w('tc')):
+                with xf.element(_w('tcPr')):
+                    _empty(xf, 'tcW', w=width, type='dxa')
+                _paragraph(xf, text, size, bold=bold)
+
+
+def _table(xf, rows, widths):
+    """Write one page's table: the header row followed by its data rows"""
+    with xf.element(_w('tbl')):
+        with xf.element(_w('tblPr')):
+            _empty(xf, 'tblStyle', val='TableGrid')
+            _empty(xf, 'tblW', w=sum(widths), type='dxa')
+            _empty(xf, 'tblLayout', type='fixed')
+            _empty(xf, 'tblLook', val='04A0', firstRow=1, lastRow=0, firstColumn=1,
+                   lastColumn=0, noHBand=0, noVBand=1)
+        with xf.element(_w('tblGrid')):
+            for width in widths:
+                _empty(xf, 'gridCol', w=width)
+        _row(xf, HEADERS + ('',), widths, HEADER_SIZE, bold=True)
+        for cells in rows:
+            _row(xf, tuple(cells) + ('',), widths, DATA_SIZE)
+
+
+def _page_break(xf):
+    with xf.element(_w('p')):
+        with xf.element(_w('r')):
+            _empty(xf, 'br', type='page')
+
+
+def _section(xf):
+    """Landscape letter with half-inch margins"""
+    with xf.element(_w('sectPr')):
+        _empty(xf, 'pgSz', w=15840, h=12240, orient='landscape')
+        _empty(xf, 'pgMar', top=720, right=720, bottom=720, left=720, header=720, footer=720, gutter=0)
+        _empty(xf, 'cols', space=720)
+        _empty(xf, 'docGrid', linePitch=360)
+
+
+def write_order_sheet(path, rows, vendor_name, date_text):
+    """Write the order sheet for `rows` (tuples of cell text, in FIELDS order) to path.
+
+    Rows are consumed lazily. Returns the number of data rows written.
+    """
+    parts, body_part = _skeleton_parts()
+    total = sum(COLUMN_WIDTHS)
+    widths = [round(width * USABLE_WIDTH / total) for width in COLUMN_WIDTHS]
+    count = 0
+
+    with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as package:
+        for name, data in parts:
+            package.writestr(name, data)
+        with package.open(body_part, 'w') as raw, etree.xmlfile(raw, encoding='UTF-8') as xf:
+            xf.write_declaration(standalone=True)
+            with xf.element(_w('document'), nsmap={'w': W_NS}):
+                with xf.element(_w('body')):
+                    _paragraph(xf, "Order Sheet", 28, bold=True, center=True)
+                    _paragraph(xf, f"Date: {date_text}    Vendor: {vendor_name}", HEADER_SIZE)
+
+                    page = []
+                    for cells in rows:
+                        page.append(cells)
+                        if len(page) == ROWS_PER_PAGE:
+                            if count:
+                                _page_break(xf)
+                            _table(xf, page, widths)
+                            count += len(page)
+                            page = []
+                    if page or not count:
+                        if count:
+                            _page_break(xf)
+                        _table(xf, page, widths)
+                        count += len(page)
+
+                    _section(xf)
+
+    logger.info(f"Wrote order sheet with {count} rows to {path}")
+    return count
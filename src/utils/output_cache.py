@@ -0,0 +1,138 @@
+"""
+Content-addressed cache of generated slip documents.
+
+A request is identified by a hash of the selected records, the items per page
+setting, the template identity (path, mtime, size) and the generator mode.
+The finished document is stored under that hash in a cache folder inside the
+output directory, so a repeated "Generate" for the same selection is served
+from disk instead of being rebuilt. Old entries are evicted by age and by the
+total size of the folder.
+"""
+
+import os
+import time
+import hashlib
+import logging
+import threading
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Constants
+CACHE_DIRNAME = "slip_cache"
+CACHED_EXTENSIONS = ('.docx', '.zip')  # Slip documents and batch archives
+MAX_CACHE_MB = 500  # Total size of cached documents before the oldest are removed
+MAX_CACHE_AGE_HOURS = 168  # Cached documents unused for this long are removed
+
+_lock = threading.Lock()
+_stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+
+
+def template_identity(template_path: Optional[str]) -> str:
+    """Describe the template file so an edited template produces a new key."""
+    if not template_path:
+        return ""
+    path = os.path.abspath(template_path)
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return path
+    return f"{path}:{stat.st_mtime_ns}:{stat.st_size}"
+
+
+def request_key(selected_df, items_per_page, template_path, mode: str, extra: str = "") -> str:
+    """Hash everything that determines the generated document."""
+    digest = hashlib.sha256()
+    digest.update(selected_df.to_json(orient='records', date_format='iso').encode('utf-8'))
+    for part in (str(items_per_page), template_identity(template_path), mode, extra):
+        digest.update(b"\0")
+        digest.update(part.encode('utf-8'))
+    return digest.hexdigest()
+
+
+def cache_dir(output_dir: str) -> str:
+    path = os.path.join(output_dir, CACHE_DIRNAME)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def cache_path(output_dir: str, key: str, prefix: str, ext: str = '.docx') -> str:
+    """Return where the document for this key is (or will be) stored."""
+    return os.path.join(cache_dir(output_dir), f"{prefix}_{key[:16]}{ext}")
+
+
+def in_cache(output_dir: str, path: str) -> bool:
+    """Whether path is a document file inside this output directory's cache folder."""
+    folder = os.path.realpath(os.path.join(output_dir, CACHE_DIRNAME))
+    resolved = os.path.realpath(path)
+    return (os.path.dirname(resolved) == folder and resolved.endswith(CACHED_EXTENSIONS)
+            and os.path.isfile(resolved))
+
+
+def lookup(output_dir: str, key: str, prefix: str, ext: str = '.docx') -> Optional[str]:
+    """Return the cached document for this key, or None on a miss."""
+    path = cache_path(output_dir, key, prefix, ext)
+    if os.path.isfile(path) and os.path.getsize(path) > 0:
+        # Refresh the mtime so age-based eviction treats this as recently used
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        with _lock:
+            _stats['hits'] += 1
+        logger.info(f"Output cache hit: {os.path.basename(path)}")
+        return path
+    with _lock:
+        _stats['misses'] += 1
+    return None
+
+
+def evict(output_dir: str, max_mb: float = MAX_CACHE_MB, max_age_hours: float = MAX_CACHE_AGE_HOURS,
+          keep: Optional[str] = None) -> int:
+    """Remove expired documents, then the oldest ones until the folder fits in max_mb.
+
+    `keep` is never removed (normally the document that was just produced).
+    Returns the number of files removed.
+    """
+    folder = cache_dir(output_dir)
+    entries = []
+    for name in os.listdir(folder):
+        path = os.path.join(folder, name)
+        if not name.endswith(CACHED_EXTENSIONS) or not os.path.isfile(path):
+            continue
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, path))
+
+    entries.sort()
+    cutoff = time.time() - max_age_hours * 3600
+    total = sum(size for _, size, _ in entries)
+    limit = max_mb * 1024 * 1024
+    removed = 0
+
+    for mtime, size, path in entries:
+        if keep and os.path.abspath(path) == os.path.abspath(keep):
+            continue
+        if mtime >= cutoff and total <= limit:
+            continue
+        try:
+            os.remove(path)
+        except OSError as e:
+            logger.warning(f"Could not evict cached document {path}: {e}")
+            continue
+        total -= size
+        removed += 1
+
+    if removed:
+        with _lock:
+            _stats['evictions'] += removed
+        logger.info(f"Evicted {removed} cached document(s) from {folder}")
+    return removed
+
+
+def cache_stats() -> Dict[str, int]:
+    """Return hit/miss/eviction counters for this process."""
+    with _lock:
+        return dict(_stats)
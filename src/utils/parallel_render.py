@@ -0,0 +1,160 @@
+"""
+Parallel slip rendering across a process pool.
+
+Filling placeholders is CPU-bound Python, so large runs are split into ranges
+of pages that worker processes render with their own cached SlipRenderer. Each
+worker returns its range already serialized (SlipRenderer.render_fragment), and
+the fragments are written into word/document.xml in page order while the
+package is saved. The parent never parses page XML, and the document parts are
+byte-for-byte what a serial render writes, however the pages were divided.
+
+Set `render_workers` in the [SETTINGS] section of config.ini to enable it; 1
+(the default) renders on the calling thread.
+"""
+
+import io
+import logging
+import threading
+import zipfile
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from docx.oxml.ns import qn
+from lxml import etree
+
+from . import template_cache
+
+logger = logging.getLogger(__name__)
+
+# Constants
+DEFAULT_WORKERS = 1  # Serial rendering
+PAGES_PER_TASK = 50  # Pages rendered by one worker call
+MIN_PARALLEL_PAGES = 200  # Smaller runs are faster without the pool round trip
+
+PAGES_MARKER = "slip-pages"
+
+_lock = threading.Lock()
+_pool = None
+_pool_workers = 0
+
+
+def workers_from_config(config):
+    """Configured render worker count, never below 1"""
+    try:
+        workers = config['SETTINGS'].getint('render_workers', fallback=DEFAULT_WORKERS)
+    except (KeyError, ValueError):
+        workers = DEFAULT_WORKERS
+    return max(1, workers)
+
+
+def _get_pool(workers):
+    """Return the shared pool, recreating it when the worker count changes.
+
+    Created under _lock, so concurrent first renders share one pool.
+    """
+    global _pool, _pool_workers
+    with _lock:
+        if _pool is None or _pool_workers != workers:
+            if _pool is not None:
+                _pool.shutdown(wait=False)
+            # Never fork: the pool is started from request and batch threads, and a
+            # forked child can inherit locks (logging, template cache) held by them
+            _pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+            _pool_workers = workers
+            logger.info(f"Started slip render pool with {workers} workers")
+        return _pool
+
+
+def _reset_pool():
+    global _pool, _pool_workers
+    with _lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False)
+        _pool = None
+        _pool_workers = 0
+
+
+def _render_fragment(template_path, contexts, first_page, total, page_breaks):
+    """Worker: serialize one range of pages"""
+    renderer = template_cache.get_renderer(template_path)
+    return renderer.render_fragment(contexts, first_page, total, page_breaks)
+
+
+def _write_stitched(doc, path, fragments):
+    """Save doc to path with the fragments written in place of the pages marker"""
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    body_part = doc.part.partname.lstrip('/')
+    marker = etree.tostring(etree.Comment(PAGES_MARKER))
+
+    with zipfile.ZipFile(buffer) as source, zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as package:
+        for info in source.infolist():
+            if info.filename != body_part:
+                package.writestr(info, source.read(info))
+                continue
+            head, tail = source.read(info).split(marker)
+            with package.open(info, 'w') as out:
+                out.write(head)
+                for data in fragments:
+                    out.write(data)
+                out.write(tail)
+
+
+def render_to_file(template_path, contexts, path, workers=DEFAULT_WORKERS, prepare=None,
+                   progress_callback=None, page_breaks=True):
+    """Render one page per context and save the document to path.
+
+    prepare(doc) runs on the Document just before it is written, for footers
+    and validation. In parallel mode that Document holds only the first page;
+    the rest are added while it is written.
+    """
+    renderer = template_cache.get_renderer(template_path)
+    contexts = list(contexts)
+    total = len(contexts)
+
+    if workers > 1 and total >= MIN_PARALLEL_PAGES:
+        try:
+            _render_parallel(renderer, contexts, path, workers, prepare, progress_callback, page_breaks)
+            return
+        except BrokenProcessPool as e:
+            logger.warning(f"Slip render pool failed ({e}); rendering serially")
+            _reset_pool()
+
+    doc = renderer.render(contexts, progress_callback, page_breaks)
+    if prepare:
+        prepare(doc)
+    doc.save(path)
+
+
+def _render_parallel(renderer, contexts, path, workers, prepare, progress_callback, page_breaks):
+    total = len(contexts)
+    pool = _get_pool(workers)
+    # Workers look the template up by the same path the parent compiled
+    futures = [
+        (start, pool.submit(_render_fragment, renderer.template_path,
+                            contexts[start:start + PAGES_PER_TASK], start, total, page_breaks))
+        for start in range(1, total, PAGES_PER_TASK)
+    ]
+    logger.info(f"Rendering {total} pages in {len(futures) + 1} ranges on {workers} workers")
+
+    # The first page is rendered here so prepare() sees real content
+    doc = renderer.render(contexts[:1], page_breaks=page_breaks, total=total)
+    body = doc.element.body
+    sectPr = body.find(qn('w:sectPr'))
+    if sectPr is not None:
+        sectPr.addprevious(etree.Comment(PAGES_MARKER))
+    else:
+        body.append(etree.Comment(PAGES_MARKER))
+    if progress_callback:
+        progress_callback(1, total)
+    if prepare:
+        prepare(doc)
+
+    def fragments():
+        for start, future in futures:
+            yield future.result()
+            if progress_callback:
+                progress_callback(min(start + PAGES_PER_TASK, total), total)
+
+    _write_stitched(doc, path, fragments())
@@ -0,0 +1,54 @@
+"""
+Owner-only storage directories for data the app reads back and trusts.
+
+Stored datasets and cached responses used to live under fixed names in the
+shared temp directory, where any local user could create the directory first
+and plant files in it. These directories live under the app's data directory
+instead (INVENTORY_SLIPS_DATA_DIR, or ~/.inventory_slips), are created 0700,
+and are refused unless they belong to the current user and nobody else can
+open them.
+"""
+
+import os
+import stat
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Constants
+DATA_DIR_ENV = "INVENTORY_SLIPS_DATA_DIR"
+DEFAULT_DATA_DIR = os.path.join(os.path.expanduser("~"), ".inventory_slips")
+DIR_MODE = 0o700
+
+
+def data_dir() -> str:
+    """Base directory for the app's private storage"""
+    return os.environ.get(DATA_DIR_ENV) or DEFAULT_DATA_DIR
+
+
+def check_private(path: str, mask: int = 0o077) -> None:
+    """Raise PermissionError unless path is a real directory owned by us with none of `mask` set"""
+    info = os.lstat(path)
+    if not stat.S_ISDIR(info.st_mode):
+        raise PermissionError(f"{path} is not a directory")
+    # Ownership and mode bits mean nothing on Windows; the profile directory is already private there
+    if hasattr(os, "getuid"):
+        if info.st_uid != os.getuid():
+            raise PermissionError(f"{path} is owned by uid {info.st_uid}, not the current user")
+        if info.st_mode & mask:
+            raise PermissionError(f"{path} is accessible to other users (mode {stat.S_IMODE(info.st_mode):o})")
+
+
+def private_dir(name: str) -> str:
+    """Create (if needed) and verify the private directory `name` under data_dir()"""
+    base = data_dir()
+    os.makedirs(base, DIR_MODE, exist_ok=True)
+    # The base may be a shared data directory, but others must not be able to swap its entries
+    check_private(base, mask=0o022)
+    path = os.path.join(base, name)
+    try:
+        os.mkdir(path, DIR_MODE)
+    except FileExistsError:
+        pass
+    check_private(path)
+    return path
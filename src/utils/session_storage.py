@@ -1,24 +1,47 @@
 """
 Utility functions for storing large data outside of session cookies.
-Uses temporary files with compression for efficient storage.
+Uses files with compression for efficient storage, in an owner-only directory
+under the app's data directory (see private_dir): datasets are unpickled when
+read, so nobody else may be able to write there.
+
+Loaded datasets (DataFrames) are written once as a binary pickle of their
+column blocks, next to a small JSON metadata file; the session only keeps the
+dataset id. Datasets are immutable once stored, so the id doubles as a version
+and recently used datasets are kept in an in-process LRU within a memory budget.
+Large uploads are appended chunk by chunk with DatasetWriter and read back as
+one DataFrame.
 """
 
 import os
 import json
 import zlib
 import base64
-import tempfile
+import pickle
 import logging
 import uuid
+import time
+import threading
+from collections import OrderedDict
 from typing import Optional, Any, Dict
 from datetime import datetime, timedelta
 
+from .private_dir import private_dir
+
 logger = logging.getLogger(__name__)
 
 # Constants
 MAX_AGE_HOURS = 24  # Files older than this will be cleaned up
-TEMP_DIR = os.path.join(tempfile.gettempdir(), "inventory_slips_data")
-os.makedirs(TEMP_DIR, exist_ok=True)
+TEMP_DIR = private_dir("datasets")
+
+DATASET_SUFFIX = ".dataset"
+META_SUFFIX = ".meta.json"
+CHUNKED_MARKER = "inventory_slips.chunked_dataset.v1"  # First object of a chunked dataset file
+MAX_CACHE_MB = 256  # Memory budget for datasets kept in memory per process
+
+_cache_lock = threading.Lock()
+_cache: "OrderedDict[str, tuple]" = OrderedDict()  # dataset_id -> (data, bytes)
+_cache_bytes = 0
+_cache_stats = {'hits': 0, 'misses': 0, 'evictions': 0}
 
 def _get_temp_filepath(key: str, session_id: str) -> str:
     """Get the temporary file path for a given key and session."""
@@ -66,3 +89,202 @@ def remove_data(filepath: str) -> None:
         os.remove(os.path.join(TEMP_DIR, filepath))
     except Exception as e:
         logger.warning(f"Could not remove temp file {filepath}: {e}")
+
+def _dataset_path(dataset_id: str, suffix: str) -> Optional[str]:
+    """Path for a dataset file, or None if the id is not one we issued."""
+    if not dataset_id or not dataset_id.isalnum():
+        return None
+    return os.path.join(TEMP_DIR, dataset_id + suffix)
+
+def _estimate_bytes(data: Any, path: str) -> int:
+    """Approximate in-memory size of a dataset."""
+    try:
+        if hasattr(data, "memory_usage"):
+            return int(data.memory_usage(deep=True).sum())
+    except Exception:
+        pass
+    return os.path.getsize(path)
+
+def _cache_put(dataset_id: str, data: Any, size: int) -> None:
+    """Add a dataset to the LRU, evicting the least recently used over budget."""
+    global _cache_bytes
+    budget = MAX_CACHE_MB * 1024 * 1024
+    if size > budget:
+        return
+    with _cache_lock:
+        if dataset_id in _cache:
+            _cache_bytes -= _cache.pop(dataset_id)[1]
+        _cache[dataset_id] = (data, size)
+        _cache_bytes += size
+        while _cache_bytes > budget:
+            _, (_, evicted_size) = _cache.popitem(last=False)
+            _cache_bytes -= evicted_size
+            _cache_stats['evictions'] += 1
+
+def _cache_drop(dataset_id: str) -> None:
+    global _cache_bytes
+    with _cache_lock:
+        entry = _cache.pop(dataset_id, None)
+        if entry is not None:
+            _cache_bytes -= entry[1]
+
+def cache_stats() -> Dict[str, int]:
+    """Return hit/miss/eviction counters and the memory held by the dataset LRU."""
+    with _cache_lock:
+        stats = dict(_cache_stats)
+        stats['entries'] = len(_cache)
+        stats['bytes'] = _cache_bytes
+        stats['max_bytes'] = MAX_CACHE_MB * 1024 * 1024
+    return stats
+
+def store_dataset(data: Any, **metadata: Any) -> Optional[str]:
+    """Store a DataFrame (or any picklable value) and return its dataset id.
+
+    Nothing is truncated; the whole dataset is written in one binary file.
+    """
+    try:
+        dataset_id = uuid.uuid4().hex
+        path = _dataset_path(dataset_id, DATASET_SUFFIX)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+
+        meta = {}
+        if hasattr(data, "columns") and hasattr(data, "__len__"):
+            meta["rows"] = len(data)
+            meta["columns"] = [str(c) for c in data.columns]
+        meta.update(metadata)
+        _write_meta(dataset_id, path, meta)
+        # The upload is usually viewed right away; keep it warm
+        _cache_put(dataset_id, data, _estimate_bytes(data, path))
+        return dataset_id
+    except Exception as e:
+        logger.error(f"Error storing dataset: {str(e)}")
+        return None
+
+def _write_meta(dataset_id: str, path: str, meta: Dict[str, Any]) -> None:
+    meta = dict(meta, dataset_id=dataset_id, created_at=time.time(), bytes=os.path.getsize(path))
+    with open(_dataset_path(dataset_id, META_SUFFIX), "w") as f:
+        json.dump(meta, f)
+
+class DatasetWriter:
+    """Builds a dataset from DataFrame chunks without holding them all in memory.
+
+    Each appended chunk is pickled straight to disk; commit() publishes the
+    dataset under a new id and abort() (or an exception inside a with block)
+    discards it.
+    """
+
+    def __init__(self, **metadata: Any):
+        self.dataset_id = uuid.uuid4().hex
+        self.rows = 0
+        self.columns = None
+        self._metadata = metadata
+        self._path = _dataset_path(self.dataset_id, DATASET_SUFFIX)
+        self._tmp_path = self._path + ".tmp"
+        self._file = open(self._tmp_path, "wb")
+        pickle.dump(CHUNKED_MARKER, self._file, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def append(self, chunk) -> None:
+        if self.columns is None:
+            self.columns = [str(c) for c in chunk.columns]
+        pickle.dump(chunk, self._file, protocol=pickle.HIGHEST_PROTOCOL)
+        self.rows += len(chunk)
+
+    def commit(self) -> str:
+        self._file.close()
+        os.replace(self._tmp_path, self._path)
+        _write_meta(self.dataset_id, self._path, dict(self._metadata, rows=self.rows, columns=self.columns or []))
+        return self.dataset_id
+
+    def abort(self) -> None:
+        self._file.close()
+        try:
+            os.remove(self._tmp_path)
+        except FileNotFoundError:
+            pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.abort()
+        return False
+
+def _read_dataset_file(path: str) -> Any:
+    """Unpickle a dataset file, concatenating the chunks of a chunked one."""
+    with open(path, "rb") as f:
+        data = pickle.load(f)
+        if not (isinstance(data, str) and data == CHUNKED_MARKER):
+            return data
+        chunks = []
+        while True:
+            try:
+                chunks.append(pickle.load(f))
+            except EOFError:
+                break
+    import pandas as pd
+    if not chunks:
+        return pd.DataFrame()
+    return pd.concat(chunks, ignore_index=True) if len(chunks) > 1 else chunks[0]
+
+def load_dataset(dataset_id: str) -> Optional[Any]:
+    """Load a dataset written by store_dataset, from memory when cached.
+
+    Cached datasets are shared between requests; callers must not modify them
+    in place (take a .copy() first).
+    """
+    path = _dataset_path(dataset_id, DATASET_SUFFIX)
+    if path is None:
+        return None
+    with _cache_lock:
+        entry = _cache.get(dataset_id)
+        if entry is not None:
+            _cache.move_to_end(dataset_id)
+            _cache_stats['hits'] += 1
+            return entry[0]
+        _cache_stats['misses'] += 1
+    try:
+        data = _read_dataset_file(path)
+        _cache_put(dataset_id, data, _estimate_bytes(data, path))
+        return data
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.error(f"Error reading dataset {dataset_id}: {str(e)}")
+        return None
+
+def dataset_exists(dataset_id: str) -> bool:
+    """Check that a dataset file is present without reading it."""
+    path = _dataset_path(dataset_id, DATASET_SUFFIX)
+    return path is not None and os.path.isfile(path)
+
+def dataset_info(dataset_id: str) -> Optional[Dict[str, Any]]:
+    """Return the metadata of a stored dataset without loading the data."""
+    path = _dataset_path(dataset_id, META_SUFFIX)
+    if path is None:
+        return None
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.error(f"Error reading dataset metadata {dataset_id}: {str(e)}")
+        return None
+
+def remove_dataset(dataset_id: str) -> None:
+    """Remove a stored dataset and its metadata."""
+    _cache_drop(dataset_id)
+    for suffix in (DATASET_SUFFIX, META_SUFFIX):
+        path = _dataset_path(dataset_id, suffix)
+        if path is None:
+            return
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"Could not remove dataset file {path}: {e}")
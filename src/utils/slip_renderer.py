@@ -0,0 +1,322 @@
+"""
+SlipRenderer - Renders every inventory slip page into a single document tree.
+
+The template is parsed once; its body (the label table plus trailing paragraph)
+is kept as a prototype that is deep-copied per page and filled in place, so the
+package is only serialized once no matter how many pages are generated.
+
+Table cell text is sized by length as it is rendered. Paragraphs without
+placeholders are sized once on the prototype; for the others the template
+records their text as fixed segments and placeholder slots, so a page only
+needs the rendered values to pick each paragraph's size.
+"""
+import copy
+import logging
+import re
+from io import BytesIO
+
+from docx import Document
+from docx.oxml import OxmlElement, parse_xml
+from docx.oxml.ns import qn
+from docx.shared import Pt
+from docxtpl import DocxTemplate
+from lxml import etree
+
+logger = logging.getLogger(__name__)
+
+PLACEHOLDER_RE = re.compile(r"\{\{\s*([\w.]+)\s*\}\}")
+
+W_T = qn('w:t')
+W_P = qn('w:p')
+W_TBL = qn('w:tbl')
+W_TR = qn('w:tr')
+W_TC = qn('w:tc')
+W_SECTPR = qn('w:sectPr')
+W_BODY = qn('w:body')
+W_RPR = qn('w:rPr')
+XML_SPACE = '{http://www.w3.org/XML/1998/namespace}space'
+DOCPR_TAG = '{http://schemas.openxmlformats.org/drawingml/2006/wordprocessingDrawing}docPr'
+
+# Table cell paragraphs are sized by their stripped text length:
+# <=30 chars 12pt, <=45 10pt, <=60 8pt, longer 7pt
+FONT_SIZE_THRESHOLDS = ((30, 12), (45, 10), (60, 8))
+LONG_TEXT_FONT_SIZE = 7
+
+# Run content that contributes to paragraph text, as python-docx reads it
+RUN_TEXT_XPATH = "w:br | w:cr | w:noBreakHyphen | w:ptab | w:t | w:tab"
+W_BR = qn('w:br')
+W_CR = qn('w:cr')
+W_NOBREAKHYPHEN = qn('w:noBreakHyphen')
+W_TYPE = qn('w:type')
+
+
+def font_size_for(text_len):
+    """Point size for table cell text of the given length"""
+    for limit, size in FONT_SIZE_THRESHOLDS:
+        if text_len <= limit:
+            return size
+    return LONG_TEXT_FONT_SIZE
+
+
+def _node_text(node):
+    """Text a run content node contributes to paragraph.text"""
+    if node.tag == W_T:
+        return node.text or ""
+    if node.tag == W_BR:
+        return "\n" if node.get(W_TYPE, "textWrapping") == "textWrapping" else ""
+    if node.tag == W_CR:
+        return "\n"
+    if node.tag == W_NOBREAKHYPHEN:
+        return "-"
+    return "\t"
+
+
+def _set_font_size(paragraph, size):
+    """Set the size of every run directly in a paragraph"""
+    for run in paragraph.r_lst:
+        run.get_or_add_rPr().sz_val = Pt(size)
+
+
+def _resolve(context, path):
+    """Resolve a dotted placeholder path (e.g. Label1.ProductName) against the context"""
+    value = context
+    for part in path.split('.'):
+        if isinstance(value, dict):
+            value = value.get(part)
+        else:
+            value = getattr(value, part, None)
+        if value is None:
+            return ""
+    return str(value)
+
+
+class SlipRenderer:
+    def __init__(self, template_path):
+        """Parse the template once and locate its placeholders"""
+        self.template_path = template_path
+        with open(template_path, 'rb') as f:
+            self._blob = f.read()
+
+        doc = Document(BytesIO(self._blob))
+        # docxtpl rebuilds table grids while rendering (fix_tables); do the same
+        # once here so the output matches the per-page DocxTemplate documents.
+        fixed = DocxTemplate.fix_tables(None, etree.tostring(doc.element.body))
+        body = parse_xml(etree.tostring(fixed))
+        self._prototype = [el for el in body if el.tag != W_SECTPR]
+        for element in self._prototype:
+            self._merge_split_placeholders(element)
+        self._slots = self._find_placeholders(self._prototype)
+        self._size_plan = self._plan_font_sizes(self._prototype, self._slots)
+        self._docprs_per_page = sum(1 for el in self._prototype for _ in el.iter(DOCPR_TAG))
+        self._root_nsmap = doc.element.nsmap
+        logger.info(f"Compiled slip template {template_path}: {len(self._slots)} placeholder runs, "
+                    f"{len(self._size_plan)} table paragraphs sized per page")
+
+    @staticmethod
+    def _merge_split_placeholders(element):
+        """Join placeholders that Word split across several runs into the first run.
+
+        Mirrors docxtpl's patch_xml: everything between the opening {{ and the
+        closing }} is pulled into the text node holding {{ and the emptied runs
+        are dropped.
+        """
+        for paragraph in element.iter(W_P):
+            texts = list(paragraph.iter(W_T))
+            i = 0
+            while i < len(texts):
+                head = texts[i]
+                text = head.text or ""
+                if text.rfind("{{") <= text.rfind("}}"):
+                    i += 1
+                    continue
+                j = i + 1
+                while j < len(texts) and "}}" not in (texts[j].text or ""):
+                    j += 1
+                if j == len(texts):
+                    break
+                for tail in texts[i + 1:j + 1]:
+                    text += tail.text or ""
+                    run = tail.getparent()
+                    run.remove(tail)
+                    if run is not head.getparent() and all(child.tag == W_RPR for child in run):
+                        run.getparent().remove(run)
+                head.text = text
+                i = j + 1
+
+    @staticmethod
+    def _find_placeholders(elements):
+        """Return (element index, text node index, text) for each text node with a placeholder"""
+        slots = []
+        for el_idx, element in enumerate(elements):
+            for t_idx, t in enumerate(element.iter(W_T)):
+                if t.text and PLACEHOLDER_RE.search(t.text):
+                    slots.append((el_idx, t_idx, t.text))
+        return slots
+
+    @staticmethod
+    def _cell_paragraphs(elements):
+        """(element index, paragraph position, paragraph) for each paragraph of a top-level table cell.
+
+        Matches doc.tables -> row.cells -> cell.paragraphs: nested tables are
+        not included and vertically merged continuation cells are skipped.
+        """
+        for el_idx, element in enumerate(elements):
+            if element.tag != W_TBL:
+                continue
+            # Keep the proxies alive so their ids stay unique while looked up
+            paragraphs = list(element.iter(W_P))
+            positions = {id(p): i for i, p in enumerate(paragraphs)}
+            for tr in element.iterchildren(W_TR):
+                for tc in tr.iterchildren(W_TC):
+                    if tc.vMerge == "continue":
+                        continue
+                    for paragraph in tc.iterchildren(W_P):
+                        yield el_idx, positions[id(paragraph)], paragraph
+
+    @classmethod
+    def _plan_font_sizes(cls, elements, slots):
+        """Size fixed table paragraphs now; return the plan for paragraphs with placeholders.
+
+        Each plan entry is (element index, paragraph position, segments) where a
+        segment is fixed text or the index of a placeholder slot.
+        """
+        texts = [list(element.iter(W_T)) for element in elements]
+        slot_of = {id(texts[el_idx][t_idx]): i for i, (el_idx, t_idx, _) in enumerate(slots)}
+
+        plan = []
+        for el_idx, position, paragraph in cls._cell_paragraphs(elements):
+            segments = []
+            for run in paragraph.xpath("w:r | w:hyperlink/w:r"):
+                for node in run.xpath(RUN_TEXT_XPATH):
+                    slot = slot_of.get(id(node))
+                    if slot is not None:
+                        segments.append(slot)
+                    elif segments and isinstance(segments[-1], str):
+                        segments[-1] += _node_text(node)
+                    else:
+                        segments.append(_node_text(node))
+            if any(isinstance(segment, int) for segment in segments):
+                plan.append((el_idx, position, segments))
+            else:
+                text = "".join(segments).strip()
+                if text:
+                    _set_font_size(paragraph, font_size_for(len(text)))
+        return plan
+
+    @staticmethod
+    def _set_text(t, value):
+        """Write rendered text, turning tabs and newlines into w:tab / w:br like docxtpl"""
+        t.set(XML_SPACE, 'preserve')
+        if '\n' not in value and '\t' not in value:
+            t.text = value
+            return
+        parts = re.split(r'([\n\t])', value)
+        t.text = parts[0]
+        anchor = t
+        for part in parts[1:]:
+            if part == '\n':
+                node = OxmlElement('w:br')
+            elif part == '\t':
+                node = OxmlElement('w:tab')
+            else:
+                node = OxmlElement('w:t')
+                node.set(XML_SPACE, 'preserve')
+                node.text = part
+            anchor.addnext(node)
+            anchor = node
+
+    def new_document(self):
+        """Return a fresh Document built from the template with an empty body"""
+        doc = Document(BytesIO(self._blob))
+        body = doc.element.body
+        for element in list(body):
+            if element.tag != W_SECTPR:
+                body.remove(element)
+        return doc
+
+    def render_page(self, context):
+        """Return a filled copy of the template body for one page, with table text sized"""
+        elements = [copy.deepcopy(el) for el in self._prototype]
+        texts = {}
+        values = []
+        for el_idx, t_idx, source in self._slots:
+            if el_idx not in texts:
+                texts[el_idx] = list(elements[el_idx].iter(W_T))
+            rendered = PLACEHOLDER_RE.sub(lambda m: _resolve(context, m.group(1)), source)
+            self._set_text(texts[el_idx][t_idx], rendered)
+            values.append(rendered)
+
+        paragraphs = {}
+        for el_idx, position, segments in self._size_plan:
+            text = "".join(values[s] if isinstance(s, int) else s for s in segments).strip()
+            if not text:
+                continue
+            if el_idx not in paragraphs:
+                paragraphs[el_idx] = list(elements[el_idx].iter(W_P))
+            _set_font_size(paragraphs[el_idx][position], font_size_for(len(text)))
+        return elements
+
+    def _finish_page(self, elements, page_idx, total, page_breaks):
+        """Number a rendered page's drawings and add the break that ends it.
+
+        Drawing ids run on across pages, as Composer did on append. With
+        page_breaks, every page but the last ends with a break run on its last
+        top-level paragraph, the way the Composer-based merge separated pages.
+        """
+        docpr_id = page_idx * self._docprs_per_page
+        for element in elements:
+            for docpr in element.iter(DOCPR_TAG):
+                docpr_id += 1
+                docpr.set('id', str(docpr_id))
+
+        if page_breaks and page_idx < total - 1:
+            paragraphs = [element for element in elements if element.tag == W_P]
+            if paragraphs:
+                run = OxmlElement('w:r')
+                run.append(OxmlElement('w:br'))
+                paragraphs[-1].append(run)
+
+    def render(self, contexts, progress_callback=None, page_breaks=True, total=None):
+        """Render one page per context into a single Document.
+
+        total is the page count of the whole run when contexts are only its
+        first pages (the rest are joined later from render_fragment output).
+        """
+        doc = self.new_document()
+        body = doc.element.body
+        sectPr = body.find(W_SECTPR)
+        contexts = list(contexts)
+        if total is None:
+            total = len(contexts)
+
+        for page_idx, context in enumerate(contexts):
+            elements = self.render_page(context)
+            self._finish_page(elements, page_idx, total, page_breaks)
+            for element in elements:
+                if sectPr is not None:
+                    sectPr.addprevious(element)
+                else:
+                    body.append(element)
+
+            if progress_callback:
+                progress_callback(page_idx + 1, total)
+
+        return doc
+
+    def render_fragment(self, contexts, first_page, total, page_breaks=True):
+        """Serialize pages first_page.. of a total-page run as they appear inside the body.
+
+        The bytes are exactly what render() would write for those pages, so
+        fragments rendered separately can be joined in page order.
+        """
+        # Under a root declaring the document's namespaces, the pages serialize
+        # without declarations of their own, as they do inside the real body
+        wrapper = etree.Element(W_BODY, nsmap=self._root_nsmap)
+        for offset, context in enumerate(contexts):
+            elements = self.render_page(context)
+            self._finish_page(elements, first_page + offset, total, page_breaks)
+            wrapper.extend(elements)
+        if not len(wrapper):
+            return b''
+        data = etree.tostring(wrapper, encoding='UTF-8', xml_declaration=False)
+        return data[data.index(b'>') + 1:data.rindex(b'</')]
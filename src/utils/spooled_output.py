@@ -0,0 +1,137 @@
+"""
+Generated documents that never touch output_dir.
+
+With `keep_output_files = false` in the [SETTINGS] section of config.ini the
+web generators write into a SpooledOutput instead of the output cache: the
+package stays in memory up to SPOOL_MAX_MB and only spills to an anonymous
+temporary file above that, which the OS removes once it is closed. The HTTP
+response then streams the bytes straight from the buffer.
+
+Background jobs write a shared output instead: a file in an owner-only
+directory (see private_dir) that is described in the job state, so whichever
+worker process answers the download can stream it. It is removed once it has
+been streamed, or when the job expires.
+"""
+
+import os
+import time
+import logging
+import tempfile
+import threading
+
+from .private_dir import private_dir
+
+logger = logging.getLogger(__name__)
+
+# Constants
+SPOOL_MAX_MB = 16  # Documents larger than this spill from memory to a temporary file
+CHUNK_SIZE = 64 * 1024  # Bytes per chunk when streaming a response
+DOCX_MIMETYPE = 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'
+ZIP_MIMETYPE = 'application/zip'
+SHARED_DIRNAME = "spool"  # Job results any worker process may stream
+SHARED_MAX_AGE_HOURS = 24  # Shared outputs never downloaded are removed after this long
+
+
+def keep_output_files(config):
+    """Whether generated documents are saved to output_dir (the default) or only spooled"""
+    return config['SETTINGS'].getboolean('keep_output_files', fallback=True)
+
+
+def spool_limit(config):
+    """Configured spill threshold in bytes"""
+    return int(config['SETTINGS'].getfloat('spool_max_mb', fallback=SPOOL_MAX_MB) * 1024 * 1024)
+
+
+def shared_dir():
+    return private_dir(SHARED_DIRNAME)
+
+
+def cleanup_shared(max_age_hours=SHARED_MAX_AGE_HOURS):
+    """Remove shared outputs left behind by jobs whose process went away"""
+    folder = shared_dir()
+    cutoff = time.time() - max_age_hours * 3600
+    for name in os.listdir(folder):
+        path = os.path.join(folder, name)
+        try:
+            if os.path.getmtime(path) < cutoff:
+                os.remove(path)
+        except OSError as e:
+            logger.warning(f"Could not remove shared output {path}: {e}")
+
+
+class SpooledOutput:
+    def __init__(self, filename, max_size=SPOOL_MAX_MB * 1024 * 1024, mimetype=DOCX_MIMETYPE, shared=False):
+        """A named, seekable buffer a generator can save a document into.
+
+        A shared output is a file in shared_dir() that other processes can
+        reopen from to_state(); it is deleted when closed.
+        """
+        self.filename = filename
+        self.mimetype = mimetype
+        self.path = None
+        suffix = os.path.splitext(filename)[1]
+        if shared:
+            fd, self.path = tempfile.mkstemp(suffix=suffix, dir=shared_dir())
+            self.file = os.fdopen(fd, 'w+b')
+        else:
+            self.file = tempfile.SpooledTemporaryFile(max_size=max_size, suffix=suffix)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_state(cls, state):
+        """Reopen a shared output described by to_state(), or None if it is gone"""
+        path = os.path.realpath(str(state.get('path') or ''))
+        if os.path.dirname(path) != os.path.realpath(shared_dir()):
+            return None
+        try:
+            file = open(path, 'rb')
+        except OSError:
+            return None
+        output = cls.__new__(cls)
+        output.filename = os.path.basename(str(state.get('filename') or 'InventorySlips.docx'))
+        output.mimetype = ZIP_MIMETYPE if state.get('mimetype') == ZIP_MIMETYPE else DOCX_MIMETYPE
+        output.path = path
+        output.file = file
+        output._lock = threading.Lock()
+        return output
+
+    def to_state(self):
+        """JSON-safe description another process can reopen, or None for an in-memory output"""
+        if self.path is None:
+            return None
+        return {'path': self.path, 'filename': self.filename, 'mimetype': self.mimetype}
+
+    @property
+    def available(self):
+        """Whether the document can still be streamed"""
+        return not self.file.closed and (self.path is None or os.path.exists(self.path))
+
+    def __repr__(self):
+        return f"<SpooledOutput {self.filename}>"
+
+    @property
+    def size(self):
+        with self._lock:
+            self.file.seek(0, 2)
+            return self.file.tell()
+
+    def iter_chunks(self, chunk_size=CHUNK_SIZE):
+        """Yield the document from the start; several readers may stream at once"""
+        offset = 0
+        while True:
+            with self._lock:
+                self.file.seek(offset)
+                chunk = self.file.read(chunk_size)
+            if not chunk:
+                return
+            offset += len(chunk)
+            yield chunk
+
+    def close(self):
+        with self._lock:
+            self.file.close()
+        if self.path is not None:
+            try:
+                os.remove(self.path)
+            except FileNotFoundError:
+                pass
@@ -0,0 +1,84 @@
+"""
+Process-level cache of compiled slip templates.
+
+Each entry is a SlipRenderer (template parsed, placeholders located) keyed by
+the template path plus the file's mtime and size, so an edited or replaced
+template is picked up automatically. Least recently used entries are evicted
+once MAX_TEMPLATES is reached.
+"""
+
+import os
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from .slip_renderer import SlipRenderer
+
+logger = logging.getLogger(__name__)
+
+# Constants
+MAX_TEMPLATES = 8
+
+_lock = threading.Lock()
+_renderers: "OrderedDict[tuple, SlipRenderer]" = OrderedDict()
+_stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'invalidations': 0}
+
+
+def _cache_key(template_path: str) -> tuple:
+    """Build the (path, mtime, size) key for a template file."""
+    path = os.path.abspath(template_path)
+    stat = os.stat(path)
+    return path, stat.st_mtime_ns, stat.st_size
+
+
+def get_renderer(template_path: str) -> SlipRenderer:
+    """Return a compiled renderer for the template, compiling it on a miss."""
+    key = _cache_key(template_path)
+    with _lock:
+        renderer = _renderers.get(key)
+        if renderer is not None:
+            _renderers.move_to_end(key)
+            _stats['hits'] += 1
+            return renderer
+        _stats['misses'] += 1
+
+    # Compile outside the lock so a slow parse does not block cache hits
+    renderer = SlipRenderer(key[0])
+
+    with _lock:
+        # Drop stale versions of the same file before inserting the new one
+        for stale in [k for k in _renderers if k[0] == key[0] and k != key]:
+            del _renderers[stale]
+        _renderers[key] = renderer
+        _renderers.move_to_end(key)
+        while len(_renderers) > MAX_TEMPLATES:
+            evicted, _ = _renderers.popitem(last=False)
+            _stats['evictions'] += 1
+            logger.info(f"Evicted compiled template {evicted[0]}")
+    return renderer
+
+
+def invalidate(template_path: Optional[str] = None) -> None:
+    """Forget compiled templates for one path, or all of them when no path is given."""
+    with _lock:
+        if template_path is None:
+            removed = len(_renderers)
+            _renderers.clear()
+        else:
+            path = os.path.abspath(template_path)
+            stale = [k for k in _renderers if k[0] == path]
+            for key in stale:
+                del _renderers[key]
+            removed = len(stale)
+        _stats['invalidations'] += removed
+    logger.info(f"Invalidated {removed} compiled template(s)")
+
+
+def cache_stats() -> Dict[str, int]:
+    """Return hit/miss/eviction counters and the current cache size."""
+    with _lock:
+        stats = dict(_stats)
+        stats['size'] = len(_renderers)
+        stats['max_size'] = MAX_TEMPLATES
+    return stats
@@ -0,0 +1,76 @@
+"""
+Progress of long-running uploads, shared across worker processes.
+
+Each upload gets a small JSON file in an owner-only directory under the app's
+data directory (see private_dir), keyed by an id the browser chooses when it
+submits the form. The worker ingesting the upload updates it after every chunk
+and any worker can answer the page's polls.
+"""
+
+import os
+import json
+import time
+import logging
+from typing import Any, Dict, Optional
+
+from .private_dir import private_dir
+
+logger = logging.getLogger(__name__)
+
+# Constants
+PROGRESS_DIR = private_dir("upload_progress")
+MAX_AGE_HOURS = 6  # Progress files older than this are removed
+MAX_ID_LENGTH = 64
+
+
+def valid_id(upload_id: Optional[str]) -> bool:
+    """Upload ids are short alphanumeric strings, so they are safe as file names."""
+    return bool(upload_id) and len(upload_id) <= MAX_ID_LENGTH and upload_id.isalnum()
+
+
+def _progress_path(upload_id: str) -> str:
+    return os.path.join(PROGRESS_DIR, f"{upload_id}.json")
+
+
+def update(upload_id: Optional[str], **fields: Any) -> None:
+    """Merge fields into an upload's progress; ignored for missing or invalid ids."""
+    if not valid_id(upload_id):
+        return
+    progress = get(upload_id) or {'started_at': time.time()}
+    progress.update(fields, updated_at=time.time())
+    path = _progress_path(upload_id)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, 'w') as f:
+            json.dump(progress, f)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.warning(f"Could not record progress for upload {upload_id}: {e}")
+
+
+def get(upload_id: Optional[str]) -> Optional[Dict[str, Any]]:
+    """Latest progress of an upload, or None if unknown."""
+    if not valid_id(upload_id):
+        return None
+    try:
+        with open(_progress_path(upload_id)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def cleanup(max_age_hours: float = MAX_AGE_HOURS) -> int:
+    """Remove progress files of uploads that finished or stalled long ago."""
+    if not os.path.isdir(PROGRESS_DIR):
+        return 0
+    cutoff = time.time() - max_age_hours * 3600
+    removed = 0
+    for name in os.listdir(PROGRESS_DIR):
+        path = os.path.join(PROGRESS_DIR, name)
+        try:
+            if os.path.getmtime(path) < cutoff:
+                os.remove(path)
+                removed += 1
+        except OSError:
+            continue
+    return removed
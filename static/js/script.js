@@ -79,4 +79,36 @@ function processJsonData() {
     .catch(error => {
         alert('Error processing data: ' + error.message);
     });
-}
\ No newline at end of file
+}
+// Row-count progress for CSV upload forms marked with data-upload-progress
+document.addEventListener('submit', function(event) {
+    const form = event.target;
+    if (!form.hasAttribute || !form.hasAttribute('data-upload-progress')) return;
+
+    const uploadId = Date.now().toString(36) + Math.random().toString(36).slice(2);
+    form.querySelector('input[name="upload_id"]').value = uploadId;
+    const status = form.querySelector('.upload-progress');
+
+    function poll() {
+        fetch('/upload-progress/' + uploadId)
+            .then(response => response.ok ? response.json() : null)
+            .then(progress => {
+                if (progress && status) {
+                    if (progress.status === 'error') {
+                        status.textContent = 'Upload failed: ' + progress.message;
+                        return;
+                    }
+                    let text = progress.rows.toLocaleString() + ' rows processed';
+                    if (progress.total_bytes) {
+                        text += ' (' + Math.min(100, Math.round(100 * progress.bytes_read / progress.total_bytes)) + '% of file)';
+                    }
+                    status.textContent = text;
+                    if (progress.status === 'done') return;
+                }
+                setTimeout(poll, 1000);
+            })
+            .catch(() => setTimeout(poll, 2000));
+    }
+    if (status) status.textContent = 'Uploading...';
+    setTimeout(poll, 1000);
+});
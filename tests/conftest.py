@@ -0,0 +1,13 @@
+"""
+Shared pytest setup: import the app packages from the project root, and keep
+stored datasets and cached responses out of the real data directory.
+"""
+import os
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+os.environ.setdefault("INVENTORY_SLIPS_DATA_DIR", tempfile.mkdtemp(prefix="inventory_slips_tests_"))
@@ -0,0 +1,109 @@
+"""
+CSV header resolution and chunked ingest.
+"""
+import io
+
+import pandas as pd
+import pytest
+
+from src.data import csv_columns
+from src.data.csv_columns import check_columns, ingest_csv, read_csv, resolve_columns
+
+HEADER = "Product Name,Lot Number,Quantity,Vendor,Inventory Type,Cost,Unused Notes"
+
+
+def csv_bytes(rows):
+    lines = [HEADER]
+    for i in range(rows):
+        vendor = "" if i % 4 == 3 else "Vend Co"
+        lines.append(f"Item {i},{i:06d},{i % 7},{vendor},Flower,{i}.50,note {i}")
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+class NonSeekable:
+    """A socket-like stream: read() only"""
+
+    def __init__(self, data):
+        self._buffer = io.BytesIO(data)
+
+    def read(self, size=-1):
+        return self._buffer.read(size)
+
+
+def test_alias_headers_resolve_to_standard_columns():
+    resolution = resolve_columns([" Product Name ", "Lot Number", "Quantity", "Inventory Type", "Notes"])
+    assert resolution.columns == ["Product Name*", "Barcode*", "Quantity Received*", "Product Type*", "Notes"]
+    assert resolution.renames["Lot Number"] == "Barcode*"
+    assert resolution.first == {"Product Name*": "Product Name*", "Barcode*": "Barcode*",
+                                "Product Type*": "Product Type*"}
+    assert not resolution.has("Vendor")
+    assert check_columns(resolution) is None
+
+
+def test_repeated_aliases_get_suffixes():
+    resolution = resolve_columns(["Barcode", "Lot Number", "Product Name*", "Vendor", "Vendor"])
+    # Two sources for Barcode*, and a literally duplicated Vendor header
+    assert resolution.columns == ["Barcode*", "Barcode*_1", "Product Name*", "Vendor", "Vendor_1"]
+    assert resolution.first["Barcode*"] == "Barcode*"
+    assert resolution.first["Vendor"] == "Vendor"
+    assert resolution.duplicates == []
+
+
+def test_missing_required_columns_reported():
+    error = check_columns(resolve_columns(["Quantity", "Vendor"]))
+    assert error == "CSV is missing required columns: Product Name*, Barcode*"
+
+
+def test_read_csv_keeps_only_used_columns_as_text():
+    df = read_csv(io.BytesIO(csv_bytes(5)))
+    assert "Unused Notes" not in df.columns
+    assert df["Lot Number"].tolist() == ["000000", "000001", "000002", "000003", "000004"]
+
+
+@pytest.mark.parametrize("rows,chunksize", [(10, 3), (9, 3), (3, 3), (1, 50)])
+def test_ingest_chunks_match_whole_file(rows, chunksize):
+    data = csv_bytes(rows)
+    chunks = []
+    progress = []
+    count, error = ingest_csv(io.BytesIO(data), chunks.append, progress.append, chunksize=chunksize)
+
+    assert error is None
+    assert count == rows
+    assert [len(chunk) for chunk in chunks] == [min(chunksize, rows - start) for start in range(0, rows, chunksize)]
+    assert progress == [min(start + chunksize, rows) for start in range(0, rows, chunksize)]
+
+    ingested = pd.concat(chunks, ignore_index=True)
+    assert list(ingested.columns) == ["Product Name*", "Barcode*", "Quantity Received*", "Vendor",
+                                      "Product Type*", "Cost", "Accepted Date", "Strain Name"]
+    assert ingested["Barcode*"].tolist() == [f"{i:06d}" for i in range(rows)]
+    assert ingested["Vendor"].tolist() == ["Unknown Vendor" if i % 4 == 3 else "Vend Co" for i in range(rows)]
+    assert ingested["Accepted Date"].nunique() == 1
+    assert (ingested["Strain Name"] == "").all()
+
+
+def test_ingest_header_only():
+    chunks = []
+    count, error = ingest_csv(io.BytesIO(csv_bytes(0)), chunks.append, chunksize=3)
+    assert (count, error) == (0, None)
+    assert sum(len(chunk) for chunk in chunks) == 0
+
+
+def test_ingest_from_stream_with_header_across_reads(monkeypatch):
+    # The header is longer than one read, so it is stitched from several blocks
+    monkeypatch.setattr(csv_columns, "HEADER_READ_BYTES", 8)
+    data = csv_bytes(7)
+    chunks = []
+    count, error = ingest_csv(NonSeekable(data), chunks.append, chunksize=2)
+
+    assert (count, error) == (7, None)
+    expected = []
+    ingest_csv(io.BytesIO(data), expected.append, chunksize=7)
+    pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True), expected[0])
+
+
+def test_ingest_rejects_header_without_required_columns():
+    chunks = []
+    count, error = ingest_csv(io.BytesIO(b"Quantity,Vendor\n1,A\n"), chunks.append)
+    assert count == 0
+    assert "Product Name*" in error
+    assert chunks == []
@@ -0,0 +1,57 @@
+"""
+Job state shared between worker processes through the state directory.
+"""
+import json
+import os
+
+import pytest
+
+from src.utils import output_cache
+from src.utils.job_queue import JobQueue
+
+
+@pytest.fixture
+def queue(tmp_path):
+    return JobQueue(max_workers=1, state_dir=str(tmp_path))
+
+
+def plant(state_dir, job_id, **fields):
+    data = {'job_id': job_id, 'owner': None, 'state': 'done', 'result': '/etc/passwd'}
+    data.update(fields)
+    with open(os.path.join(state_dir, f"{job_id}.json"), 'w') as f:
+        json.dump(data, f)
+
+
+def test_persisted_job_without_owner_is_refused(queue):
+    plant(queue.state_dir, 'abc123')
+    assert queue.get('abc123', None) is None
+    assert queue.get('abc123', 'someone') is None
+
+
+def test_persisted_job_served_only_to_its_owner(queue):
+    plant(queue.state_dir, 'abc123', owner='sid-1')
+    assert queue.get('abc123', 'sid-2') is None
+    job = queue.get('abc123', 'sid-1')
+    assert job is not None and job.state == 'done'
+
+
+def test_job_state_written_by_another_process_is_read(queue):
+    job = queue.submit(lambda status_callback, progress_callback: (True, 'out.docx'), owner='sid-1')
+    queue._executor.shutdown(wait=True)
+    other_process = JobQueue(max_workers=1, state_dir=queue.state_dir)
+    loaded = other_process.get(job.job_id, 'sid-1')
+    assert (loaded.state, loaded.result) == ('done', 'out.docx')
+
+
+def test_only_cached_documents_are_downloadable(tmp_path):
+    output_dir = str(tmp_path)
+    cached = output_cache.cache_path(output_dir, 'f' * 64, 'slips')
+    with open(cached, 'wb') as f:
+        f.write(b'docx')
+    outside = tmp_path / 'secret.docx'
+    outside.write_bytes(b'secret')
+
+    assert output_cache.in_cache(output_dir, cached)
+    assert not output_cache.in_cache(output_dir, str(outside))
+    assert not output_cache.in_cache(output_dir, os.path.join(output_dir, 'slip_cache', '..', 'secret.docx'))
+    assert not output_cache.in_cache(output_dir, '/etc/passwd')
@@ -0,0 +1,111 @@
+"""
+normalize_manifest must return exactly what the per-item parse loops it
+replaced returned (kept as the legacy_* references in benchmark_normalize.py).
+"""
+import random
+
+import pandas as pd
+import pytest
+
+from benchmark_normalize import (bamboo_manifest, cultivera_manifest, legacy_bamboo, legacy_cultivera,
+                                 legacy_growflow)
+from src.data.normalize import normalize_manifest
+
+LEGACY = {'Bamboo': legacy_bamboo, 'Cultivera': legacy_cultivera, 'GrowFlow': legacy_growflow}
+
+
+def assert_matches_legacy(manifest, provider):
+    pd.testing.assert_frame_equal(normalize_manifest(manifest, provider), LEGACY[provider](manifest))
+
+
+@pytest.mark.parametrize('provider', ['Bamboo', 'GrowFlow', 'Cultivera'])
+def test_generated_manifests(provider):
+    rng = random.Random(7)
+    if provider == 'Cultivera':
+        manifest = cultivera_manifest(300, rng)
+    else:
+        manifest = bamboo_manifest(300, rng, growflow=provider == 'GrowFlow')
+    assert_matches_legacy(manifest, provider)
+
+
+def bamboo_item(**fields):
+    item = {'product_name': 'Gelato 1g', 'inventory_type': 'Flower', 'qty': 4, 'inventory_id': 'INV1'}
+    item.update(fields)
+    return item
+
+
+def bamboo_with(items):
+    return {'from_license_number': '123', 'from_license_name': 'Vend Co',
+            'est_arrival_at': '2025-06-22T10:00:00', 'inventory_transfer_items': items}
+
+
+POTENCY = [
+    {'type': 'thc', 'value': 1.5},
+    {'type': 'total-thc', 'value': 20.1},
+    {'type': 'total-cbd', 'value': 0.4},
+    {'type': 'total-thc', 'value': 22.7},
+    {'type': 'cbd', 'value': 0.9},
+]
+
+
+def test_bamboo_takes_last_total_potency():
+    df = normalize_manifest(bamboo_with([bamboo_item(lab_result_data={'potency': POTENCY})]), 'Bamboo')
+    assert df.loc[0, 'THC Content'] == '22.7%'
+    assert df.loc[0, 'CBD Content'] == '0.4%'
+
+
+def test_growflow_takes_first_matching_potency():
+    df = normalize_manifest(bamboo_with([bamboo_item(lab_result_data={'potency': POTENCY})]), 'GrowFlow')
+    assert df.loc[0, 'THC Content'] == '1.5%'
+    assert df.loc[0, 'CBD Content'] == '0.4%'
+
+
+def test_cultivera_takes_last_substring_match():
+    results = [{'type': 'THCA', 'percentage': 25.0}, {'type': 'Total THC', 'percentage': 21.9},
+               {'type': 'CBD', 'percentage': 0.2}]
+    manifest = {'data': {'manifest': {'created_at': '2025-06-22T10:00:00',
+                                      'from_license': {'name': 'Grow Co', 'license_number': '456'},
+                                      'items': [{'product': {'name': 'OG'}, 'quantity': 2, 'id': 9,
+                                                 'test_results': results}]}}}
+    df = normalize_manifest(manifest, 'Cultivera')
+    assert df.loc[0, 'THC Content'] == '21.9%'
+    assert df.loc[0, 'CBD Content'] == '0.2%'
+    assert_matches_legacy(manifest, 'Cultivera')
+
+
+@pytest.mark.parametrize('provider', ['Bamboo', 'GrowFlow'])
+def test_missing_fields_use_legacy_defaults(provider):
+    items = [
+        {},
+        bamboo_item(lab_result_data={}),
+        bamboo_item(lab_result_data={'potency': []}),
+        bamboo_item(inventory_id='', external_id='EXT1', product_sku='', lab_result_data={'potency': [{'type': 'thca'}]}),
+        bamboo_item(lab_result_data={'potency': [{'type': 'total-thc'}]}),
+    ]
+    manifest = bamboo_with(items)
+    manifest.pop('est_arrival_at')
+    manifest['transferred_at'] = '2025-06-21'
+    assert_matches_legacy(manifest, provider)
+
+    df = normalize_manifest(manifest, provider)
+    missing = '' if provider == 'Bamboo' else '0%'
+    assert df.loc[0, 'THC Content'] == missing
+    assert df.loc[0, 'CBD Content'] == missing
+    assert df.loc[0, 'Accepted Date'] == '2025-06-21'
+
+
+def test_cultivera_missing_fields_use_legacy_defaults():
+    manifest = {'data': {'manifest': {'from_license': {'name': 'Grow Co'},
+                                      'items': [{}, {'product': {}, 'barcode': '', 'id': 3, 'test_results': None}]}}}
+    assert_matches_legacy(manifest, 'Cultivera')
+
+    df = normalize_manifest(manifest, 'Cultivera')
+    assert (df['Vendor'] == 'Unknown Vendor').all()
+    assert df.loc[1, 'Barcode*'] == 3
+    assert df.loc[0, 'THC Content'] == ''
+
+
+@pytest.mark.parametrize('provider', ['Bamboo', 'GrowFlow', 'Cultivera'])
+def test_empty_manifest(provider):
+    manifest = {'data': {'manifest': {'items': []}}} if provider == 'Cultivera' else bamboo_with([])
+    assert_matches_legacy(manifest, provider)
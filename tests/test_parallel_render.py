@@ -0,0 +1,65 @@
+"""
+A parallel render must write the same document parts, byte for byte, as a
+serial render of the same pages.
+"""
+import os
+import zipfile
+
+import pytest
+
+from src.utils import parallel_render
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TEMPLATE = os.path.join(ROOT, 'templates', 'documents', 'InventorySlips.docx')
+
+
+def contexts(pages):
+    return [
+        {f'Label{i}': {'ProductName': f'Product {page}-{i} ' + 'x' * (page * 7 % 50), 'Barcode': f'{page:06d}{i}',
+                       'AcceptedDate': '2024-01-01', 'QuantityReceived': page + i, 'Vendor': 'Acme & Sons <Farms>'}
+         for i in range(1, 5)}
+        for page in range(pages)
+    ]
+
+
+def parts(path):
+    with zipfile.ZipFile(path) as package:
+        return {name: package.read(name) for name in package.namelist()}
+
+
+@pytest.fixture
+def small_ranges(monkeypatch):
+    """Use the pool even for a short run, with several ranges per worker"""
+    monkeypatch.setattr(parallel_render, 'MIN_PARALLEL_PAGES', 2)
+    monkeypatch.setattr(parallel_render, 'PAGES_PER_TASK', 3)
+    yield
+    parallel_render._reset_pool()
+
+
+@pytest.mark.parametrize('page_breaks', [True, False])
+def test_parallel_output_matches_serial(tmp_path, small_ranges, page_breaks):
+    pages = contexts(11)
+    serial = tmp_path / 'serial.docx'
+    parallel = tmp_path / 'parallel.docx'
+    progress = []
+
+    parallel_render.render_to_file(TEMPLATE, pages, str(serial), workers=1, page_breaks=page_breaks)
+    parallel_render.render_to_file(TEMPLATE, pages, str(parallel), workers=2, page_breaks=page_breaks,
+                                   progress_callback=lambda done, total: progress.append((done, total)))
+
+    assert parallel_render._pool is not None
+    serial_parts, parallel_parts = parts(serial), parts(parallel)
+    assert list(parallel_parts) == list(serial_parts)
+    for name, data in serial_parts.items():
+        assert parallel_parts[name] == data, name
+    assert progress[0] == (1, 11)
+    assert progress[-1] == (11, 11)
+
+
+def test_short_runs_render_serially(tmp_path, monkeypatch):
+    monkeypatch.setattr(parallel_render, 'MIN_PARALLEL_PAGES', 200)
+    parallel_render._reset_pool()
+    path = tmp_path / 'short.docx'
+    parallel_render.render_to_file(TEMPLATE, contexts(3), str(path), workers=4)
+    assert parallel_render._pool is None
+    assert 'word/document.xml' in parts(path)
@@ -0,0 +1,103 @@
+"""
+SlipRenderer must produce the same page as rendering the template with docxtpl
+and sizing the table text afterwards, as slips were generated before.
+"""
+import os
+import re
+
+import pytest
+from docx import Document
+from docx.shared import Pt
+from docxtpl import DocxTemplate
+from lxml import etree
+
+from src.utils.slip_renderer import SlipRenderer, font_size_for
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BUNDLED_TEMPLATE = os.path.join(ROOT, 'templates', 'documents', 'InventorySlips.docx')
+
+LONG_NAME = 'Blue Dream 3.5g Premium Indoor Flower Jar - Hybrid'  # 51 chars -> 8pt
+FIXED_NOTE = 'Fixed note text that is longer than forty-five chars'  # 52 chars -> 8pt
+
+
+def docxtpl_page(template_path, context):
+    """One page the way it used to be built: DocxTemplate plus the table font post-pass"""
+    tpl = DocxTemplate(template_path)
+    tpl.render(context)
+    doc = tpl.docx
+    for table in doc.tables:
+        for row in table.rows:
+            for cell in row.cells:
+                for paragraph in cell.paragraphs:
+                    text = paragraph.text.strip()
+                    if text:
+                        for run in paragraph.runs:
+                            run.font.size = Pt(font_size_for(len(text)))
+    return doc
+
+
+def body_xml(doc, tags=None):
+    """Canonical XML of the body elements, drawing ids left out (they are renumbered per page)"""
+    return [
+        re.sub(rb'<wp:docPr id="\d+"', b'<wp:docPr', etree.tostring(element, method='c14n'))
+        for element in doc.element.body
+        if not element.tag.endswith('}sectPr') and (tags is None or element.tag.split('}')[1] in tags)
+    ]
+
+
+@pytest.fixture
+def split_template(tmp_path):
+    """A table whose first placeholder is split across two runs, as Word often saves it"""
+    doc = Document()
+    table = doc.add_table(rows=1, cols=2)
+    name_cell, note_cell = table.rows[0].cells
+    paragraph = name_cell.paragraphs[0]
+    paragraph.add_run('{{ Label1.')
+    paragraph.add_run('ProductName }}').bold = True
+    name_cell.add_paragraph('Qty: {{ Label1.QuantityReceived }}')
+    note_cell.paragraphs[0].add_run(FIXED_NOTE)
+    doc.add_paragraph('{{ Label1.Vendor }}')
+    path = tmp_path / 'split.docx'
+    doc.save(str(path))
+    return str(path)
+
+
+def test_split_placeholders_match_docxtpl(split_template):
+    context = {'Label1': {'ProductName': LONG_NAME, 'QuantityReceived': 12, 'Vendor': 'Acme Farms'}}
+
+    expected = docxtpl_page(split_template, context)
+    rendered = SlipRenderer(split_template).render([context])
+
+    assert body_xml(rendered, tags={'tbl'}) == body_xml(expected, tags={'tbl'})
+    assert [p.text for p in rendered.paragraphs] == [p.text for p in expected.paragraphs]
+
+
+def test_table_text_sized_by_length(split_template):
+    context = {'Label1': {'ProductName': LONG_NAME, 'QuantityReceived': 12, 'Vendor': 'Acme Farms'}}
+    rendered = SlipRenderer(split_template).render([context])
+
+    name_cell, note_cell = rendered.tables[0].rows[0].cells
+    name, quantity = name_cell.paragraphs
+    assert name.text == LONG_NAME
+    assert {run.font.size for run in name.runs} == {Pt(8)}
+    assert quantity.text == 'Qty: 12'
+    assert {run.font.size for run in quantity.runs} == {Pt(12)}
+    assert {run.font.size for run in note_cell.paragraphs[0].runs} == {Pt(8)}
+    # Text outside tables keeps the template's size
+    assert rendered.paragraphs[-1].text == 'Acme Farms'
+    assert {run.font.size for run in rendered.paragraphs[-1].runs} == {None}
+
+
+def test_font_size_thresholds():
+    assert [font_size_for(n) for n in (0, 30, 31, 45, 46, 60, 61, 500)] == [12, 12, 10, 10, 8, 8, 7, 7]
+
+
+def test_bundled_template_matches_docxtpl():
+    context = {
+        f'Label{i}': {'ProductName': f'Product {i}', 'Barcode': f'00{i}', 'AcceptedDate': '2024-01-01',
+                      'QuantityReceived': i, 'Vendor': 'Acme Farms'}
+        for i in range(1, 5)
+    }
+    expected = docxtpl_page(BUNDLED_TEMPLATE, context)
+    rendered = SlipRenderer(BUNDLED_TEMPLATE).render([context])
+    assert body_xml(rendered) == body_xml(expected)
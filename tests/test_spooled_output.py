@@ -0,0 +1,63 @@
+"""
+Shared spooled outputs: written by the worker that ran the job, streamed by
+whichever worker answers the download.
+"""
+import os
+
+from src.utils import spooled_output
+from src.utils.job_queue import JobQueue
+from src.utils.spooled_output import SpooledOutput
+
+
+def shared_output(data=b'PK docx bytes', filename='20240101_Vend_Slips.docx'):
+    output = SpooledOutput(filename, shared=True)
+    output.file.write(data)
+    output.file.flush()
+    return output
+
+
+def test_shared_output_reopened_from_state():
+    output = shared_output()
+    assert os.path.dirname(output.path) == spooled_output.shared_dir()
+
+    reopened = SpooledOutput.from_state(output.to_state())
+    assert reopened.filename == '20240101_Vend_Slips.docx'
+    assert reopened.mimetype == spooled_output.DOCX_MIMETYPE
+    assert b''.join(reopened.iter_chunks(4)) == b'PK docx bytes'
+
+    # Streaming it elsewhere removes the file; the owner then sees it as gone
+    reopened.close()
+    assert not os.path.exists(output.path)
+    assert not output.available
+    output.close()
+
+
+def test_state_outside_the_shared_directory_is_refused(tmp_path):
+    planted = tmp_path / 'secret.docx'
+    planted.write_bytes(b'secret')
+    assert SpooledOutput.from_state({'path': str(planted), 'filename': 'x.docx'}) is None
+    escape = os.path.join(spooled_output.shared_dir(), '..', 'secret.docx')
+    assert SpooledOutput.from_state({'path': escape}) is None
+    assert SpooledOutput.from_state({}) is None
+
+
+def test_in_memory_output_has_no_state():
+    output = SpooledOutput('x.docx')
+    assert output.to_state() is None and output.path is None
+    output.close()
+
+
+def test_job_result_visible_to_other_workers(tmp_path):
+    queue = JobQueue(max_workers=1, state_dir=str(tmp_path))
+    job = queue.submit(lambda status_callback, progress_callback: (True, shared_output(b'zip', 'batch.zip')),
+                       owner='sid-1')
+    queue._executor.shutdown(wait=True)
+
+    other_worker = JobQueue(max_workers=1, state_dir=str(tmp_path))
+    loaded = other_worker.get(job.job_id, 'sid-1')
+    assert loaded.state == 'done'
+    output = SpooledOutput.from_state(loaded.result)
+    assert output.filename == 'batch.zip'
+    assert b''.join(output.iter_chunks()) == b'zip'
+    output.close()
+    assert not job.result.available
@@ -0,0 +1,164 @@
+"""
+Incremental transfer sync: the high-water mark belongs to the session dataset
+it was merged into, and is only moved when every transfer was parsed.
+"""
+import pytest
+
+import app as web
+
+
+def transfer(barcode, name=None):
+    return {'from_license_number': '123', 'from_license_name': 'Vend Co', 'est_arrival_at': '2025-06-22T10:00:00',
+            'inventory_transfer_items': [{'product_name': name or f'Product {barcode}', 'inventory_type': 'Flower',
+                                          'qty': 1, 'inventory_id': barcode}]}
+
+
+class FakeClient:
+    """Serves the queued listing pages and records the updated_since it was asked for"""
+
+    api_type = 'bamboo'
+
+    def __init__(self):
+        self.pages = []
+        self.calls = []
+
+    def iter_transfer_pages(self, date_from=None, date_to=None, updated_since=None):
+        self.calls.append(updated_since)
+        return iter(self.pages)
+
+
+@pytest.fixture
+def client():
+    return FakeClient()
+
+
+@pytest.fixture
+def request_context():
+    with web.app.test_request_context():
+        yield
+
+
+def sync(client, pages, date_from=None, date_to=None):
+    client.pages = pages
+    response = web.fetch_transfers_incremental(client, date_from, date_to)
+    if isinstance(response, tuple):
+        return response[0].get_json(), response[1]
+    return response.get_json(), 200
+
+
+def barcodes():
+    return web.get_session_data('df_json')['Barcode*'].tolist()
+
+
+def test_sync_transfers_splits_pages_and_documents(client):
+    client.pages = [{'data': [transfer('A'), transfer('B')]}, [transfer('C')]]
+    df, mark = web.sync_transfers(client, since='2025-01-01T00:00:00Z')
+    assert df['Barcode*'].tolist() == ['A', 'B', 'C']
+    assert client.calls == ['2025-01-01T00:00:00Z']
+    assert mark.endswith('Z')
+
+
+def test_sync_transfers_raises_on_unparseable_transfer(client):
+    client.pages = [[transfer('A')], [transfer('B'), {'unexpected': True}]]
+    with pytest.raises(web.APIDataError, match='page 2, document 2'):
+        web.sync_transfers(client)
+
+
+def test_delta_merged_into_the_session_dataset(client, request_context):
+    body, status = sync(client, [[transfer('A'), transfer('B')]])
+    assert status == 200 and body['since'] is None
+    first_mark = body['synced_to']
+    assert web.session['sync_mark']['dataset'] == web.session['df_json_dataset']
+
+    body, status = sync(client, [[transfer('B', 'Renamed'), transfer('C')]])
+    assert status == 200
+    assert client.calls == [None, first_mark]
+    assert body['since'] == first_mark
+    assert barcodes() == ['A', 'B', 'C']
+    assert web.get_session_data('df_json').set_index('Barcode*').loc['B', 'Product Name*'] == 'Renamed'
+
+
+def test_blank_and_repeated_barcodes_are_kept(client, request_context):
+    first = transfer('A')
+    first['inventory_transfer_items'] += [
+        {'product_name': 'Loose pre-roll', 'inventory_type': 'Flower', 'qty': 1},
+        {'product_name': 'Second lot of A', 'inventory_type': 'Flower', 'qty': 2, 'inventory_id': 'A'},
+        {'product_name': 'Other pre-roll', 'inventory_type': 'Flower', 'qty': 1},
+        {'product_name': 'Repeated C', 'inventory_type': 'Flower', 'qty': 1, 'inventory_id': 'C'},
+        {'product_name': 'Repeated C again', 'inventory_type': 'Flower', 'qty': 1, 'inventory_id': 'C'},
+    ]
+    sync(client, [[first]])
+    assert barcodes() == ['A', '', 'A', '', 'C', 'C']
+
+    delta = transfer('A', 'Updated A')
+    delta['inventory_transfer_items'].append({'product_name': 'New loose item', 'inventory_type': 'Flower', 'qty': 3})
+    body, status = sync(client, [[delta]])
+
+    assert status == 200
+    names = web.get_session_data('df_json')['Product Name*'].tolist()
+    # Both rows of A are replaced; blank barcodes and the untouched repeated C stay
+    assert names == ['Loose pre-roll', 'Other pre-roll', 'Repeated C', 'Repeated C again', 'Updated A', 'New loose item']
+
+
+def test_parse_error_keeps_mark_and_dataset(client, request_context):
+    sync(client, [[transfer('A')]])
+    state = dict(web.session['sync_mark'])
+
+    body, status = sync(client, [[transfer('B'), {'unexpected': True}]])
+    assert status == 502
+    assert 'could not be parsed' in body['error']
+    assert web.session['sync_mark'] == state
+    assert barcodes() == ['A']
+
+    # The failed transfers are requested again from the old mark
+    sync(client, [[transfer('B')]])
+    assert client.calls[-1] == state['updated_since']
+    assert barcodes() == ['A', 'B']
+
+
+def test_new_session_gets_a_full_sync(client):
+    with web.app.test_request_context():
+        sync(client, [[transfer('A')]])
+    with web.app.test_request_context():
+        body, status = sync(client, [[transfer('B')]])
+        assert client.calls == [None, None]
+        assert body['since'] is None
+        assert barcodes() == ['B']
+
+
+def test_missing_dataset_gets_a_full_sync(client, request_context):
+    sync(client, [[transfer('A')]])
+    web.clear_session_data('df_json')
+
+    body, status = sync(client, [[transfer('A'), transfer('B')]])
+    assert client.calls == [None, None]
+    assert body['since'] is None
+    assert barcodes() == ['A', 'B']
+
+
+def test_replaced_dataset_gets_a_full_sync(client, request_context):
+    sync(client, [[transfer('A')]])
+    web.store_session_data('df_json', web.get_session_data('df_json').iloc[0:0])
+
+    sync(client, [[transfer('B')]])
+    assert client.calls == [None, None]
+
+
+def test_other_date_range_gets_a_full_sync(client, request_context):
+    sync(client, [[transfer('A')]], '2025-06-01', '2025-06-30')
+
+    sync(client, [[transfer('B')]], '2025-07-01', '2025-07-31')
+    assert client.calls == [None, None]
+    assert barcodes() == ['B']
+    assert web.session['sync_mark']['date_from'] == '2025-07-01'
+
+    # Going back to June starts over too: the mark now describes July's dataset
+    sync(client, [[transfer('A')]], '2025-06-01', '2025-06-30')
+    assert client.calls[-1] is None
+    assert barcodes() == ['A']
+
+
+def test_empty_full_sync_saves_no_mark(client, request_context):
+    body, status = sync(client, [[]])
+    assert status == 404
+    assert 'sync_mark' not in web.session